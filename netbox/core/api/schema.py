@@ -119,7 +119,7 @@ class NetBoxAutoSchema(AutoSchema):
         # bulk operations should specify a list
         response_serializers = super().get_response_serializers()
 
-        if self.is_bulk_action:
+        if self.is_bulk_action or getattr(self.view, 'action', None) == 'bulk_import':
             return type(response_serializers)(many=True)
 
         return response_serializers
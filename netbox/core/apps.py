@@ -20,7 +20,7 @@ class CoreConfig(AppConfig):
     def ready(self):
         from core.api import schema  # noqa: F401
         from netbox.models.features import register_models
-        from . import data_backends, events, search  # noqa: F401
+        from . import data_backends, events, housekeeping, search  # noqa: F401
         from netbox import context_managers  # noqa: F401
 
         # Register models
@@ -0,0 +1,137 @@
+from collections import defaultdict
+from importlib import import_module
+
+import django_rq
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from packaging import version
+from rq.exceptions import InvalidJobOperation
+from rq.job import Job as RQJob
+
+from netbox.housekeeping import ExpiredRecordsTask, HousekeepingTask
+from netbox.utils import register_housekeeping_task
+from utilities.rqworker import get_queue_for_model
+from .choices import JobStatusChoices
+from .models import Job, ObjectChange
+from .partitioning import create_partitions, drop_expired_partitions, is_partitioned
+
+__all__ = (
+    'CheckLatestReleaseTask',
+    'ClearExpiredSessionsTask',
+    'DeleteExpiredChangelogTask',
+    'DeleteExpiredJobsTask',
+)
+
+
+@register_housekeeping_task
+class ClearExpiredSessionsTask(HousekeepingTask):
+    """
+    Clear expired authentication sessions (essentially replicating the `clearsessions` command).
+    """
+    description = "Clearing expired authentication sessions"
+
+    def run(self):
+        self.log(f"Configured session engine: {settings.SESSION_ENGINE}", level=2)
+        engine = import_module(settings.SESSION_ENGINE)
+        try:
+            engine.SessionStore.clear_expired()
+            self.log("Sessions cleared.", self.command.style.SUCCESS)
+        except NotImplementedError:
+            self.log(
+                f"The configured session engine ({settings.SESSION_ENGINE}) does not support clearing sessions; "
+                f"skipping."
+            )
+
+
+@register_housekeeping_task
+class DeleteExpiredChangelogTask(ExpiredRecordsTask):
+    description = "Checking for expired changelog records"
+    model = ObjectChange
+    timestamp_field = 'time'
+    retention_parameter = 'CHANGELOG_RETENTION'
+
+    def delete_expired(self, cutoff):
+        # If the change log is partitioned, drop any partitions which have expired entirely before deleting any
+        # remaining expired records
+        if is_partitioned():
+            create_partitions()
+            if dropped_count := drop_expired_partitions(cutoff):
+                self.log(f"Dropped {dropped_count} expired partitions.", self.command.style.SUCCESS)
+
+        return super().delete_expired(cutoff)
+
+
+@register_housekeeping_task
+class DeleteExpiredJobsTask(ExpiredRecordsTask):
+    description = "Checking for expired jobs"
+    model = Job
+    retention_parameter = 'JOB_RETENTION'
+
+    def delete_batch(self, queryset):
+        # Cancel the background tasks of any jobs which have not yet finished, as Job.delete() would
+        job_ids = defaultdict(list)
+        enqueued_jobs = queryset.filter(status__in=JobStatusChoices.ENQUEUED_STATE_CHOICES)
+        for job_id, model_name in enqueued_jobs.values_list('job_id', 'object_type__model'):
+            job_ids[get_queue_for_model(model_name)].append(str(job_id))
+        for queue_name, ids in job_ids.items():
+            queue = django_rq.get_queue(queue_name)
+            for rq_job in RQJob.fetch_many(ids, connection=queue.connection):
+                if rq_job is None:
+                    continue
+                try:
+                    rq_job.cancel()
+                except InvalidJobOperation:
+                    pass
+
+        # Delete any files (e.g. rendered exports) stored by the jobs, as the post_delete receiver would
+        for data in queryset.filter(data__file__isnull=False).values_list('data', flat=True):
+            if isinstance(data, dict) and data.get('file'):
+                default_storage.delete(data['file'])
+
+        return super().delete_batch(queryset)
+
+
+@register_housekeeping_task
+class CheckLatestReleaseTask(HousekeepingTask):
+    """
+    Check for new NetBox releases, and cache the most recent one.
+    """
+    description = "Checking for latest release"
+
+    def run(self):
+        if settings.ISOLATED_DEPLOYMENT:
+            self.log("Skipping: ISOLATED_DEPLOYMENT is enabled")
+            return
+        if not settings.RELEASE_CHECK_URL:
+            self.log("Skipping: RELEASE_CHECK_URL not set")
+            return
+
+        headers = {
+            'Accept': 'application/vnd.github.v3+json',
+        }
+
+        try:
+            self.log(f"Fetching {settings.RELEASE_CHECK_URL}", level=2)
+            response = requests.get(
+                url=settings.RELEASE_CHECK_URL,
+                headers=headers,
+                proxies=settings.HTTP_PROXIES
+            )
+            response.raise_for_status()
+
+            releases = []
+            for release in response.json():
+                if 'tag_name' not in release or release.get('devrelease') or release.get('prerelease'):
+                    continue
+                releases.append((version.parse(release['tag_name']), release.get('html_url')))
+            latest_release = max(releases)
+            self.log(f"Found {len(response.json())} releases; {len(releases)} usable", level=2)
+            self.log(f"Latest release: {latest_release[0]}", self.command.style.SUCCESS)
+
+            # Cache the most recent release
+            cache.set('latest_release', latest_release, None)
+
+        except requests.exceptions.RequestException as exc:
+            self.command.stdout.write(f"\tRequest error: {exc}", self.command.style.ERROR)
@@ -1,7 +1,20 @@
 import logging
+import re
+import tempfile
+from contextlib import ExitStack
+
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext as _
 
 from netbox.jobs import JobRunner
+from netbox.registry import registry
 from netbox.search.backends import search_backend
+from netbox.utils import bulk_operation
+from utilities.exceptions import AbortRequest, AbortTransaction, PermissionsViolation
 from .choices import DataSourceStatusChoices
 from .exceptions import SyncError
 from .models import DataSource
@@ -31,3 +44,112 @@ class SyncDataSourceJob(JobRunner):
             if type(e) is SyncError:
                 logging.error(e)
             raise e
+
+
+class ExportJob(JobRunner):
+    """
+    Render an export of the objects in a list view, storing the result as a file for later download.
+    """
+
+    class Meta:
+        name = 'Export'
+
+    def run(self, view, request, *args, **kwargs):
+        """
+        Args:
+            view: The dotted path to the ObjectListView class
+            request: A copy of the request which initiated the export, excluding the `background` query parameter
+        """
+        # Replicate the permission enforcement & filtering performed when handling the request
+        view = import_string(view)()
+        view.setup(request)
+        view.queryset = view.get_queryset(request)
+        if not view.has_permission():
+            raise PermissionDenied(_("The user does not have permission to export these objects."))
+        if view.filterset:
+            view.queryset = view.filterset(request.GET, view.queryset, request=request).qs
+        response = view.export(request, background=True)
+
+        if match := re.search(r'filename="([^"]+)"', response.get('Content-Disposition', '')):
+            filename = match.group(1)
+        else:
+            filename = f'netbox_{view.queryset.model._meta.verbose_name_plural.replace(" ", "_")}'
+
+        # Write the export to a temporary file before saving it to the storage backend
+        with tempfile.TemporaryFile() as f:
+            for chunk in response:
+                f.write(chunk)
+            size = f.tell()
+            f.seek(0)
+            path = default_storage.save(f'exports/{self.job.job_id}/{filename}', File(f, name=filename))
+
+        self.job.data = {
+            'file': path,
+            'filename': filename,
+            'content_type': response['Content-Type'],
+            'size': size,
+        }
+
+
+class BulkOperationJob(JobRunner):
+    """
+    Perform a bulk edit, delete, or import operation requested of a view, dividing the objects concerned into chunks
+    which are each processed within their own transaction. Progress is recorded in the job's data as each chunk is
+    completed.
+    """
+
+    class Meta:
+        name = 'Bulk operation'
+
+    def run(self, view, request, **kwargs):
+        """
+        Args:
+            view: The dotted path to the bulk operation view class
+            request: A copy of the request which initiated the operation. Changes are attributed to its ID.
+        """
+        # Replicate the permission enforcement performed when handling the request
+        view = import_string(view)()
+        view.setup(request)
+        view.queryset = view.get_queryset(request)
+        if not view.has_permission():
+            raise PermissionDenied(_("The user does not have permission to perform this operation."))
+
+        self.request = request
+        self.job.data = {
+            'object_type': f'{view.queryset.model._meta.app_label}.{view.queryset.model._meta.model_name}',
+            'total': 0,
+            'completed': 0,
+            'errors': [],
+        }
+        view.run_job(self, request, **kwargs)
+
+    def process(self, items, func, chunk_size):
+        """
+        Call func() for successive chunks of items, each within its own transaction, and record the progress made.
+        Processing stops at the first chunk to raise an exception; any preceding chunks remain committed.
+
+        Args:
+            items: The list of items (e.g. object PKs) to process
+            func: A callable which accepts a chunk of items and the index of its first item
+            chunk_size: The maximum number of items per chunk
+        """
+        self.job.data['total'] = len(items)
+        self.job.save(update_fields=['data'])
+
+        for offset in range(0, len(items), chunk_size):
+            chunk = items[offset:offset + chunk_size]
+            try:
+                # Record changes and trigger events as would be done while processing the original request
+                with ExitStack() as stack:
+                    for request_processor in registry['request_processors']:
+                        stack.enter_context(request_processor(self.request))
+                    with transaction.atomic(), bulk_operation():
+                        func(chunk, offset)
+            except (AbortRequest, AbortTransaction, PermissionsViolation, ValidationError) as e:
+                messages = e.messages if isinstance(e, ValidationError) else [getattr(e, 'message', str(e))]
+                self.job.data['errors'].extend(message for message in messages if message)
+                self.job.save(update_fields=['data'])
+                raise
+
+            self.job.data['completed'] += len(chunk)
+            self.job.save(update_fields=['data'])
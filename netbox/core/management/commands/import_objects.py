@@ -0,0 +1,111 @@
+import sys
+import uuid
+from contextlib import ExitStack
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.signals import clear_events
+from netbox.bulk_import import get_import_view
+from netbox.choices import CSVDelimiterChoices, ImportFormatChoices
+from netbox.registry import registry
+from netbox.utils import bulk_operation
+from users.models import User
+from utilities.constants import CSV_DELIMITERS
+from utilities.exceptions import AbortRequest, AbortTransaction, PermissionsViolation
+from utilities.forms.bulk_import import BulkImportForm
+from utilities.request import NetBoxFakeRequest
+
+
+class Command(BaseCommand):
+    help = "Create and/or update objects in bulk from a file containing CSV, JSON, or YAML data"
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help="The type of object to import, in the form <app_label>.<model>")
+        parser.add_argument('file', help="The file from which to read data (\"-\" to read from standard input)")
+        parser.add_argument(
+            '--format', choices=ImportFormatChoices.values(), default=ImportFormatChoices.AUTO,
+            help="The format of the data (default: auto-detect)"
+        )
+        parser.add_argument(
+            '--csv-delimiter', dest='csv_delimiter', choices=[CSVDelimiterChoices.AUTO, *CSV_DELIMITERS],
+            default=CSVDelimiterChoices.AUTO, help="The character which delimits CSV fields (default: auto-detect)"
+        )
+        parser.add_argument(
+            '--user', help="The user performing the import (default: the first superuser)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError):
+            raise CommandError(f"Invalid model: {options['model']}")
+        if (import_view := get_import_view(model)) is None:
+            raise CommandError(f"Bulk import is not supported for {model._meta.verbose_name_plural}.")
+
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"Unknown user: {options['user']}")
+        else:
+            user = User.objects.filter(is_superuser=True).order_by('pk').first()
+
+        # Read and parse the data
+        if options['file'] == '-':
+            data = sys.stdin.read()
+        else:
+            try:
+                with open(options['file'], encoding='utf-8-sig') as f:
+                    data = f.read()
+            except OSError as e:
+                raise CommandError(f"Unable to read {options['file']}: {e}")
+        form = BulkImportForm(data={
+            'data': data,
+            'format': options['format'],
+            'csv_delimiter': CSV_DELIMITERS.get(options['csv_delimiter'], CSVDelimiterChoices.AUTO),
+        })
+        if not form.is_valid():
+            self.write_errors(form)
+            raise CommandError("Invalid import data.")
+
+        request = NetBoxFakeRequest({
+            'META': {},
+            'POST': {},
+            'GET': {},
+            'FILES': {},
+            'user': user,
+            'path': '',
+            'id': uuid.uuid4()
+        })
+
+        # Replicate the permission enforcement performed by the import view
+        view = import_view()
+        view.setup(request)
+        view.queryset = view.get_queryset(request)
+        if user is None or not view.has_permission():
+            raise CommandError(f"User {user} does not have permission to import {model._meta.verbose_name_plural}.")
+
+        # Import the objects, recording changes and triggering events as for a request
+        with ExitStack() as stack:
+            for request_processor in registry['request_processors']:
+                stack.enter_context(request_processor(request))
+            try:
+                with transaction.atomic(), bulk_operation():
+                    objects = view.create_and_update_objects(form, request)
+            except (AbortTransaction, ValidationError):
+                clear_events.send(sender=self)
+                self.write_errors(form)
+                raise CommandError("Import failed; no changes have been made.")
+            except (AbortRequest, PermissionsViolation) as e:
+                clear_events.send(sender=self)
+                raise CommandError(e.message)
+
+        self.stdout.write(f"Imported {len(objects)} {model._meta.verbose_name_plural}.")
+
+    def write_errors(self, form):
+        for field, errors in form.errors.items():
+            for error in errors:
+                self.stderr.write(error if field in ('__all__', 'data') else f"{field}: {error}")
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.partitioning import convert_to_partitioned, create_partitions, get_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = "Manage the monthly partitioning of the change log table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help="Convert the existing change log table to a partitioned table (locks the table until complete)"
+        )
+        parser.add_argument(
+            '--months', type=int, default=3,
+            help="Number of months in advance for which to create partitions (default: 3)"
+        )
+
+    def handle(self, *args, **options):
+        if options['convert']:
+            if is_partitioned():
+                raise CommandError("The change log table has already been partitioned.")
+            self.stdout.write('Converting the change log table... ', ending='')
+            self.stdout.flush()
+            try:
+                convert_to_partitioned(months=options['months'])
+            except ValueError as e:
+                raise CommandError(e)
+            self.stdout.write('Done.', self.style.SUCCESS)
+
+        elif not is_partitioned():
+            raise CommandError("The change log table has not been partitioned. Run this command with --convert first.")
+
+        else:
+            created_count = create_partitions(months=options['months'])
+            self.stdout.write(f'Created {created_count} partitions.')
+
+        for name, lower, upper in get_partitions():
+            self.stdout.write(f'  {name}: {lower or "-"} to {upper}')
+
+        self.stdout.write(self.style.SUCCESS('Finished.'))
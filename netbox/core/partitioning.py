@@ -0,0 +1,228 @@
+"""
+Support for storing ObjectChange records in a PostgreSQL table partitioned by month, so that expired records can be
+removed by dropping whole partitions rather than deleting individual rows.
+
+A partitioned table comprises:
+
+  * The legacy partition, holding all records which existed at the time the table was converted
+  * A monthly partition for each month since conversion (and several months in advance)
+  * A default partition, catching any records for which no monthly partition yet exists
+"""
+import datetime
+import re
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import ObjectChange
+
+__all__ = (
+    'convert_to_partitioned',
+    'create_partitions',
+    'drop_expired_partitions',
+    'get_partitions',
+    'is_partitioned',
+)
+
+TABLE_NAME = ObjectChange._meta.db_table
+LEGACY_PARTITION = f'{TABLE_NAME}_legacy'
+DEFAULT_PARTITION = f'{TABLE_NAME}_default'
+
+PARTITION_BOUND_RE = re.compile(r"^FOR VALUES FROM \((?:MINVALUE|'(?P<lower>[^']+)')\) TO \('(?P<upper>[^']+)'\)$")
+
+
+def get_month_start(value, offset=0):
+    """
+    Return the beginning of the month (in UTC) containing the given time, optionally offset by a number of months.
+    """
+    month = value.astimezone(datetime.timezone.utc).month - 1 + offset
+    year = value.astimezone(datetime.timezone.utc).year + month // 12
+    return datetime.datetime(year, month % 12 + 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def is_partitioned():
+    """
+    Return True if ObjectChange records are stored in a partitioned table.
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+            [TABLE_NAME]
+        )
+        return cursor.fetchone()[0]
+
+
+def get_partitions():
+    """
+    Return a list of (name, lower bound, upper bound) tuples for each partition of the ObjectChange table, ordered by
+    lower bound. An unbounded lower limit is represented as None; the default partition is excluded.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(%s)",
+            [TABLE_NAME]
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        if match := PARTITION_BOUND_RE.match(bound):
+            lower = parse_datetime(match.group('lower')) if match.group('lower') else None
+            partitions.append((name, lower, parse_datetime(match.group('upper'))))
+
+    return sorted(partitions, key=lambda p: (p[1] is not None, p[1]))
+
+
+def create_partition(start):
+    """
+    Create the monthly partition beginning at the given time, moving into it any records which have been stored in the
+    default partition. Returns False if the partition already exists.
+    """
+    end = get_month_start(start, 1)
+    name = f'{TABLE_NAME}_p{start:%Y_%m}'
+    qn = connection.ops.quote_name
+    bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        if cursor.fetchone()[0]:
+            return False
+
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {qn(DEFAULT_PARTITION)} WHERE {qn('time')} >= %s AND {qn('time')} < %s)",
+            [start, end]
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"CREATE TABLE {qn(name)} PARTITION OF {qn(TABLE_NAME)} FOR VALUES {bounds}")
+            return True
+
+        # A partition cannot be created for a range of records stored in the default partition, so move them into
+        # the new table before attaching it
+        cursor.execute(
+            f"CREATE TABLE {qn(name)} (LIKE {qn(TABLE_NAME)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} WHERE {qn('time')} >= %s AND {qn('time')} < %s "
+            f"RETURNING *) "
+            f"INSERT INTO {qn(name)} SELECT * FROM moved",
+            [start, end]
+        )
+        cursor.execute(f"ALTER TABLE {qn(TABLE_NAME)} ATTACH PARTITION {qn(name)} FOR VALUES {bounds}")
+
+    return True
+
+
+def create_partitions(months=3):
+    """
+    Ensure that monthly partitions exist from the end of the most recent existing partition through the given number
+    of months in the future. Returns the number of partitions created.
+    """
+    partitions = get_partitions()
+    start = partitions[-1][2] if partitions else get_month_start(timezone.now())
+    end = get_month_start(timezone.now(), months + 1)
+
+    created_count = 0
+    while start < end:
+        created_count += create_partition(start)
+        start = get_month_start(start, 1)
+
+    return created_count
+
+
+def drop_expired_partitions(cutoff):
+    """
+    Drop all partitions containing only records created before the cutoff time. Returns the number of partitions
+    dropped.
+    """
+    qn = connection.ops.quote_name
+    dropped_count = 0
+    with connection.cursor() as cursor:
+        for name, lower, upper in get_partitions():
+            if upper <= cutoff:
+                cursor.execute(f"DROP TABLE {qn(name)}")
+                dropped_count += 1
+
+    return dropped_count
+
+
+def convert_to_partitioned(months=3):
+    """
+    Convert the ObjectChange table to a partitioned table. The existing table becomes the legacy partition, holding
+    all records created prior to the next month; monthly partitions are created thereafter. The table is locked for
+    the duration of the conversion.
+    """
+    qn = connection.ops.quote_name
+    boundary = get_month_start(timezone.now(), 1)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {qn(TABLE_NAME)} IN ACCESS EXCLUSIVE MODE")
+
+        # Record the definitions of all indexes and foreign keys on the existing table
+        cursor.execute(
+            "SELECT c.relname, i.indisprimary, i.indisunique, pg_get_indexdef(i.indexrelid) FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE i.indrelid = to_regclass(%s)",
+            [TABLE_NAME]
+        )
+        indexes = cursor.fetchall()
+        for index_name, primary, unique, definition in indexes:
+            if unique and not primary:
+                raise ValueError(f"Unique index {index_name} cannot be applied to a partitioned table.")
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = to_regclass(%s) "
+            "AND contype = 'f'",
+            [TABLE_NAME]
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            "SELECT attidentity, pg_get_serial_sequence(%s, 'id') FROM pg_attribute "
+            "WHERE attrelid = to_regclass(%s) AND attname = 'id'",
+            [TABLE_NAME, TABLE_NAME]
+        )
+        identity, sequence = cursor.fetchone()
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {qn(TABLE_NAME)}")
+        next_id = cursor.fetchone()[0]
+
+        # Rename the existing table and its indexes (and any constraints they support) to free their names
+        cursor.execute(f"ALTER TABLE {qn(TABLE_NAME)} RENAME TO {qn(LEGACY_PARTITION)}")
+        for i, (index_name, primary, unique, definition) in enumerate(indexes):
+            cursor.execute(f"ALTER INDEX {qn(index_name)} RENAME TO {qn(f'{LEGACY_PARTITION}_{i}')}")
+
+        # Detach the primary key from its sequence; partitions may not have identity columns
+        if identity:
+            cursor.execute(f"ALTER TABLE {qn(LEGACY_PARTITION)} ALTER COLUMN id DROP IDENTITY")
+        else:
+            cursor.execute(f"ALTER TABLE {qn(LEGACY_PARTITION)} ALTER COLUMN id DROP DEFAULT")
+            if sequence:
+                cursor.execute(f"DROP SEQUENCE {sequence}")
+
+        # Create the partitioned table. Its primary key must include the partition key.
+        cursor.execute(
+            f"CREATE TABLE {qn(TABLE_NAME)} (LIKE {qn(LEGACY_PARTITION)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS "
+            f"INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ({qn('time')})"
+        )
+        sequence = f'{TABLE_NAME}_id_seq'
+        cursor.execute(f"CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(TABLE_NAME)}.id")
+        cursor.execute("SELECT setval(%s, %s, false)", [sequence, next_id])
+        cursor.execute(f"ALTER TABLE {qn(TABLE_NAME)} ALTER COLUMN id SET DEFAULT nextval(%s)", [sequence])
+        for index_name, primary, unique, definition in indexes:
+            if primary:
+                cursor.execute(
+                    f"ALTER TABLE {qn(TABLE_NAME)} ADD CONSTRAINT {qn(index_name)} PRIMARY KEY (id, {qn('time')})"
+                )
+            else:
+                cursor.execute(definition)
+        for constraint_name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {qn(TABLE_NAME)} ADD CONSTRAINT {qn(constraint_name)} {definition}")
+
+        # Attach the existing table as the legacy partition, and create the default partition
+        cursor.execute(
+            f"ALTER TABLE {qn(TABLE_NAME)} ATTACH PARTITION {qn(LEGACY_PARTITION)} "
+            f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+        )
+        cursor.execute(f"CREATE TABLE {qn(DEFAULT_PARTITION)} PARTITION OF {qn(TABLE_NAME)} DEFAULT")
+
+        create_partitions(months=months)
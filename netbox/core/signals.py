@@ -2,8 +2,10 @@ import logging
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
 from django.db.models.fields.reverse_related import ManyToManyRel
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db.models import prefetch_related_objects
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver, Signal
 from django.utils.translation import gettext_lazy as _
 from django_prometheus.models import model_deletes, model_inserts, model_updates
@@ -11,11 +13,13 @@ from django_prometheus.models import model_deletes, model_inserts, model_updates
 from core.choices import ObjectChangeActionChoices
 from core.events import *
 from core.models import ObjectChange
-from extras.events import enqueue_event
+from extras.events import enqueue_event, enqueue_events
 from extras.utils import run_validators
 from netbox.config import get_config
-from netbox.context import current_request, events_queue
+from netbox.context import current_request, events_queue, objectchange_buffer
+from netbox.context_managers import change_logging_buffer
 from netbox.models.features import ChangeLoggingMixin
+from netbox.signals import post_bulk_create
 from utilities.exceptions import AbortRequest
 from .models import ConfigRevision
 
@@ -43,6 +47,32 @@ clear_events = Signal()
 # Change logging & event handling
 #
 
+def get_previous_change(instance, request):
+    """
+    Return the most recent ObjectChange recorded for an object by the current request (if any).
+    """
+    object_type = ContentType.objects.get_for_model(instance)
+    buffer = objectchange_buffer.get()
+    if buffer is not None and (prev_change := buffer.get_latest(object_type, instance.pk, request.id)):
+        return prev_change
+
+    return ObjectChange.objects.filter(
+        changed_object_type=object_type,
+        changed_object_id=instance.pk,
+        request_id=request.id
+    ).first()
+
+
+def save_objectchange(objectchange):
+    """
+    Save an ObjectChange, or add it to the buffer if change logging is being buffered.
+    """
+    if (buffer := objectchange_buffer.get()) is not None:
+        buffer.add(objectchange)
+    else:
+        objectchange.save()
+
+
 @receiver((post_save, m2m_changed))
 def handle_changed_object(sender, instance, **kwargs):
     """
@@ -79,23 +109,19 @@ def handle_changed_object(sender, instance, **kwargs):
     objectchange = instance.to_objectchange(action)
     # If this is a many-to-many field change, check for a previous ObjectChange instance recorded
     # for this object by this request and update it
-    if m2m_changed and (
-        prev_change := ObjectChange.objects.filter(
-            changed_object_type=ContentType.objects.get_for_model(instance),
-            changed_object_id=instance.pk,
-            request_id=request.id
-        ).first()
-    ):
+    if m2m_changed and (prev_change := get_previous_change(instance, request)):
         prev_change.postchange_data = objectchange.postchange_data
-        prev_change.save()
+        # Buffered records will be saved when the buffer is flushed
+        if prev_change.pk:
+            prev_change.save()
     elif objectchange and objectchange.has_changes:
         objectchange.user = request.user
         objectchange.request_id = request.id
-        objectchange.save()
+        save_objectchange(objectchange)
 
-    # Ensure that we're working with fresh M2M assignments
-    if m2m_changed:
-        instance.refresh_from_db()
+    # Ensure that we're working with fresh M2M assignments (without reloading the object from the database)
+    if m2m_changed and hasattr(instance, '_prefetched_objects_cache'):
+        instance._prefetched_objects_cache.clear()
 
     # Enqueue the object for event processing
     queue = events_queue.get()
@@ -109,6 +135,40 @@ def handle_changed_object(sender, instance, **kwargs):
         model_updates.labels(instance._meta.model_name).inc()
 
 
+@receiver(post_bulk_create)
+def handle_bulk_created_objects(sender, instances, **kwargs):
+    """
+    Fires when a set of objects is created using bulk_create().
+    """
+    if not instances or not hasattr(sender, 'to_objectchange'):
+        return
+
+    # Get the current request, or bail if not set
+    request = current_request.get()
+    if request is None:
+        return
+
+    # Prefetch the many-to-many assignments (e.g. tags) of all objects at once for serialization
+    prefetch_related_objects(instances, *[field.name for field in sender._meta.many_to_many])
+
+    # Create an ObjectChange record for each object, saving them together
+    with change_logging_buffer():
+        for instance in instances:
+            objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_CREATE)
+            if objectchange and objectchange.has_changes:
+                objectchange.user = request.user
+                objectchange.request_id = request.id
+                save_objectchange(objectchange)
+
+    # Enqueue the objects for event processing
+    queue = events_queue.get()
+    enqueue_events(queue, instances, request.user, request.id, OBJECT_CREATED)
+    events_queue.set(queue)
+
+    # Increment metric counters
+    model_inserts.labels(sender._meta.model_name).inc(len(instances))
+
+
 @receiver(pre_delete)
 def handle_deleted_object(sender, instance, **kwargs):
     """
@@ -138,7 +198,7 @@ def handle_deleted_object(sender, instance, **kwargs):
         objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_DELETE)
         objectchange.user = request.user
         objectchange.request_id = request.id
-        objectchange.save()
+        save_objectchange(objectchange)
 
     # Django does not automatically send an m2m_changed signal for the reverse direction of a
     # many-to-many relationship (see https://code.djangoproject.com/ticket/17688), so we need to
@@ -178,6 +238,19 @@ def clear_events_queue(sender, **kwargs):
     events_queue.set({})
 
 
+#
+# Job handlers
+#
+
+@receiver(post_delete, sender='core.Job')
+def delete_job_file(instance, **kwargs):
+    """
+    Delete any file (e.g. a rendered export) stored by a Job when the Job is deleted.
+    """
+    if isinstance(instance.data, dict) and instance.data.get('file'):
+        default_storage.delete(instance.data['file'])
+
+
 #
 # DataSource handlers
 #
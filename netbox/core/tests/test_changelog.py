@@ -9,6 +9,7 @@ from dcim.choices import SiteStatusChoices
 from dcim.models import Site
 from extras.choices import *
 from extras.models import CustomField, CustomFieldChoiceSet, Tag
+from netbox.choices import CSVDelimiterChoices, ImportFormatChoices
 from utilities.testing import APITestCase
 from utilities.testing.utils import create_tags, post_data
 from utilities.testing.views import ModelViewTestCase
@@ -157,6 +158,41 @@ class ChangeLogViewTest(ModelViewTestCase):
         self.assertIn('_name', oc.prechange_data)
         self.assertNotIn('_name', oc.prechange_data_clean)
 
+    def test_bulk_import_objects(self):
+        create_tags('Tag 1', 'Tag 2')
+        form_data = {
+            'data': (
+                'name,slug,status,tags\n'
+                'Site 1,site-1,active,"tag-1,tag-2"\n'
+                'Site 2,site-2,active,tag-1\n'
+                'Site 3,site-3,planned,\n'
+            ),
+            'format': ImportFormatChoices.CSV,
+            'csv_delimiter': CSVDelimiterChoices.AUTO,
+        }
+
+        request = {
+            'path': self._get_url('import'),
+            'data': form_data,
+        }
+        self.add_permissions('dcim.view_site', 'dcim.add_site')
+        response = self.client.post(**request)
+        self.assertHttpStatus(response, 302)
+
+        # Tag assignments should be merged into the single record created for each object, in order of creation
+        objectchanges = ObjectChange.objects.filter(
+            changed_object_type=ContentType.objects.get_for_model(Site)
+        ).order_by('pk')
+        self.assertEqual(
+            [oc.postchange_data['name'] for oc in objectchanges],
+            ['Site 1', 'Site 2', 'Site 3']
+        )
+        self.assertEqual(objectchanges[0].action, ObjectChangeActionChoices.ACTION_CREATE)
+        self.assertEqual(objectchanges[0].postchange_data['tags'], ['Tag 1', 'Tag 2'])
+        self.assertEqual(objectchanges[1].postchange_data['tags'], ['Tag 1'])
+        self.assertEqual(objectchanges[2].postchange_data['tags'], [])
+        self.assertEqual(len({oc.request_id for oc in objectchanges}), 1)
+
     def test_bulk_update_objects(self):
         sites = (
             Site(name='Site 1', slug='site-1', status=SiteStatusChoices.STATUS_ACTIVE),
@@ -0,0 +1,65 @@
+import uuid
+
+from django.http import QueryDict
+from django.test import TestCase
+
+from core.choices import JobStatusChoices
+from core.jobs import BulkOperationJob
+from core.models import ObjectChange
+from dcim.models import Site
+from users.models import User
+from utilities.request import NetBoxFakeRequest
+
+
+class BulkOperationJobTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', is_superuser=True)
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 6)
+        ])
+
+    def get_request(self, data):
+        post = QueryDict(mutable=True)
+        for key, value in data.items():
+            if isinstance(value, list):
+                post.setlist(key, value)
+            else:
+                post[key] = value
+        return NetBoxFakeRequest({
+            'META': {},
+            'POST': post,
+            'GET': QueryDict(),
+            'FILES': {},
+            'user': self.user,
+            'path': '',
+            'id': uuid.uuid4(),
+        })
+
+    def test_bulk_delete(self):
+        pk_list = [str(pk) for pk in Site.objects.values_list('pk', flat=True)]
+        request = self.get_request({'pk': pk_list, 'confirm': 'true', '_confirm': ''})
+        view = 'dcim.views.SiteBulkDeleteView'
+
+        job = BulkOperationJob.enqueue(immediate=True, user=self.user, view=view, request=request)
+
+        self.assertEqual(job.status, JobStatusChoices.STATUS_COMPLETED)
+        self.assertEqual(job.data['total'], 5)
+        self.assertEqual(job.data['completed'], 5)
+        self.assertFalse(Site.objects.exists())
+        self.assertEqual(
+            set(ObjectChange.objects.filter(changed_object_type__model='site').values_list('request_id', flat=True)),
+            {request.id}
+        )
+
+    def test_bulk_edit(self):
+        pk_list = [str(pk) for pk in Site.objects.values_list('pk', flat=True)]
+        request = self.get_request({'pk': pk_list, 'description': 'Updated', '_apply': ''})
+        view = 'dcim.views.SiteBulkEditView'
+
+        job = BulkOperationJob.enqueue(immediate=True, user=self.user, view=view, request=request)
+
+        self.assertEqual(job.status, JobStatusChoices.STATUS_COMPLETED)
+        self.assertEqual(job.data['completed'], 5)
+        self.assertEqual(Site.objects.filter(description='Updated').count(), 5)
@@ -1,7 +1,21 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
 
-from core.models import DataSource
-from core.choices import ObjectChangeActionChoices
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.housekeeping import DeleteExpiredJobsTask
+from core.models import DataSource, Job, ObjectChange
+from core.choices import JobStatusChoices, ObjectChangeActionChoices
+from core.partitioning import (
+    convert_to_partitioned, create_partitions, drop_expired_partitions, get_month_start, get_partitions,
+    is_partitioned,
+)
+from dcim.models import Site
 from netbox.constants import CENSOR_TOKEN, CENSOR_TOKEN_CHANGED
 
 
@@ -120,3 +134,127 @@ class DataSourceChangeLoggingTestCase(TestCase):
         self.assertEqual(objectchange.prechange_data['parameters']['password'], CENSOR_TOKEN)
         self.assertEqual(objectchange.postchange_data['parameters']['username'], 'username2')
         self.assertEqual(objectchange.postchange_data['parameters']['password'], CENSOR_TOKEN)
+
+
+class ObjectChangePartitioningTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        ObjectChange.objects.bulk_create([
+            ObjectChange(
+                user_name='user1',
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE,
+                changed_object=site,
+                object_repr=str(site),
+            ) for _ in range(3)
+        ])
+
+    def setUp(self):
+        # Foreign key checks are deferred until the end of the test transaction, and a table with pending trigger
+        # events cannot be altered. Run the checks for the test data now so that the table can be converted.
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+    def test_convert_to_partitioned(self):
+        objectchange_ids = list(ObjectChange.objects.values_list('pk', flat=True))
+        self.assertFalse(is_partitioned())
+
+        convert_to_partitioned(months=3)
+        self.assertTrue(is_partitioned())
+
+        # The existing table should be retained as the legacy partition, followed by monthly partitions
+        partitions = get_partitions()
+        self.assertEqual(len(partitions), 4)
+        self.assertIsNone(partitions[0][1])
+        self.assertEqual(partitions[0][2], get_month_start(timezone.now(), 1))
+        self.assertEqual(partitions[-1][2], get_month_start(timezone.now(), 4))
+        self.assertEqual(create_partitions(months=3), 0)
+
+        # Existing records should remain accessible, and new records should receive new IDs
+        self.assertEqual(sorted(ObjectChange.objects.values_list('pk', flat=True)), sorted(objectchange_ids))
+        request_id = ObjectChange.objects.first().request_id
+        self.assertEqual(ObjectChange.objects.filter(request_id=request_id).count(), 1)
+        site = Site.objects.first()
+        objectchange = ObjectChange.objects.create(
+            user_name='user1',
+            request_id=uuid.uuid4(),
+            action=ObjectChangeActionChoices.ACTION_UPDATE,
+            changed_object=site,
+            object_repr=str(site),
+        )
+        self.assertGreater(objectchange.pk, max(objectchange_ids))
+        self.assertEqual(ObjectChange.objects.filter(changed_object_id=site.pk).count(), 4)
+
+    def test_drop_expired_partitions(self):
+        convert_to_partitioned(months=3)
+
+        # Only partitions which have expired entirely should be dropped
+        self.assertEqual(drop_expired_partitions(timezone.now()), 0)
+        self.assertEqual(drop_expired_partitions(get_month_start(timezone.now(), 2)), 2)
+        self.assertEqual(len(get_partitions()), 2)
+        self.assertFalse(ObjectChange.objects.exists())
+
+
+class HousekeepingTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        jobs = [
+            Job(name=f'Job {i}', job_id=uuid.uuid4()) for i in range(5)
+        ]
+        Job.objects.bulk_create(jobs)
+
+        # Backdate three of the jobs
+        Job.objects.filter(pk__in=[job.pk for job in jobs[:3]]).update(created=timezone.now() - timedelta(days=10))
+
+    @override_settings(JOB_RETENTION=7)
+    def test_delete_expired_jobs(self):
+        task = DeleteExpiredJobsTask(BaseCommand(stdout=StringIO()), batch_size=2)
+        task.run()
+        self.assertEqual(Job.objects.count(), 2)
+
+    @override_settings(JOB_RETENTION=7)
+    def test_delete_expired_jobs_cancels_tasks(self):
+        expired_jobs = Job.objects.filter(created__lt=timezone.now() - timedelta(days=7))
+        completed_job = expired_jobs.first()
+        Job.objects.filter(pk=completed_job.pk).update(status=JobStatusChoices.STATUS_COMPLETED)
+        enqueued_job_ids = {
+            str(job_id) for job_id in expired_jobs.exclude(pk=completed_job.pk).values_list('job_id', flat=True)
+        }
+
+        # The background tasks of expired jobs which have not finished should be canceled
+        rq_jobs = {}
+
+        def fetch_many(job_ids, connection):
+            return [rq_jobs.setdefault(job_id, Mock()) for job_id in job_ids]
+
+        task = DeleteExpiredJobsTask(BaseCommand(stdout=StringIO()), batch_size=2)
+        with patch('core.housekeeping.RQJob.fetch_many', side_effect=fetch_many):
+            task.run()
+        self.assertEqual(Job.objects.count(), 2)
+        self.assertEqual(set(rq_jobs), enqueued_job_ids)
+        for rq_job in rq_jobs.values():
+            rq_job.cancel.assert_called_once()
+
+    @override_settings(JOB_RETENTION=7)
+    def test_delete_expired_jobs_files(self):
+        cutoff = timezone.now() - timedelta(days=7)
+        expired_job = Job.objects.filter(created__lt=cutoff).first()
+        Job.objects.filter(pk=expired_job.pk).update(data={'file': 'exports/expired.csv'})
+        current_job = Job.objects.filter(created__gte=cutoff).first()
+        Job.objects.filter(pk=current_job.pk).update(data={'file': 'exports/current.csv'})
+
+        # Files stored by expired jobs should be deleted along with the jobs
+        task = DeleteExpiredJobsTask(BaseCommand(stdout=StringIO()), batch_size=2)
+        with patch('core.housekeeping.default_storage') as storage:
+            task.run()
+        self.assertEqual(Job.objects.count(), 2)
+        storage.delete.assert_called_once_with('exports/expired.csv')
+
+    @override_settings(JOB_RETENTION=7)
+    def test_time_limit(self):
+        task = DeleteExpiredJobsTask(BaseCommand(stdout=StringIO()), batch_size=2, deadline=0)
+        task.run()
+        self.assertEqual(Job.objects.count(), 5)
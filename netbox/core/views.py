@@ -6,8 +6,9 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.db import connection, ProgrammingError
-from django.http import HttpResponse, HttpResponseForbidden, Http404
+from django.http import FileResponse, HttpResponse, HttpResponseForbidden, Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -36,7 +37,7 @@ from utilities.query import count_related
 from utilities.views import ContentTypePermissionRequiredMixin, GetRelatedModelsMixin, register_model_view
 from . import filtersets, forms, tables
 from .choices import DataSourceStatusChoices
-from .jobs import SyncDataSourceJob
+from .jobs import BulkOperationJob, SyncDataSourceJob
 from .models import *
 from .plugins import get_catalog_plugins, get_local_plugins
 from .tables import CatalogPluginTable, PluginVersionTable
@@ -173,6 +174,50 @@ class JobListView(generic.ObjectListView):
 class JobView(generic.ObjectView):
     queryset = Job.objects.all()
 
+    def get_extra_context(self, request, instance):
+        # Report the progress of jobs which process a known number of objects (e.g. bulk operations)
+        data = instance.data if isinstance(instance.data, dict) else {}
+        if instance.name == BulkOperationJob.name or 'total' in data:
+            total = data.get('total')
+            return {
+                'progress': data.get('completed', 0) / total * 100 if total else 0,
+            }
+        return {}
+
+    def get(self, request, **kwargs):
+        # If polled via HTMX, render only the job's progress
+        if htmx_partial(request):
+            instance = self.get_object(**kwargs)
+            return render(request, 'core/inc/job_progress.html', {
+                'object': instance,
+                **self.get_extra_context(request, instance),
+            })
+
+        return super().get(request, **kwargs)
+
+
+class JobDownloadView(generic.ObjectView):
+    """
+    Download the file (e.g. a rendered export) stored by a job.
+    """
+    queryset = Job.objects.all()
+
+    def get(self, request, pk):
+        job = get_object_or_404(self.queryset, pk=pk)
+
+        # The file may include objects which are not visible to other users
+        if request.user != job.user and not request.user.is_superuser:
+            return HttpResponseForbidden()
+        if not isinstance(job.data, dict) or 'file' not in job.data:
+            raise Http404
+
+        return FileResponse(
+            default_storage.open(job.data['file']),
+            as_attachment=True,
+            filename=job.data['filename'],
+            content_type=job.data['content_type']
+        )
+
 
 class JobDeleteView(generic.ObjectDeleteView):
     queryset = Job.objects.all()
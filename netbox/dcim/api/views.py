@@ -10,7 +10,7 @@ from rest_framework.viewsets import ViewSet
 from dcim import filtersets
 from dcim.constants import CABLE_TRACE_SVG_DEFAULT_WIDTH
 from dcim.models import *
-from dcim.svg import CableTraceSVG
+from dcim.svg import CableTraceSVG, render_rack_elevations
 from extras.api.mixins import ConfigContextQuerySetMixin, RenderConfigMixin
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.metadata import ContentTypeMetadata
@@ -206,8 +206,9 @@ class RackViewSet(NetBoxModelViewSet):
                 except ValueError:
                     pass
 
-            # Render and return the elevation as an SVG drawing with the correct content type
-            drawing = rack.get_elevation_svg(
+            # Render (or retrieve from the cache) the elevation and return it with the correct content type
+            svg = render_rack_elevations(
+                [rack],
                 face=data['face'],
                 user=request.user,
                 unit_width=data['unit_width'],
@@ -216,8 +217,8 @@ class RackViewSet(NetBoxModelViewSet):
                 include_images=data['include_images'],
                 base_url=request.build_absolute_uri('/'),
                 highlight_params=highlight_params
-            )
-            return HttpResponse(drawing.tostring(), content_type='image/svg+xml')
+            )[rack.pk]
+            return HttpResponse(svg, content_type='image/svg+xml')
 
         else:
             # Return a JSON representation of the rack units in the elevation
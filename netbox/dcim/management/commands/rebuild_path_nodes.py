@@ -0,0 +1,35 @@
+import itertools
+
+from django.core.management.base import BaseCommand
+
+from dcim.models import CablePath
+
+
+class Command(BaseCommand):
+    help = "Rebuild the indexed list of nodes traversed by each cable path"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, dest='batch_size',
+            help="Number of cable paths to process at a time (default: 1000)"
+        )
+
+    def handle(self, **options):
+        batch_size = options['batch_size']
+        self.stdout.write(f'Checking {CablePath.objects.count()} cable paths...')
+
+        updated_count = 0
+        to_update = []
+        for cablepath in CablePath.objects.only('path', '_nodes').iterator(chunk_size=batch_size):
+            nodes = list(itertools.chain(*cablepath.path))
+            if cablepath._nodes != nodes:
+                cablepath._nodes = nodes
+                to_update.append(cablepath)
+            if len(to_update) >= batch_size:
+                updated_count += CablePath.objects.bulk_update(to_update, fields=('_nodes',))
+                to_update = []
+        if to_update:
+            updated_count += CablePath.objects.bulk_update(to_update, fields=('_nodes',))
+
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated_count} cable paths.'))
+        self.stdout.write(self.style.SUCCESS('Finished.'))
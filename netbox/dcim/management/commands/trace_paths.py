@@ -4,7 +4,7 @@ from django.db import connection
 from django.db.models import Q
 
 from dcim.models import CablePath, ConsolePort, ConsoleServerPort, Interface, PowerFeed, PowerOutlet, PowerPort
-from dcim.signals import create_cablepath
+from dcim.tracing import CablePathBatch
 
 ENDPOINT_MODELS = (
     ConsolePort,
@@ -15,6 +15,9 @@ ENDPOINT_MODELS = (
     PowerPort
 )
 
+# Number of paths to trace and write at a time
+BATCH_SIZE = 500
+
 
 class Command(BaseCommand):
     help = "Generate any missing cable paths among all cable termination objects in NetBox"
@@ -79,11 +82,14 @@ class Command(BaseCommand):
                 self.stdout.write(f'Found no missing {model._meta.verbose_name} paths; skipping')
                 continue
             self.stdout.write(f'Retracing {origins_count} cabled {model._meta.verbose_name_plural}...')
+            batch = CablePathBatch()
             i = 0
-            for i, obj in enumerate(origins, start=1):
-                create_cablepath([obj])
-                if not i % 100:
+            for i, obj in enumerate(origins.iterator(chunk_size=BATCH_SIZE), start=1):
+                batch.create([obj])
+                if not i % BATCH_SIZE:
+                    batch.commit()
                     self.draw_progress_bar(i * 100 / origins_count)
+            batch.commit()
             self.draw_progress_bar(100)
             self.stdout.write(self.style.SUCCESS(f'\n  Retraced {i} {model._meta.verbose_name_plural}'))
 
@@ -1,7 +1,9 @@
+import copy
 import itertools
 from collections import defaultdict
 
 from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Sum
@@ -461,6 +463,10 @@ class CablePath(models.Model):
     _netbox_private = True
 
     class Meta:
+        indexes = (
+            # Enables efficient lookup of all paths traversing a node (_nodes__contains)
+            GinIndex(fields=('_nodes',)),
+        )
         verbose_name = _('cable path')
         verbose_name_plural = _('cable paths')
 
@@ -521,20 +527,31 @@ class CablePath(models.Model):
         return int(len(self.path) / 3)
 
     @classmethod
-    def from_origin(cls, terminations):
+    def from_origin(cls, terminations, tracer=None):
         """
         Create a new CablePath instance as traced from the given termination objects. These can be any object to which a
         Cable or WirelessLink connects (interfaces, console ports, circuit termination, etc.). All terminations must be
         of the same type and must belong to the same parent object.
+
+        :param terminations: The originating termination objects
+        :param tracer: A PathTracer used to resolve the topology being traversed (optional). Passing a shared instance
+            allows many paths to be traced from the same bulk-loaded topology. If not specified, the topology cache is
+            used if enabled.
         """
         from circuits.models import CircuitTermination
+        from dcim.topology import topology_cache
+        from dcim.tracing import PathTracer
 
         if not terminations:
             return None
+        if tracer is None:
+            with topology_cache() as topology:
+                return cls.from_origin(terminations, tracer=topology or PathTracer())
 
         # Ensure all originating terminations are attached to the same link
         if len(terminations) > 1:
-            assert all(t.link == terminations[0].link for t in terminations[1:])
+            links = tracer.get_links(terminations)
+            assert all(link == links[0] for link in links[1:])
 
         path = []
         position_stack = []
@@ -552,9 +569,12 @@ class CablePath(models.Model):
                 assert all(isinstance(t, type(terminations[0])) for t in terminations[1:])
                 assert all(t.parent_object == terminations[0].parent_object for t in terminations[1:])
 
+            # Resolve the link (Cable or WirelessLink) attached to each termination, if any
+            termination_links = tracer.get_links(terminations)
+
             # Check for a split path (e.g. rear port fanning out to multiple front ports with
             # different cables attached)
-            if len(set(t.link for t in terminations)) > 1 and (
+            if len(set(termination_links)) > 1 and (
                     position_stack and len(terminations) != len(position_stack[-1])
             ):
                 is_split = True
@@ -566,7 +586,7 @@ class CablePath(models.Model):
             ])
 
             # Step 2: Determine the attached links (Cable or WirelessLink), if any
-            links = [termination.link for termination in terminations if termination.link is not None]
+            links = [link for link in termination_links if link is not None]
             if len(links) == 0:
                 if len(path) == 1:
                     # If this is the start of the path and no link exists, return None
@@ -577,7 +597,7 @@ class CablePath(models.Model):
             assert all(isinstance(link, type(links[0])) for link in links)
 
             # Step 3: Record asymmetric paths as split
-            not_connected_terminations = [termination.link for termination in terminations if termination.link is None]
+            not_connected_terminations = [link for link in termination_links if link is None]
             if len(not_connected_terminations) > 0:
                 is_complete = False
                 is_split = True
@@ -596,23 +616,11 @@ class CablePath(models.Model):
 
             # Step 6: Determine the far-end terminations
             if isinstance(links[0], Cable):
-                termination_type = ObjectType.objects.get_for_model(terminations[0])
-                local_cable_terminations = CableTermination.objects.filter(
-                    termination_type=termination_type,
-                    termination_id__in=[t.pk for t in terminations]
-                )
-
-                q_filter = Q()
-                for lct in local_cable_terminations:
-                    cable_end = 'A' if lct.cable_end == 'B' else 'B'
-                    q_filter |= Q(cable=lct.cable, cable_end=cable_end)
+                remote_terminations = tracer.get_far_end_terminations(terminations)
 
-                # Make sure this filter has been populated; if not, we have probably been given invalid data
-                if not q_filter:
+                # Make sure the far end has been resolved; if not, we have probably been given invalid data
+                if remote_terminations is None:
                     break
-
-                remote_cable_terminations = CableTermination.objects.filter(q_filter)
-                remote_terminations = [ct.termination for ct in remote_cable_terminations]
             else:
                 # WirelessLink
                 remote_terminations = [
@@ -636,9 +644,7 @@ class CablePath(models.Model):
 
             if isinstance(remote_terminations[0], FrontPort):
                 # Follow FrontPorts to their corresponding RearPorts
-                rear_ports = RearPort.objects.filter(
-                    pk__in=[t.rear_port_id for t in remote_terminations]
-                )
+                rear_ports = tracer.get_rear_ports(remote_terminations)
                 if len(rear_ports) > 1 or rear_ports[0].positions > 1:
                     position_stack.append([fp.rear_port_position for fp in remote_terminations])
 
@@ -646,10 +652,7 @@ class CablePath(models.Model):
 
             elif isinstance(remote_terminations[0], RearPort):
                 if len(remote_terminations) == 1 and remote_terminations[0].positions == 1:
-                    front_ports = FrontPort.objects.filter(
-                        rear_port_id__in=[rp.pk for rp in remote_terminations],
-                        rear_port_position=1
-                    )
+                    front_ports = tracer.get_front_ports([(remote_terminations[0], 1)])
                 # Obtain the individual front ports based on the termination and all positions
                 elif len(remote_terminations) > 1 and position_stack:
                     positions = position_stack.pop()
@@ -658,21 +661,17 @@ class CablePath(models.Model):
                     assert len(remote_terminations) == len(positions)
 
                     # Get our front ports
-                    q_filter = Q()
-                    for rt in remote_terminations:
-                        position = positions.pop()
-                        q_filter |= Q(rear_port_id=rt.pk, rear_port_position=position)
-                    assert q_filter is not Q()
-                    front_ports = FrontPort.objects.filter(q_filter)
+                    front_ports = tracer.get_front_ports([
+                        (rt, positions.pop()) for rt in remote_terminations
+                    ])
                 # Obtain the individual front ports based on the termination and position
                 elif position_stack:
-                    front_ports = FrontPort.objects.filter(
-                        rear_port_id=remote_terminations[0].pk,
-                        rear_port_position__in=position_stack.pop()
-                    )
+                    front_ports = tracer.get_front_ports([
+                        (remote_terminations[0], position) for position in position_stack.pop()
+                    ])
                 # If all rear ports have a single position, we can just get the front ports
                 elif all([rp.positions == 1 for rp in remote_terminations]):
-                    front_ports = FrontPort.objects.filter(rear_port_id__in=[rp.pk for rp in remote_terminations])
+                    front_ports = tracer.get_front_ports([(rp, None) for rp in remote_terminations])
 
                     if len(front_ports) != len(remote_terminations):
                         # Some rear ports does not have a front port
@@ -690,10 +689,7 @@ class CablePath(models.Model):
                 if len(remote_terminations) > 1:
                     is_split = True
                     break
-                circuit_termination = CircuitTermination.objects.filter(
-                    circuit=remote_terminations[0].circuit,
-                    term_side='Z' if remote_terminations[0].term_side == 'A' else 'A'
-                ).first()
+                circuit_termination = tracer.get_peer_circuit_termination(remote_terminations[0])
                 if circuit_termination is None:
                     break
                 elif circuit_termination.provider_network:
@@ -752,6 +748,18 @@ class CablePath(models.Model):
         """
         Return the path as a list of prefetched objects.
         """
+        from dcim.topology import topology_cache
+
+        # Resolve path objects from the topology cache, if enabled. Copies are returned to ensure that cached instances
+        # are never modified.
+        with topology_cache() as topology:
+            if topology is not None:
+                topology.get_node_objects(self._nodes)
+                return [
+                    [copy.copy(obj) for obj in topology.get_node_objects(step) if obj is not None]
+                    for step in self.path
+                ]
+
         # Compile a list of IDs to prefetch for each type of model in the path
         to_prefetch = defaultdict(list)
         for node in self._nodes:
@@ -22,6 +22,7 @@ from netbox.choices import ColorChoices
 from netbox.config import ConfigItem
 from netbox.models import OrganizationalModel, PrimaryModel
 from netbox.models.features import ContactsMixin, ImageAttachmentsMixin
+from netbox.signals import post_bulk_create
 from utilities.fields import ColorField, CounterCacheField, NaturalOrderingField
 from utilities.tracking import TrackingModelMixin
 from .device_components import *
@@ -808,6 +809,12 @@ class Device(
         verbose_name = _('device')
         verbose_name_plural = _('devices')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Save the original rack assignment, so that the rack's elevation can be invalidated if it changes
+        self._original_rack_id = self.__dict__.get('rack_id')
+
     def __str__(self):
         if self.name and self.asset_tag:
             return f'{self.name} ({self.asset_tag})'
@@ -1009,16 +1016,8 @@ class Device(
                 for component in components:
                     component.custom_field_data = cf_defaults
             model.objects.bulk_create(components)
-            # Manually send the post_save signal for each of the newly created components
-            for component in components:
-                post_save.send(
-                    sender=model,
-                    instance=component,
-                    created=True,
-                    raw=False,
-                    using='default',
-                    update_fields=None
-                )
+            # Manually send the post_bulk_create signal for the newly created components
+            post_bulk_create.send(sender=model, instances=components, using='default')
         else:
             for obj in queryset:
                 component = obj.instantiate(device=self)
@@ -1284,16 +1283,9 @@ class Module(PrimaryModel, ConfigContextModel):
 
             if component_model is not ModuleBay:
                 component_model.objects.bulk_create(create_instances)
-                # Emit the post_save signal for each newly created object
-                for component in create_instances:
-                    post_save.send(
-                        sender=component_model,
-                        instance=component,
-                        created=True,
-                        raw=False,
-                        using='default',
-                        update_fields=None
-                    )
+                # Emit the post_bulk_create signal for the newly created objects
+                if create_instances:
+                    post_bulk_create.send(sender=component_model, instances=create_instances, using='default')
             else:
                 # ModuleBays must be saved individually for MPTT
                 for instance in create_instances:
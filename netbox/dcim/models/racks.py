@@ -1,5 +1,6 @@
 import decimal
 from functools import cached_property
+from itertools import chain
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
@@ -13,6 +14,8 @@ from django.utils.translation import gettext_lazy as _
 
 from dcim.choices import *
 from dcim.constants import *
+from dcim.querysets import RackQuerySet
+from dcim.rackspace import RackSpace
 from dcim.svg import RackElevationSVG
 from netbox.choices import ColorChoices
 from netbox.models import OrganizationalModel, PrimaryModel
@@ -335,6 +338,8 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         related_query_name='rack'
     )
 
+    objects = RackQuerySet.as_manager()
+
     clone_fields = (
         'site', 'location', 'tenant', 'status', 'role', 'form_factor', 'width', 'airflow', 'u_height', 'desc_units',
         'outer_width', 'outer_depth', 'outer_unit', 'mounting_depth', 'weight', 'max_weight', 'weight_unit',
@@ -488,16 +493,24 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
             )
 
             # Determine which devices the user has permission to view
-            permitted_device_ids = []
+            permitted_device_ids = set()
             if user is not None:
-                permitted_device_ids = self.devices.restrict(user, 'view').values_list('pk', flat=True)
+                permitted_device_ids = set(self.devices.restrict(user, 'view').values_list('pk', flat=True))
+
+            if expand_devices:
+                space = RackSpace(self, devices=[
+                    (device.pk, device.position, device.device_type.u_height, device.face,
+                     device.device_type.is_full_depth, device.device_type.exclude_from_utilization)
+                    for device in devices
+                ])
+                for u in space.get_units(space.get_occupied()):
+                    elevation[u]['occupied'] = True
 
             for device in devices:
                 if expand_devices:
-                    for u in drange(device.position, device.position + device.device_type.u_height, 0.5):
-                        if user is None or device.pk in permitted_device_ids:
+                    if user is None or device.pk in permitted_device_ids:
+                        for u in space.get_units(space.get_span(device.position, device.device_type.u_height)):
                             elevation[u]['device'] = device
-                        elevation[u]['occupied'] = True
                 else:
                     if user is None or device.pk in permitted_device_ids:
                         elevation[device.position]['device'] = device
@@ -517,34 +530,37 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         :param exclude: List of devices IDs to exclude (useful when moving a device within a rack)
         :param ignore_excluded_devices: Ignore devices that are marked to exclude from utilization calculations
         """
-        # Gather all devices which consume U space within the rack
-        devices = self.devices.prefetch_related('device_type').filter(position__gte=1)
-        if ignore_excluded_devices:
-            devices = devices.exclude(device_type__exclude_from_utilization=True)
-
-        if exclude is not None:
-            devices = devices.exclude(pk__in=exclude)
-
-        # Initialize the rack unit skeleton
-        units = list(self.units)
-
-        # Remove units consumed by installed devices
-        for d in devices:
-            if rack_face is None or d.face == rack_face or d.device_type.is_full_depth:
-                for u in drange(d.position, d.position + d.device_type.u_height, 0.5):
-                    try:
-                        units.remove(u)
-                    except ValueError:
-                        # Found overlapping devices in the rack!
-                        pass
-
-        # Remove units without enough space above them to accommodate a device of the specified height
-        available_units = []
-        for u in units:
-            if set(drange(u, u + decimal.Decimal(u_height), 0.5)).issubset(units):
-                available_units.append(u)
-
-        return list(reversed(available_units))
+        space = self.get_space()
+        available_units = space.get_units(space.get_available(
+            u_height,
+            face=rack_face,
+            exclude=exclude,
+            ignore_excluded_devices=ignore_excluded_devices
+        ))
+
+        # Order units from the bottom of the rack to the top
+        if self.desc_units:
+            available_units.reverse()
+        return available_units
+
+    def get_space(self):
+        """
+        Return a RackSpace indexing the units occupied by devices and reservations within the rack. Where the rack has
+        been retrieved using RackQuerySet.annotate_occupancy(), no further queries are needed.
+        """
+        if hasattr(self, '_device_spans'):
+            devices = self._device_spans or ()
+            reserved_units = chain.from_iterable(self._reserved_units or ())
+        elif self._state.adding:
+            devices = reserved_units = ()
+        else:
+            devices = self.devices.filter(position__gte=1).values_list(
+                'pk', 'position', 'device_type__u_height', 'face', 'device_type__is_full_depth',
+                'device_type__exclude_from_utilization'
+            )
+            reserved_units = chain.from_iterable(self.reservations.values_list('units', flat=True))
+
+        return RackSpace(self, devices=devices, reserved_units=reserved_units)
 
     def get_reserved_units(self):
         """
@@ -604,20 +620,7 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         Determine the utilization rate of the rack and return it as a percentage. Occupied and reserved units both count
         as utilized.
         """
-        # Determine unoccupied units
-        total_units = len(list(self.units))
-        available_units = self.get_available_units(u_height=0.5, ignore_excluded_devices=True)
-
-        # Remove reserved units
-        for ru in self.get_reserved_units():
-            for u in drange(ru, ru + 1, 0.5):
-                if u in available_units:
-                    available_units.remove(u)
-
-        occupied_unit_count = total_units - len(available_units)
-        percentage = float(occupied_unit_count) / total_units * 100
-
-        return percentage
+        return self.get_space().get_utilization()
 
     def get_power_utilization(self):
         """
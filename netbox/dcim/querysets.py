@@ -0,0 +1,45 @@
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import F, Func, JSONField, OuterRef, Subquery
+
+from utilities.querysets import RestrictedQuerySet
+
+__all__ = (
+    'RackQuerySet',
+)
+
+
+class RackQuerySet(RestrictedQuerySet):
+
+    def annotate_occupancy(self):
+        """
+        Annotate the mounted devices and reserved units of each Rack, from which Rack.get_space() builds its index of
+        occupied units without any further queries. This allows the utilization of an entire page of racks to be
+        determined using a single query.
+        """
+        from .models import Device, RackReservation
+
+        devices = Device.objects.filter(
+            rack=OuterRef('pk'),
+            position__gte=1
+        ).order_by().values('rack').annotate(
+            spans=JSONBAgg(Func(
+                F('pk'),
+                F('position'),
+                F('device_type__u_height'),
+                F('face'),
+                F('device_type__is_full_depth'),
+                F('device_type__exclude_from_utilization'),
+                function='jsonb_build_array',
+                output_field=JSONField()
+            ))
+        ).values('spans')
+        reservations = RackReservation.objects.filter(
+            rack=OuterRef('pk')
+        ).order_by().values('rack').annotate(
+            units=JSONBAgg('units')
+        ).values('units')
+
+        return self.annotate(
+            _device_spans=Subquery(devices, output_field=JSONField()),
+            _reserved_units=Subquery(reservations, output_field=JSONField())
+        )
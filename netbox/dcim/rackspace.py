@@ -0,0 +1,113 @@
+import decimal
+
+__all__ = (
+    'RackSpace',
+)
+
+
+def to_decimal(value):
+    """
+    Convert a unit number or height (which may have been decoded from JSON as a float) to a Decimal.
+    """
+    return value if isinstance(value, decimal.Decimal) else decimal.Decimal(str(value))
+
+
+def iter_bits(bitmap):
+    """
+    Yield the index of each set bit in a bitmap, from lowest to highest.
+    """
+    while bitmap:
+        lowest = bitmap & -bitmap
+        yield lowest.bit_length() - 1
+        bitmap ^= lowest
+
+
+class RackSpace:
+    """
+    An index of the space consumed within a rack by mounted devices and reservations. Occupancy is represented as
+    bitmaps with one bit per half unit (the lowest-numbered half unit being bit 0), so that the units available to a
+    device of any height, or the rack's utilization, can be determined using a handful of integer operations rather
+    than by comparing sets of units.
+
+    Args:
+        rack: The Rack instance
+        devices: An iterable of (pk, position, u_height, face, is_full_depth, exclude_from_utilization) tuples, one for
+            each device mounted within the rack
+        reserved_units: An iterable of reserved unit numbers
+    """
+    def __init__(self, rack, devices=(), reserved_units=()):
+        self.starting_unit = rack.starting_unit
+        self.size = rack.u_height * 2
+        self.mask = (1 << self.size) - 1
+
+        # All unit numbers within the rack, in ascending order (one per bit)
+        self.units = sorted(rack.units)
+
+        self.devices = [
+            (pk, self.get_span(position, u_height), face, is_full_depth, exclude_from_utilization)
+            for pk, position, u_height, face, is_full_depth, exclude_from_utilization in devices
+        ]
+        self.reserved = 0
+        for unit in reserved_units:
+            self.reserved |= self.get_span(unit, 1)
+
+    def __repr__(self):
+        return f'<RackSpace: {self.size // 2}U>'
+
+    def get_span(self, position, u_height):
+        """
+        Return a bitmap of the half units occupied by a device of the given height mounted at the given position.
+        """
+        start = int((to_decimal(position) - self.starting_unit) * 2)
+        length = int(to_decimal(u_height) * 2)
+        if start < 0:
+            length += start
+            start = 0
+        if length <= 0:
+            return 0
+        return ((1 << length) - 1) << start & self.mask
+
+    def get_units(self, bitmap):
+        """
+        Return a list of the unit numbers represented by a bitmap, in ascending order.
+        """
+        return [self.units[i] for i in iter_bits(bitmap & self.mask)]
+
+    def get_occupied(self, face=None, exclude=None, ignore_excluded_devices=False):
+        """
+        Return a bitmap of the half units occupied by devices.
+
+        Args:
+            face: The rack face (front or rear) of interest. If None, devices on either face are included. Full-depth
+                devices are always included.
+            exclude: An iterable of device PKs to disregard
+            ignore_excluded_devices: Disregard devices whose type is excluded from utilization calculations
+        """
+        exclude = set(exclude or ())
+        occupied = 0
+        for pk, span, device_face, is_full_depth, exclude_from_utilization in self.devices:
+            if pk in exclude or (ignore_excluded_devices and exclude_from_utilization):
+                continue
+            if face is None or device_face == face or is_full_depth:
+                occupied |= span
+        return occupied
+
+    def get_available(self, u_height=1, face=None, exclude=None, ignore_excluded_devices=False):
+        """
+        Return a bitmap of the positions at which a device of the given height may be mounted, i.e. the free half
+        units which have at least u_height units of contiguous free space at and above them. Accepts the same
+        arguments as get_occupied().
+        """
+        free = ~self.get_occupied(face, exclude, ignore_excluded_devices) & self.mask
+        available = free
+        for i in range(1, int(to_decimal(u_height) * 2)):
+            available &= free >> i
+        return available
+
+    def get_utilization(self):
+        """
+        Return the percentage of the rack's units which are occupied (excluding devices whose type is excluded from
+        utilization calculations) or reserved.
+        """
+        occupied = self.get_occupied(ignore_excluded_devices=True) | self.reserved
+        return float(occupied.bit_count()) / self.size * 100
@@ -1,13 +1,23 @@
 import logging
 
+from django.apps import apps
+from django.conf import settings
 from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 
 from .choices import CableEndChoices, LinkStatusChoices
+from circuits.models import ProviderNetwork
+from netbox.signals import post_bulk_create
+from wireless.models import WirelessLink
 from .models import (
-    Cable, CablePath, CableTermination, Device, FrontPort, PathEndpoint, PowerPanel, Rack, Location, VirtualChassis,
+    Cable, CablePath, CableTermination, Device, DeviceBay, DeviceRole, DeviceType, FrontPort, Manufacturer,
+    PathEndpoint, PowerPanel, Rack, RackReservation, Location, Site, VirtualChassis,
 )
 from .models.cables import trace_paths
+from .models.device_components import CabledObjectModel
+from .svg import invalidate_rack_elevations
+from .topology import invalidate_topology
+from .tracing import cable_path_batch
 from .utils import create_cablepath, rebuild_paths
 
 
@@ -91,14 +101,15 @@ def update_connected_endpoints(instance, created, raw=False, **kwargs):
                 a_terminations.append(t.termination)
             else:
                 b_terminations.append(t.termination)
-        for nodes in [a_terminations, b_terminations]:
-            # Examine type of first termination to determine object type (all must be the same)
-            if not nodes:
-                continue
-            if isinstance(nodes[0], PathEndpoint):
-                create_cablepath(nodes)
-            else:
-                rebuild_paths(nodes)
+        with cable_path_batch():
+            for nodes in [a_terminations, b_terminations]:
+                # Examine type of first termination to determine object type (all must be the same)
+                if not nodes:
+                    continue
+                if isinstance(nodes[0], PathEndpoint):
+                    create_cablepath(nodes)
+                else:
+                    rebuild_paths(nodes)
 
     # Update status of CablePaths if Cable status has been changed
     elif instance.status != instance._orig_status:
@@ -113,8 +124,8 @@ def retrace_cable_paths(instance, **kwargs):
     """
     When a Cable is deleted, check for and update its connected endpoints
     """
-    for cablepath in CablePath.objects.filter(_nodes__contains=instance):
-        cablepath.retrace()
+    with cable_path_batch() as batch:
+        batch.retrace([instance])
 
 
 @receiver(post_delete, sender=CableTermination)
@@ -125,11 +136,9 @@ def nullify_connected_endpoints(instance, **kwargs):
     model = instance.termination_type.model_class()
     model.objects.filter(pk=instance.termination_id).update(cable=None, cable_end='')
 
-    for cablepath in CablePath.objects.filter(_nodes__contains=instance.cable):
-        # Remove the deleted CableTermination if it's one of the path's originating nodes
-        if instance.termination in cablepath.origins:
-            cablepath.origins.remove(instance.termination)
-        cablepath.retrace()
+    # Remove the deleted CableTermination from the originating nodes of any affected paths
+    with cable_path_batch() as batch:
+        batch.retrace([instance.cable], exclude_origin=instance.termination)
 
 
 @receiver(post_save, sender=FrontPort)
@@ -138,6 +147,142 @@ def extend_rearport_cable_paths(instance, created, raw, **kwargs):
     When a new FrontPort is created, add it to any CablePaths which end at its corresponding RearPort.
     """
     if created and not raw:
-        rearport = instance.rear_port
-        for cablepath in CablePath.objects.filter(_nodes__contains=rearport):
-            cablepath.retrace()
+        with cable_path_batch() as batch:
+            batch.retrace([instance.rear_port])
+
+
+@receiver(post_bulk_create, sender=FrontPort)
+def extend_rearport_cable_paths_bulk(instances, **kwargs):
+    """
+    When FrontPorts are created in bulk, add them to any CablePaths which end at their corresponding RearPorts.
+    """
+    with cable_path_batch() as batch:
+        batch.retrace([instance.rear_port for instance in instances])
+
+
+#
+# Cable topology cache
+#
+
+# Models whose objects are retained by the cable topology cache
+CABLE_TOPOLOGY_MODELS = (Cable, CableTermination, CablePath, CabledObjectModel, WirelessLink)
+
+# Models referenced by the objects retained by the cable topology cache (e.g. for rendering)
+CABLE_TOPOLOGY_RELATED_MODELS = (Device, Site, ProviderNetwork)
+
+
+def discard_from_cable_topology(model, instances):
+    """
+    Discard the given objects of the specified model from the cable topology cache, if enabled.
+    """
+    if not settings.CABLE_TOPOLOGY_CACHE:
+        return
+
+    if issubclass(model, CABLE_TOPOLOGY_MODELS):
+        invalidate_topology(*instances)
+    elif issubclass(model, CABLE_TOPOLOGY_RELATED_MODELS):
+        invalidate_topology()
+
+
+def invalidate_cable_topology(sender, instance, raw=False, **kwargs):
+    """
+    Discard any modified objects from the cable topology cache.
+    """
+    if not raw:
+        discard_from_cable_topology(sender, [instance])
+
+
+def invalidate_cable_topology_bulk(sender, instances, **kwargs):
+    """
+    Discard any objects created in bulk from the cable topology cache.
+    """
+    discard_from_cable_topology(sender, instances)
+
+
+for model in apps.get_models():
+    if issubclass(model, (*CABLE_TOPOLOGY_MODELS, *CABLE_TOPOLOGY_RELATED_MODELS)):
+        post_save.connect(invalidate_cable_topology, sender=model)
+        post_delete.connect(invalidate_cable_topology, sender=model)
+        post_bulk_create.connect(invalidate_cable_topology_bulk, sender=model)
+
+
+#
+# Rack elevation cache
+#
+
+# Models whose objects are depicted in (or referenced by) rendered rack elevations
+RACK_ELEVATION_MODELS = (
+    Rack, Device, DeviceBay, RackReservation, DeviceRole, DeviceType, Manufacturer, VirtualChassis,
+)
+
+
+def get_elevation_rack_ids(instance):
+    """
+    Return the set of PKs of the racks whose elevations depict an object, or None if the object may be depicted in
+    the elevation of any rack.
+    """
+    if isinstance(instance, Rack):
+        return {instance.pk}
+
+    if isinstance(instance, Device):
+        return {instance.rack_id, instance._original_rack_id} - {None}
+
+    # Device labels indicate the number of occupied device bays
+    if isinstance(instance, DeviceBay):
+        try:
+            return {instance.device.rack_id} - {None}
+        except Device.DoesNotExist:
+            return set()
+
+    if isinstance(instance, RackReservation):
+        return {instance.rack_id}
+
+    # Rendered devices reference these
+    if isinstance(instance, (DeviceRole, DeviceType, Manufacturer, VirtualChassis)):
+        return None
+
+    return set()
+
+
+def invalidate_elevations_for(instances):
+    """
+    Invalidate the cached elevations of any racks which depict the given objects, if enabled.
+    """
+    if not settings.RACK_ELEVATION_CACHE_TIMEOUT:
+        return
+
+    rack_ids = set()
+    for instance in instances:
+        if (instance_rack_ids := get_elevation_rack_ids(instance)) is None:
+            invalidate_rack_elevations()
+            return
+        rack_ids.update(instance_rack_ids)
+
+    if rack_ids:
+        invalidate_rack_elevations(*rack_ids)
+
+
+def invalidate_rack_elevation_cache(instance, raw=False, **kwargs):
+    """
+    Invalidate the cached elevations of any racks affected by a change.
+    """
+    if raw:
+        return
+
+    invalidate_elevations_for([instance])
+    if isinstance(instance, Device):
+        instance._original_rack_id = instance.rack_id
+
+
+def invalidate_rack_elevation_cache_bulk(sender, instances, **kwargs):
+    """
+    Invalidate the cached elevations of any racks affected by the creation of objects in bulk.
+    """
+    invalidate_elevations_for(instances)
+
+
+for model in apps.get_models():
+    if issubclass(model, RACK_ELEVATION_MODELS):
+        post_save.connect(invalidate_rack_elevation_cache, sender=model)
+        post_delete.connect(invalidate_rack_elevation_cache, sender=model)
+        post_bulk_create.connect(invalidate_rack_elevation_cache_bulk, sender=model)
@@ -1,2 +1,3 @@
 from .cables import *
 from .racks import *
+from .cache import *
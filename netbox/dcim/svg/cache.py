@@ -0,0 +1,126 @@
+import hashlib
+import json
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from dcim.constants import RACK_ELEVATION_DEFAULT_LEGEND_WIDTH, RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
+from netbox.config import get_config
+from utilities.permissions import get_constraints_fingerprint
+from .racks import RackElevationSVG
+
+__all__ = (
+    'invalidate_rack_elevations',
+    'render_rack_elevations',
+)
+
+# Identifies the current content of all rack elevations. This changes whenever an object referenced by devices in
+# any rack (e.g. a device type or role) is modified.
+GLOBAL_VERSION_KEY = 'dcim.rack_elevation.version'
+
+# Identifies the current content of an individual rack's elevation
+RACK_VERSION_KEY = 'dcim.rack_elevation.{}.version'
+
+ELEVATION_KEY = 'dcim.rack_elevation.{}.{}'
+
+
+def get_versions(rack_ids):
+    """
+    Return the global content version and a dictionary mapping each rack PK to its content version. Versions are
+    random tokens rather than counters, so that a version evicted from the cache can never be reissued.
+    """
+    keys = [GLOBAL_VERSION_KEY, *(RACK_VERSION_KEY.format(pk) for pk in rack_ids)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+            versions[key] = version
+
+    return versions[GLOBAL_VERSION_KEY], {pk: versions[RACK_VERSION_KEY.format(pk)] for pk in rack_ids}
+
+
+def _bump_versions(rack_ids):
+    if rack_ids:
+        cache.set_many({RACK_VERSION_KEY.format(pk): uuid.uuid4().hex for pk in rack_ids}, timeout=None)
+    else:
+        cache.set(GLOBAL_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_rack_elevations(*rack_ids):
+    """
+    Invalidate the cached elevations of the specified racks, or of all racks if none are specified. Invalidation is
+    repeated once the current transaction (if any) has been committed, so that no elevation rendered from data
+    preceding the commit is retained.
+    """
+    if not settings.RACK_ELEVATION_CACHE_TIMEOUT:
+        return
+
+    _bump_versions(rack_ids)
+    transaction.on_commit(partial(_bump_versions, rack_ids))
+
+
+def render_rack_elevations(racks, face, user=None, unit_width=None, unit_height=None, legend_width=None,
+                           margin_width=None, include_images=True, base_url=None, highlight_params=None):
+    """
+    Render the elevations of one or more racks as SVG documents, returning a dictionary mapping the PK of each rack to
+    its SVG. Elevations are retrieved from the cache where possible. The remainder are rendered together, sharing the
+    queries for their devices, reservations, and permissions, and are then cached.
+
+    Cached elevations are keyed by the rendering parameters, the content versions of the rack, and a fingerprint of
+    the user's device view permissions, such that users subject to the same constraints share cached elevations.
+    Elevations which highlight devices are never cached.
+
+    Accepts the same parameters as RackElevationSVG, in addition to a list of racks and the rack face to render.
+    """
+    config = get_config()
+    racks = list(racks)
+    params = {
+        'unit_width': unit_width or config.RACK_ELEVATION_DEFAULT_UNIT_WIDTH,
+        'unit_height': unit_height or config.RACK_ELEVATION_DEFAULT_UNIT_HEIGHT,
+        'legend_width': legend_width or RACK_ELEVATION_DEFAULT_LEGEND_WIDTH,
+        'margin_width': margin_width or RACK_ELEVATION_DEFAULT_MARGIN_WIDTH,
+        'include_images': include_images,
+        'base_url': base_url,
+    }
+    timeout = settings.RACK_ELEVATION_CACHE_TIMEOUT
+
+    # Avoid caching elevations which might reflect uncommitted changes
+    if not timeout or highlight_params or connection.in_atomic_block:
+        return render_elevations(racks, face, user, highlight_params=highlight_params, **params)
+
+    global_version, rack_versions = get_versions([rack.pk for rack in racks])
+    fingerprint = get_constraints_fingerprint(user, 'dcim.view_device')
+    keys = {}
+    for rack in racks:
+        key_data = json.dumps(
+            [settings.RELEASE.full_version, global_version, rack_versions[rack.pk], face, fingerprint, params],
+            sort_keys=True
+        )
+        keys[rack.pk] = ELEVATION_KEY.format(rack.pk, hashlib.sha256(key_data.encode()).hexdigest())
+
+    cached = cache.get_many(keys.values())
+    elevations = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+    # Render any elevations not found in the cache
+    if missing_racks := [rack for rack in racks if rack.pk not in elevations]:
+        rendered = render_elevations(missing_racks, face, user, **params)
+        cache.set_many({keys[pk]: svg for pk, svg in rendered.items()}, timeout=timeout)
+        elevations.update(rendered)
+
+    return elevations
+
+
+def render_elevations(racks, face, user=None, **kwargs):
+    """
+    Render the elevations of the specified racks without consulting the cache.
+    """
+    data = RackElevationSVG.prefetch(racks, user)
+    return {
+        rack.pk: RackElevationSVG(rack, user=user, **kwargs, **data[rack.pk]).render(face).tostring()
+        for rack in racks
+    }
@@ -1,4 +1,5 @@
-import decimal
+from functools import cache
+
 import svgwrite
 from svgwrite.container import Hyperlink
 from svgwrite.image import Image
@@ -8,7 +9,7 @@ from svgwrite.text import Text
 
 from django.conf import settings
 from django.core.exceptions import FieldError
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.template.defaultfilters import floatformat
 from django.urls import reverse
 from django.utils.http import urlencode
@@ -29,6 +30,15 @@ GRADIENT_BLOCKED = '#ffc0c0'
 STROKE_RESERVED = '#4d4dff'
 
 
+@cache
+def get_stylesheet():
+    """
+    Return the stylesheet embedded within each rack elevation.
+    """
+    with open(f'{settings.STATIC_ROOT}/rack_elevation.css') as css_file:
+        return css_file.read()
+
+
 def get_device_name(device):
     if device.virtual_chassis:
         name = f'{device.virtual_chassis.name}:{device.vc_position}'
@@ -37,7 +47,10 @@ def get_device_name(device):
     else:
         name = str(device.device_type)
     if device.devicebay_count:
-        name += ' ({}/{})'.format(device.get_children().count(), device.devicebay_count)
+        child_count = getattr(device, 'child_count', None)
+        if child_count is None:
+            child_count = device.get_children().count()
+        name += ' ({}/{})'.format(child_count, device.devicebay_count)
 
     return name
 
@@ -82,9 +95,13 @@ class RackElevationSVG:
     :param include_images: If true, the SVG document will embed front/rear device face images, where available
     :param base_url: Base URL for links within the SVG document. If none, links will be relative.
     :param highlight_params: Iterable of two-tuples which identifies attributes of devices to highlight
+    :param devices: The devices mounted within the rack, as retrieved by get_devices() (optional)
+    :param reservations: The reservations for units within the rack (optional)
+    :param permitted_device_ids: The set of PKs of devices within the rack which are viewable by the user (optional)
     """
     def __init__(self, rack, unit_height=None, unit_width=None, legend_width=None, margin_width=None, user=None,
-                 include_images=True, base_url=None, highlight_params=None):
+                 include_images=True, base_url=None, highlight_params=None, devices=None, reservations=None,
+                 permitted_device_ids=None):
         self.rack = rack
         self.include_images = include_images
         self.base_url = base_url.rstrip('/') if base_url is not None else ''
@@ -96,11 +113,21 @@ class RackElevationSVG:
         self.legend_width = legend_width or config.RACK_ELEVATION_DEFAULT_LEGEND_WIDTH
         self.margin_width = margin_width or config.RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
 
+        # Retrieve the devices and reservations within the rack, unless they have been provided
+        if devices is None:
+            devices = self.get_devices([rack])[rack.pk]
+        self.devices = devices
+        if reservations is None:
+            reservations = list(rack.reservations.all())
+        self.reservations = reservations
+
         # Determine the subset of devices within this rack that are viewable by the user, if any
         permitted_devices = self.rack.devices
         if user is not None:
             permitted_devices = permitted_devices.restrict(user, 'view')
-        self.permitted_device_ids = permitted_devices.values_list('pk', flat=True)
+        if permitted_device_ids is None:
+            permitted_device_ids = set(permitted_devices.values_list('pk', flat=True))
+        self.permitted_device_ids = permitted_device_ids
 
         # Determine device(s) to highlight within the elevation (if any)
         self.highlight_devices = []
@@ -113,6 +140,56 @@ class RackElevationSVG:
             except FieldError:
                 pass
 
+    @staticmethod
+    def get_devices(racks):
+        """
+        Return a dictionary mapping the PK of each of the given racks to a list of the devices mounted within it. The
+        devices in all racks (along with their types, roles, and virtual chassis) are retrieved using a single query.
+        """
+        from dcim.models import Device
+
+        devices = {rack.pk: [] for rack in racks}
+        queryset = Device.objects.select_related(
+            'device_type__manufacturer', 'role', 'virtual_chassis'
+        ).annotate(
+            devicebay_count=Count('devicebays', distinct=True),
+            child_count=Count('devicebays__installed_device', distinct=True)
+        ).filter(
+            rack__in=list(devices),
+            position__gt=0,
+            device_type__u_height__gt=0
+        )
+        for device in queryset:
+            devices[device.rack_id].append(device)
+
+        return devices
+
+    @classmethod
+    def prefetch(cls, racks, user=None):
+        """
+        Retrieve the devices, reservations, and (if a user is specified) viewable device PKs for many racks at once.
+        Returns a dictionary mapping the PK of each rack to keyword arguments for its RackElevationSVG.
+        """
+        from dcim.models import Device, RackReservation
+
+        rack_ids = [rack.pk for rack in racks]
+        devices = cls.get_devices(racks)
+        reservations = {pk: [] for pk in rack_ids}
+        for reservation in RackReservation.objects.filter(rack__in=rack_ids):
+            reservations[reservation.rack_id].append(reservation)
+        permitted_devices = Device.objects.filter(rack__in=rack_ids)
+        if user is not None:
+            permitted_devices = permitted_devices.restrict(user, 'view')
+        permitted_device_ids = set(permitted_devices.values_list('pk', flat=True))
+
+        return {
+            pk: {
+                'devices': devices[pk],
+                'reservations': reservations[pk],
+                'permitted_device_ids': permitted_device_ids,
+            } for pk in rack_ids
+        }
+
     @staticmethod
     def _add_gradient(drawing, id_, color):
         gradient = LinearGradient(
@@ -136,8 +213,7 @@ class RackElevationSVG:
         drawing = svgwrite.Drawing(size=(width, height))
 
         # Add the stylesheet
-        with open(f'{settings.STATIC_ROOT}/rack_elevation.css') as css_file:
-            drawing.defs.add(drawing.style(css_file.read()))
+        drawing.defs.add(drawing.style(get_stylesheet()))
 
         # Add gradients
         RackElevationSVG._add_gradient(drawing, 'reserved', GRADIENT_RESERVED)
@@ -249,7 +325,7 @@ class RackElevationSVG:
         """
         Draw any rack reservations in the right-hand margin alongside the rack elevation.
         """
-        for reservation in self.rack.reservations.all():
+        for reservation in self.reservations:
             for segment in array_to_ranges(reservation.units):
                 u_height = 1 if len(segment) == 1 else segment[1] + 1 - segment[0]
                 coords = self._get_device_coords(segment[0], u_height)
@@ -299,26 +375,25 @@ class RackElevationSVG:
         """
         Draw any occupied rack units for the specified rack face.
         """
-        for unit in self.rack.get_rack_units(face=face, expand_devices=False):
-
-            # Loop through all units in the elevation
-            device = unit['device']
-            height = unit.get('height', decimal.Decimal(1.0))
+        for device in self.devices:
+            if device.face != face and not device.device_type.is_full_depth:
+                continue
+            height = device.device_type.u_height
 
-            device_coords = self._get_device_coords(unit['id'], height)
+            device_coords = self._get_device_coords(device.position, height)
             device_size = (
                 self.unit_width,
                 int(self.unit_height * height)
             )
 
             # Draw the device
-            if device and device.pk in self.permitted_device_ids:
+            if device.pk in self.permitted_device_ids:
                 if device.face == face and not opposite:
                     self.draw_device_front(device, device_coords, device_size)
                 else:
                     self.draw_device_rear(device, device_coords, device_size)
 
-            elif device:
+            else:
                 # Devices which the user does not have permission to view are rendered only as unavailable space
                 self.drawing.add(Rect(device_coords, device_size, class_='blocked'))
 
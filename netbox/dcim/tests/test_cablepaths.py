@@ -1,10 +1,22 @@
-from django.test import TestCase
+import uuid
+from contextlib import ExitStack
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
 
 from circuits.models import *
 from dcim.choices import LinkStatusChoices
 from dcim.models import *
 from dcim.svg import CableTraceSVG
+from dcim.topology import CACHE_VERSION_KEY, topology_cache
+from dcim.tracing import PathTracer, cable_path_batch
 from dcim.utils import object_to_path_node
+from netbox.registry import registry
+from netbox.utils import bulk_operation
+from users.models import User
+from utilities.request import NetBoxFakeRequest
 
 
 class CablePathTestCase(TestCase):
@@ -16,6 +28,7 @@ class CablePathTestCase(TestCase):
         2XX: Test different cable topologies
         3XX: Test responses to changes in existing objects
         4XX: Test to exclude specific cable topologies
+        5XX: Test batched retracing of CablePaths
     """
     @classmethod
     def setUpTestData(cls):
@@ -2343,3 +2356,190 @@ class CablePathTestCase(TestCase):
             is_active=True
         )
         self.assertEqual(CablePath.objects.count(), 0)
+
+    def test_501_batch_retrace_multiple_paths_via_pass_through(self):
+        """
+        [IF1] --C1-- [FP1:1] [RP1] --C5-- [RP2] [FP2:1] --C3-- [IF3]
+        [IF2] --C2-- [FP1:2]                    [FP2:2] --C4-- [IF4]
+        """
+        interfaces = [
+            Interface.objects.create(device=self.device, name=f'Interface {i}') for i in range(1, 5)
+        ]
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=2)
+        rearport2 = RearPort.objects.create(device=self.device, name='Rear Port 2', positions=2)
+        frontports = [
+            FrontPort.objects.create(
+                device=self.device, name=f'Front Port {rp}:{pos}', rear_port=rearport, rear_port_position=pos
+            ) for rp, rearport in enumerate((rearport1, rearport2), start=1) for pos in (1, 2)
+        ]
+
+        # Create all cables within a single batch
+        with cable_path_batch() as batch:
+            cables = [
+                Cable(a_terminations=[interface], b_terminations=[frontport])
+                for interface, frontport in zip(interfaces, frontports)
+            ]
+            for cable in cables:
+                cable.save()
+            cable5 = Cable(a_terminations=[rearport1], b_terminations=[rearport2])
+            cable5.save()
+
+            # No paths are traced until the batch exits
+            self.assertTrue(len(batch))
+            self.assertEqual(CablePath.objects.count(), 0)
+
+        path1 = self.assertPathExists(
+            (
+                interfaces[0], cables[0], frontports[0], rearport1, cable5, rearport2, frontports[2], cables[2],
+                interfaces[2],
+            ),
+            is_complete=True,
+            is_active=True
+        )
+        path2 = self.assertPathExists(
+            (
+                interfaces[1], cables[1], frontports[1], rearport1, cable5, rearport2, frontports[3], cables[3],
+                interfaces[3],
+            ),
+            is_complete=True,
+            is_active=True
+        )
+        self.assertEqual(CablePath.objects.count(), 4)
+        interfaces[0].refresh_from_db()
+        interfaces[1].refresh_from_db()
+        self.assertPathIsSet(interfaces[0], path1)
+        self.assertPathIsSet(interfaces[1], path2)
+
+        # Delete the trunk cable; all four paths are retraced together
+        with cable_path_batch():
+            cable5.delete()
+
+        self.assertPathExists(
+            (interfaces[0], cables[0], frontports[0], rearport1),
+            is_complete=False
+        )
+        self.assertPathExists(
+            (interfaces[3], cables[3], frontports[3], rearport2),
+            is_complete=False
+        )
+        self.assertEqual(CablePath.objects.count(), 4)
+
+        # Existing paths are updated in place
+        interfaces[0].refresh_from_db()
+        self.assertPathIsSet(interfaces[0], path1)
+
+    def test_502_tracer_discard(self):
+        """
+        [RP1] [FP1:1]
+              [FP1:2]
+        """
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=2)
+        frontport1_1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:1', rear_port=rearport1, rear_port_position=1
+        )
+        tracer = PathTracer()
+        self.assertEqual(tracer.get_front_ports([(rearport1, None)]), [frontport1_1])
+
+        # The tracer retains the loaded topology until the affected objects are discarded
+        frontport1_2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:2', rear_port=rearport1, rear_port_position=2
+        )
+        self.assertEqual(tracer.get_front_ports([(rearport1, None)]), [frontport1_1])
+        tracer.discard(frontport1_2)
+        self.assertEqual(tracer.get_front_ports([(rearport1, None)]), [frontport1_1, frontport1_2])
+        self.assertEqual(tracer.get_front_ports([(rearport1, 2)]), [frontport1_2])
+
+    @override_settings(CABLE_TOPOLOGY_CACHE=True)
+    @mock.patch('dcim.topology._topology_cache', None)
+    @mock.patch('dcim.topology.connection', mock.Mock(in_atomic_block=False))
+    def test_503_topology_cache(self):
+        """
+        [RP1] [FP1:1]
+              [FP1:2]
+        """
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=2)
+        frontport1_1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:1', rear_port=rearport1, rear_port_position=1
+        )
+        with topology_cache() as topology:
+            self.assertEqual(topology.get_front_ports([(rearport1, None)]), [frontport1_1])
+
+        # The loaded topology is retained between uses
+        with self.assertNumQueries(0):
+            with topology_cache() as cached_topology:
+                self.assertIs(cached_topology, topology)
+                self.assertEqual(topology.get_front_ports([(rearport1, None)]), [frontport1_1])
+
+        # Creating a port discards it from the cache
+        frontport1_2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:2', rear_port=rearport1, rear_port_position=2
+        )
+        with topology_cache() as topology:
+            self.assertEqual(topology.get_front_ports([(rearport1, None)]), [frontport1_1, frontport1_2])
+
+        # Modifying an object unrelated to the cable topology leaves the cache intact
+        version = topology.version
+        Manufacturer.objects.create(name='Manufacturer 2', slug='manufacturer-2')
+        self.assertEqual(cache.get(CACHE_VERSION_KEY), version)
+
+        # A change made by another process clears the cache
+        cache.incr(CACHE_VERSION_KEY)
+        with topology_cache() as topology:
+            self.assertEqual(topology._objects, {})
+            self.assertEqual(topology.version, version + 1)
+
+    def test_504_topology_cache_disabled(self):
+        # The cache is not used when disabled, nor within a transaction
+        with topology_cache() as topology:
+            self.assertIsNone(topology)
+        with override_settings(CABLE_TOPOLOGY_CACHE=True), topology_cache() as topology:
+            self.assertIsNone(topology)
+
+    def test_505_trace_within_request(self):
+        """
+        [IF1] --C1-- [IF2]
+
+        CablePaths should be traced immediately when a cable is created while processing a request (e.g. by a custom
+        script), so that they can be read within the same request.
+        """
+        interface1 = Interface.objects.create(device=self.device, name='Interface 1')
+        interface2 = Interface.objects.create(device=self.device, name='Interface 2')
+        request = NetBoxFakeRequest({
+            'META': {},
+            'POST': {},
+            'GET': {},
+            'FILES': {},
+            'user': User.objects.create_user(username='testuser'),
+            'path': '',
+            'id': uuid.uuid4(),
+        })
+
+        with ExitStack() as stack:
+            for request_processor in registry['request_processors']:
+                stack.enter_context(request_processor(request))
+            cable1 = Cable(a_terminations=[interface1], b_terminations=[interface2])
+            cable1.save()
+
+            interface1.refresh_from_db()
+            path1 = self.assertPathExists((interface1, cable1, interface2), is_complete=True, is_active=True)
+            self.assertPathIsSet(interface1, path1)
+            self.assertEqual(interface1.connected_endpoints, [interface2])
+
+    def test_506_trace_within_bulk_operation(self):
+        """
+        [IF1] --C1-- [IF2]
+
+        CablePaths affected by a bulk operation should be retraced before the operation's transaction is committed.
+        """
+        interface1 = Interface.objects.create(device=self.device, name='Interface 1')
+        interface2 = Interface.objects.create(device=self.device, name='Interface 2')
+
+        with transaction.atomic():
+            with bulk_operation():
+                cable1 = Cable(a_terminations=[interface1], b_terminations=[interface2])
+                cable1.save()
+                self.assertEqual(CablePath.objects.count(), 0)
+
+            # Paths are traced as the bulk operation exits, within the transaction
+            self.assertPathExists((interface1, cable1, interface2), is_complete=True, is_active=True)
+            self.assertPathExists((interface2, cable1, interface1), is_complete=True, is_active=True)
@@ -1,13 +1,19 @@
+from unittest.mock import Mock, patch
+
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from circuits.models import *
 from core.models import ObjectType
 from dcim.choices import *
 from dcim.models import *
+from dcim.svg import render_rack_elevations
+from dcim.svg.cache import render_elevations
 from extras.models import CustomField
 from tenancy.models import Tenant
+from users.models import ObjectPermission, User
 from utilities.data import drange
+from utilities.permissions import get_constraints_fingerprint
 from virtualization.models import Cluster, ClusterType
 
 
@@ -330,6 +336,139 @@ class RackTestCase(TestCase):
         rack.refresh_from_db()
         self.assertEqual(rack.get_utilization(), 1 / 42 * 100)
 
+    def test_annotate_occupancy(self):
+        site = Site.objects.first()
+        rack = Rack.objects.first()
+        attrs = {
+            'role': DeviceRole.objects.first(),
+            'site': site,
+            'rack': rack,
+        }
+        device_type = DeviceType.objects.get(u_height=1)
+        Device(name='Device 1', device_type=device_type, position=1, face='front', **attrs).save()
+        device_type = DeviceType.objects.get(u_height=0.5)
+        Device(name='Device 2', device_type=device_type, position=3.5, face='rear', **attrs).save()
+        RackReservation.objects.create(
+            rack=rack,
+            units=[10, 11],
+            user=User.objects.create_user(username='testuser'),
+            description='Reservation 1'
+        )
+
+        # Annotated racks must not require any additional queries
+        available_units = rack.get_available_units(u_height=2, rack_face='front')
+        with self.assertNumQueries(1):
+            annotated_rack = Rack.objects.annotate_occupancy().get(pk=rack.pk)
+            self.assertEqual(annotated_rack.get_utilization(), 7 / 84 * 100)
+            self.assertEqual(annotated_rack.get_available_units(u_height=2, rack_face='front'), available_units)
+
+        self.assertEqual(rack.get_utilization(), 7 / 84 * 100)
+        available_units = rack.get_available_units(u_height=1, rack_face='rear')
+        self.assertNotIn(3, available_units)
+        self.assertIn(1, available_units)
+        self.assertIn(4, available_units)
+        self.assertEqual(rack.get_available_units(u_height=1, exclude=[Device.objects.get(name='Device 1').pk])[0], 1)
+
+    def test_render_elevations(self):
+        """
+        Rendering several rack elevations together should produce the same SVGs as rendering each individually.
+        """
+        site = Site.objects.first()
+        racks = [Rack.objects.first(), Rack.objects.create(name='Rack 2', site=site, u_height=42)]
+        for i, rack in enumerate(racks, start=1):
+            Device(
+                name=f'Device {i}',
+                role=DeviceRole.objects.first(),
+                device_type=DeviceType.objects.get(u_height=1),
+                site=site,
+                rack=rack,
+                position=i,
+                face=DeviceFaceChoices.FACE_FRONT
+            ).save()
+
+        elevations = render_rack_elevations(racks, face=DeviceFaceChoices.FACE_FRONT)
+        for rack in racks:
+            svg = rack.get_elevation_svg(face=DeviceFaceChoices.FACE_FRONT).tostring()
+            self.assertEqual(elevations[rack.pk], svg)
+
+        # The number of queries should not depend on the number of racks
+        with self.assertNumQueries(3):
+            render_rack_elevations(racks, face=DeviceFaceChoices.FACE_FRONT)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_render_elevations_cache(self):
+        """
+        Rendered elevations should be cached until the content of the rack changes, and shared only among users
+        subject to the same permission constraints.
+        """
+        rack = Rack.objects.first()
+        face = DeviceFaceChoices.FACE_FRONT
+        device = Device.objects.create(
+            name='Device 1',
+            role=DeviceRole.objects.first(),
+            device_type=DeviceType.objects.get(u_height=1),
+            site=rack.site,
+            rack=rack,
+            position=1,
+            face=face
+        )
+
+        # Create two users permitted to view different sets of devices
+        users = []
+        for i in range(2):
+            user = User.objects.create_user(username=f'User {i}')
+            obj_perm = ObjectPermission.objects.create(
+                name=f'Permission {i}',
+                actions=['view'],
+                constraints={'name': f'Device {i}'}
+            )
+            obj_perm.users.add(user)
+            obj_perm.object_types.add(ObjectType.objects.get_for_model(Device))
+            users.append(user)
+        fingerprints = [get_constraints_fingerprint(user, 'dcim.view_device') for user in users]
+        self.assertNotEqual(fingerprints[0], fingerprints[1])
+        self.assertNotIn('all', fingerprints)
+
+        # Elevations are never cached within a transaction, so simulate rendering outside of one
+        with (
+            patch('dcim.svg.cache.connection', Mock(in_atomic_block=False)),
+            patch('dcim.svg.cache.render_elevations', wraps=render_elevations) as render,
+        ):
+            svg = render_rack_elevations([rack], face=face)[rack.pk]
+            self.assertEqual(render.call_count, 1)
+            self.assertEqual(render_rack_elevations([rack], face=face)[rack.pk], svg)
+            self.assertEqual(render.call_count, 1)
+
+            # Users subject to different constraints should not share cached elevations
+            for user in users:
+                render_rack_elevations([rack], face=face, user=user)
+            self.assertEqual(render.call_count, 3)
+            render_rack_elevations([rack], face=face, user=users[0])
+            self.assertEqual(render.call_count, 3)
+
+            # Modifying a device in the rack should invalidate its elevation
+            device.name = 'Device 2'
+            device.save()
+            self.assertNotEqual(render_rack_elevations([rack], face=face)[rack.pk], svg)
+            self.assertEqual(render.call_count, 4)
+
+            # Creating a reservation in the rack should invalidate its elevation
+            RackReservation.objects.create(rack=rack, units=[10], user=users[0], description='Reservation 1')
+            render_rack_elevations([rack], face=face)
+            self.assertEqual(render.call_count, 5)
+            render_rack_elevations([rack], face=face)
+            self.assertEqual(render.call_count, 5)
+
+            # Modifying an object not depicted in any elevation should have no effect
+            rack.site.save()
+            render_rack_elevations([rack], face=face)
+            self.assertEqual(render.call_count, 5)
+
+            # Modifying a manufacturer should invalidate all elevations
+            device.device_type.manufacturer.save()
+            render_rack_elevations([rack], face=face)
+            self.assertEqual(render.call_count, 6)
+
 
 class DeviceTestCase(TestCase):
 
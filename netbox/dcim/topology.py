@@ -0,0 +1,97 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .tracing import PathTracer
+
+__all__ = (
+    'TopologyCache',
+    'invalidate_topology',
+    'topology_cache',
+)
+
+# Shared by all NetBox processes to signal that the cable topology has changed
+CACHE_VERSION_KEY = 'dcim.topology.version'
+
+# The cache is cleared entirely once it holds this many objects
+MAX_OBJECTS = 500000
+
+_topology_cache = None
+
+# Serializes access to the shared TopologyCache among threads
+_lock = threading.RLock()
+
+
+class TopologyCache(PathTracer):
+    """
+    A process-wide PathTracer which retains the topology it has loaded between requests, so that tracing a path
+    through already-known objects requires only dictionary lookups.
+
+    Changes are applied incrementally: the receivers in dcim.signals discard any modified objects (and the topology
+    depending on them) from the local cache, and bump a version number held in the Django cache. Other processes clear
+    their local caches upon seeing a new version.
+    """
+    def __init__(self):
+        super().__init__()
+        self.version = None
+
+    def sync(self):
+        """
+        Clear the cache if the topology has been modified by another process, or if it has grown too large.
+        """
+        version = cache.get(CACHE_VERSION_KEY, 0)
+        if version != self.version or len(self._objects) > MAX_OBJECTS:
+            self.clear()
+            self.version = version
+
+
+@contextmanager
+def topology_cache():
+    """
+    Yield the shared TopologyCache, if enabled (otherwise None), holding its lock for the duration of the block. The
+    cache is never used while a transaction is open, to avoid retaining objects which might subsequently be rolled back.
+    """
+    global _topology_cache
+
+    if not settings.CABLE_TOPOLOGY_CACHE or connection.in_atomic_block:
+        yield None
+        return
+
+    with _lock:
+        if _topology_cache is None:
+            _topology_cache = TopologyCache()
+        _topology_cache.sync()
+        yield _topology_cache
+
+
+def _bump_version():
+    cache.add(CACHE_VERSION_KEY, 0, timeout=None)
+    version = cache.incr(CACHE_VERSION_KEY)
+
+    # Our local cache is still current if no other process has modified the topology in the meantime
+    with _lock:
+        if _topology_cache is not None and _topology_cache.version == version - 1:
+            _topology_cache.version = version
+
+
+def invalidate_topology(*objects):
+    """
+    Discard the specified objects from the local TopologyCache, and notify all other processes that the cable topology
+    has changed. The notification is repeated once the current transaction (if any) has been committed. If no objects
+    are specified, the local cache is cleared entirely.
+    """
+    if not settings.CABLE_TOPOLOGY_CACHE:
+        return
+
+    with _lock:
+        if _topology_cache is not None:
+            if not objects:
+                _topology_cache.clear()
+            for obj in objects:
+                _topology_cache.discard(obj)
+
+    _bump_version()
+    transaction.on_commit(_bump_version)
@@ -0,0 +1,452 @@
+import itertools
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+
+from circuits.models import CircuitTermination
+from core.models import ObjectType
+from netbox.utils import register_bulk_operation_processor
+from .choices import CableEndChoices
+from .models import Cable, CablePath, CableTermination, FrontPort, RearPort
+from .utils import decompile_path_node, object_to_path_node
+
+__all__ = (
+    'CablePathBatch',
+    'PathTracer',
+    'cable_path_batch',
+)
+
+current_batch = ContextVar('cable_path_batch', default=None)
+
+
+class PathTracer:
+    """
+    Resolve the topology traversed by CablePaths (cable terminations, front/rear port mappings, and circuit termination
+    peers) using bulk queries. Everything loaded is memoized, so a single instance can be used to trace any number of
+    paths, with each object being fetched from the database at most once.
+
+    Front and rear ports are always loaded for an entire device at a time, and circuit terminations for an entire
+    circuit. This ensures that any set of ports returned for a hop is ordered exactly as the equivalent database query
+    would order it.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """
+        Forget everything loaded so far.
+        """
+        # (ObjectType ID, PK) -> instance (or None if the object does not exist)
+        self._objects = {}
+        # Cable PK -> CableTerminations, ordered by cable end and PK
+        self._cable_terminations = {}
+        # (ObjectType ID, PK) of a terminating object -> CableTermination
+        self._cable_ends = {}
+        # RearPort PK -> FrontPorts
+        self._front_ports = defaultdict(list)
+        # (Port model, Device PK) -> keys of all ports of that type belonging to the device
+        self._device_ports = {}
+        # Circuit PK -> {term side: CircuitTermination}
+        self._circuit_terminations = {}
+        # (ObjectType ID, PK) -> (load generation, position) for ports
+        self._ordering = {}
+        self._generation = 0
+
+    @staticmethod
+    def _key(model, pk):
+        return ObjectType.objects.get_for_model(model).pk, pk
+
+    def _sorted(self, ports):
+        return sorted(ports, key=lambda port: self._ordering[self._key(port._meta.model, port.pk)])
+
+    #
+    # Loaders
+    #
+
+    def _load_objects(self, model, pks):
+        if model in (FrontPort, RearPort):
+            self._load_ports(model, model.objects.filter(pk__in=pks).values('device'))
+        elif model is CircuitTermination:
+            self._load_circuit_terminations(CircuitTermination.objects.filter(pk__in=pks).values('circuit'))
+        else:
+            queryset = model.objects.filter(pk__in=pks)
+            if hasattr(model, 'device'):
+                queryset = queryset.select_related('device')
+            for obj in queryset:
+                self._objects[self._key(model, obj.pk)] = obj
+
+        # Record any objects which were not found to avoid querying for them again
+        for pk in pks:
+            self._objects.setdefault(self._key(model, pk), None)
+
+    def _load_ports(self, model, devices):
+        """
+        Load all front or rear ports belonging to the specified devices.
+        """
+        if not devices:
+            return
+        self._generation += 1
+        ports = model.objects.filter(device__in=devices).exclude(
+            device__in=[device_id for port_model, device_id in self._device_ports if port_model is model]
+        ).select_related('device')
+        for i, port in enumerate(ports):
+            key = self._key(model, port.pk)
+            self._objects[key] = port
+            self._ordering[key] = (self._generation, i)
+            self._device_ports.setdefault((model, port.device_id), []).append(key)
+            if model is FrontPort:
+                self._front_ports[port.rear_port_id].append(port)
+        if type(devices) is set:
+            for device_id in devices:
+                self._device_ports.setdefault((model, device_id), [])
+
+    def _load_circuit_terminations(self, circuits):
+        """
+        Load all terminations belonging to the specified circuits.
+        """
+        terminations = CircuitTermination.objects.filter(circuit__in=circuits).exclude(
+            circuit__in=list(self._circuit_terminations)
+        ).select_related('provider_network', 'site', 'cable')
+        for termination in terminations:
+            self._objects[self._key(CircuitTermination, termination.pk)] = termination
+            self._circuit_terminations.setdefault(termination.circuit_id, {})[termination.term_side] = termination
+        if type(circuits) is set:
+            for circuit_id in circuits:
+                self._circuit_terminations.setdefault(circuit_id, {})
+
+    def _load_cable_terminations(self, cable_ids):
+        """
+        Load all CableTerminations belonging to the specified cables.
+        """
+        cable_ids = set(cable_ids) - self._cable_terminations.keys()
+        if not cable_ids:
+            return
+        for cable_id in cable_ids:
+            self._cable_terminations[cable_id] = []
+        for cable_termination in CableTermination.objects.filter(cable__in=cable_ids).order_by('cable_end', 'pk'):
+            self._cable_terminations[cable_termination.cable_id].append(cable_termination)
+            key = (cable_termination.termination_type_id, cable_termination.termination_id)
+            self._cable_ends[key] = cable_termination
+
+    def load_nodes(self, nodes):
+        """
+        Bulk-load the objects represented by the given path nodes, along with the cable terminations of any cables
+        among or attached to them. This primes the tracer for retracing existing CablePaths.
+
+        :param nodes: Iterable of path nodes in the form <ContentType ID>:<Object ID>
+        """
+        objects = self.get_objects([decompile_path_node(node) for node in set(nodes)])
+
+        cable_ids = set()
+        for obj in objects:
+            if type(obj) is Cable:
+                cable_ids.add(obj.pk)
+            elif getattr(obj, 'cable_id', None):
+                cable_ids.add(obj.cable_id)
+        self.get_objects([self._key(Cable, pk) for pk in cable_ids])
+        self._load_cable_terminations(cable_ids)
+
+        # Load the objects attached to the far ends of these cables
+        self.get_objects([
+            (ct.termination_type_id, ct.termination_id)
+            for cable_id in cable_ids for ct in self._cable_terminations[cable_id]
+        ])
+
+    #
+    # Invalidation
+    #
+
+    def discard(self, obj):
+        """
+        Forget the given object, along with any loaded topology which depends on it, so that it will be reloaded from
+        the database when next needed.
+        """
+        model = obj._meta.model
+
+        if model is Cable:
+            self._discard_cable(obj.pk)
+        elif model is CableTermination:
+            self._discard_cable(obj.cable_id)
+            self._discard_key((obj.termination_type_id, obj.termination_id))
+        elif model is CablePath:
+            # Discard the originating objects, which hold a reference to the path
+            for node in obj.path[0] if obj.path else []:
+                self._discard_key(decompile_path_node(node))
+        elif model in (FrontPort, RearPort):
+            self._discard_ports(model, obj.device_id)
+        elif model is CircuitTermination:
+            self._discard_circuit(obj.circuit_id)
+
+        self._discard_key(self._key(model, obj.pk))
+    discard.alters_data = True
+
+    def _discard_key(self, key):
+        obj = self._objects.pop(key, None)
+        if obj is None:
+            return
+        if type(obj) in (FrontPort, RearPort):
+            self._discard_ports(type(obj), obj.device_id)
+        elif type(obj) is CircuitTermination:
+            self._discard_circuit(obj.circuit_id)
+
+    def _discard_cable(self, cable_id):
+        self._objects.pop(self._key(Cable, cable_id), None)
+        for cable_termination in self._cable_terminations.pop(cable_id, []):
+            self._cable_ends.pop((cable_termination.termination_type_id, cable_termination.termination_id), None)
+
+    def _discard_ports(self, model, device_id):
+        for key in self._device_ports.pop((model, device_id), []):
+            self._ordering.pop(key, None)
+            if (port := self._objects.pop(key, None)) is not None and model is FrontPort:
+                self._front_ports.pop(port.rear_port_id, None)
+
+    def _discard_circuit(self, circuit_id):
+        for termination in self._circuit_terminations.pop(circuit_id, {}).values():
+            self._objects.pop(self._key(CircuitTermination, termination.pk), None)
+
+    #
+    # Lookups
+    #
+
+    def get_objects(self, keys):
+        """
+        Return the objects identified by the given (ObjectType ID, PK) tuples, loading any not yet known with a
+        single query per type. Objects which no longer exist are returned as None.
+        """
+        missing = defaultdict(set)
+        for ct_id, pk in keys:
+            if (ct_id, pk) not in self._objects:
+                missing[ct_id].add(pk)
+        for ct_id, pks in missing.items():
+            model = ObjectType.objects.get_for_id(ct_id).model_class()
+            if model is None:
+                # Stale content type
+                self._objects.update({(ct_id, pk): None for pk in pks})
+                continue
+            self._load_objects(model, pks)
+
+        return [self._objects[key] for key in keys]
+
+    def get_node_objects(self, nodes):
+        """
+        Return the objects represented by the given path nodes. Objects which no longer exist are returned as None.
+        """
+        return self.get_objects([decompile_path_node(node) for node in nodes])
+
+    def get_links(self, terminations):
+        """
+        Return the link (Cable or WirelessLink) attached to each of the given terminations, or None.
+        """
+        self.get_objects([self._key(Cable, t.cable_id) for t in terminations if t.cable_id])
+        return [
+            self._objects[self._key(Cable, t.cable_id)] if t.cable_id else t.link for t in terminations
+        ]
+
+    def get_far_end_terminations(self, terminations):
+        """
+        Return the objects terminating the opposite end(s) of the cable(s) attached to the given terminations. Returns
+        None if no cable terminations were found for the given terminations.
+        """
+        self._load_cable_terminations({t.cable_id for t in terminations if t.cable_id})
+
+        far_ends = set()
+        for t in terminations:
+            if cable_termination := self._cable_ends.get(self._key(type(t), t.pk)):
+                cable_end = CableEndChoices.SIDE_A if cable_termination.cable_end == CableEndChoices.SIDE_B \
+                    else CableEndChoices.SIDE_B
+                far_ends.add((cable_termination.cable_id, cable_end))
+        if not far_ends:
+            return None
+
+        remote_cable_terminations = [
+            ct for cable_id in sorted({cable_id for cable_id, _ in far_ends})
+            for ct in self._cable_terminations[cable_id] if (cable_id, ct.cable_end) in far_ends
+        ]
+        return self.get_objects([
+            (ct.termination_type_id, ct.termination_id) for ct in remote_cable_terminations
+        ])
+
+    def get_rear_ports(self, front_ports):
+        """
+        Return the RearPorts to which the given FrontPorts map.
+        """
+        rear_port_ids = {fp.rear_port_id for fp in front_ports}
+        rear_ports = self.get_objects([self._key(RearPort, pk) for pk in rear_port_ids])
+        return self._sorted([rp for rp in rear_ports if rp is not None])
+
+    def get_front_ports(self, rear_port_positions):
+        """
+        Return the FrontPorts which map to the given RearPort positions.
+
+        :param rear_port_positions: Iterable of (RearPort, position) tuples. A position of None matches all
+            FrontPorts mapped to the RearPort.
+        """
+        rear_port_positions = set(rear_port_positions)
+
+        # FrontPorts always belong to the same device as their RearPort
+        self._load_ports(FrontPort, {
+            rp.device_id for rp, _ in rear_port_positions if (FrontPort, rp.device_id) not in self._device_ports
+        })
+
+        front_ports = {
+            fp.pk: fp for rp, position in rear_port_positions for fp in self._front_ports[rp.pk]
+            if position is None or fp.rear_port_position == position
+        }
+        return self._sorted(front_ports.values())
+
+    def get_peer_circuit_termination(self, termination):
+        """
+        Return the CircuitTermination on the opposite side of the given CircuitTermination's circuit, if any.
+        """
+        if termination.circuit_id not in self._circuit_terminations:
+            self._load_circuit_terminations({termination.circuit_id})
+        peer_side = 'Z' if termination.term_side == 'A' else 'A'
+        return self._circuit_terminations.get(termination.circuit_id, {}).get(peer_side)
+
+
+class CablePathBatch:
+    """
+    Collect changes affecting CablePaths and apply them together on commit(). Every affected path is retraced only
+    once, from a topology loaded in bulk, and the results are written using bulk operations.
+    """
+    def __init__(self):
+        # Path nodes whose traversing CablePaths must be retraced
+        self.nodes = set()
+        # Path node -> nodes to be removed from the origins of any CablePath traversing it
+        self.excluded_origins = defaultdict(set)
+        # Groups of nodes from which new CablePaths are to be traced
+        self.origins = []
+
+    def __len__(self):
+        return len(self.nodes) + len(self.origins)
+
+    def retrace(self, objects, exclude_origin=None):
+        """
+        Schedule the retracing of all CablePaths which traverse any of the specified objects.
+
+        :param objects: Iterable of objects (e.g. cables or pass-through ports)
+        :param exclude_origin: A termination object to be removed from the origins of any affected CablePath
+        """
+        for obj in objects:
+            node = object_to_path_node(obj)
+            self.nodes.add(node)
+            if exclude_origin is not None:
+                self.excluded_origins[node].add(object_to_path_node(exclude_origin))
+
+    def create(self, terminations):
+        """
+        Schedule the tracing of a new CablePath originating from the specified terminations.
+        """
+        self.origins.append(tuple(object_to_path_node(t) for t in terminations))
+
+    def commit(self):
+        """
+        Retrace all affected CablePaths and create any new CablePaths.
+        """
+        from .topology import invalidate_topology
+
+        if not len(self):
+            return
+        logger = logging.getLogger('netbox.dcim.cablepath')
+
+        tracer = PathTracer()
+        cable_paths = list(CablePath.objects.filter(_nodes__overlap=list(self.nodes))) if self.nodes else []
+        tracer.load_nodes(itertools.chain(*(cp._nodes for cp in cable_paths), *self.origins))
+
+        to_update = []
+        to_delete = []
+        to_create = []
+        origins_by_path = []
+        traced_origins = set()
+
+        # Retrace existing CablePaths
+        for cablepath in cable_paths:
+            excluded = set()
+            for node in cablepath._nodes:
+                excluded.update(self.excluded_origins.get(node, ()))
+            origin_nodes = [node for node in cablepath.path[0] if node not in excluded] if cablepath.path else []
+            origins = [obj for obj in tracer.get_node_objects(origin_nodes) if obj is not None]
+
+            _new = CablePath.from_origin(origins, tracer=tracer)
+            if _new is None:
+                to_delete.append(cablepath.pk)
+                continue
+            traced_origins.add(frozenset(_new.path[0]))
+            origins_by_path.append((cablepath, origins))
+            if (cablepath.path, cablepath.is_complete, cablepath.is_active, cablepath.is_split) != (
+                _new.path, _new.is_complete, _new.is_active, _new.is_split
+            ):
+                cablepath.path = _new.path
+                cablepath.is_complete = _new.is_complete
+                cablepath.is_active = _new.is_active
+                cablepath.is_split = _new.is_split
+                cablepath._nodes = list(itertools.chain(*cablepath.path))
+                to_update.append(cablepath)
+
+        # Trace new CablePaths
+        for origin_nodes in self.origins:
+            origins = [obj for obj in tracer.get_node_objects(origin_nodes) if obj is not None]
+            _new = CablePath.from_origin(origins, tracer=tracer)
+            if _new is None or frozenset(_new.path[0]) in traced_origins:
+                continue
+            traced_origins.add(frozenset(_new.path[0]))
+            _new._nodes = list(itertools.chain(*_new.path))
+            to_create.append(_new)
+            origins_by_path.append((_new, origins))
+
+        logger.debug(
+            f"Retraced {len(cable_paths)} cable paths ({len(to_update)} updated, {len(to_delete)} deleted); "
+            f"created {len(to_create)} cable paths"
+        )
+
+        with transaction.atomic():
+            if to_delete:
+                CablePath.objects.filter(pk__in=to_delete).delete()
+            if to_update:
+                CablePath.objects.bulk_update(
+                    to_update, fields=('path', '_nodes', 'is_complete', 'is_active', 'is_split')
+                )
+            if to_create:
+                CablePath.objects.bulk_create(to_create)
+
+            # Record a direct reference to each CablePath on its originating object(s)
+            to_link = defaultdict(list)
+            for cablepath, origins in origins_by_path:
+                for origin in origins:
+                    if origin._path_id != cablepath.pk:
+                        origin._path_id = cablepath.pk
+                        to_link[origin._meta.model].append(origin)
+            for model, objects in to_link.items():
+                model.objects.bulk_update(objects, fields=('_path',))
+                invalidate_topology(*objects)
+
+        self.nodes.clear()
+        self.excluded_origins.clear()
+        self.origins.clear()
+    commit.alters_data = True
+
+
+@register_bulk_operation_processor
+@contextmanager
+def cable_path_batch():
+    """
+    Collect all changes to CablePaths made within the block, and apply them in bulk once the outermost block exits.
+    Yields the active CablePathBatch.
+
+    A batch is opened for each bulk operation, within the operation's transaction, so that CablePaths are committed
+    together with the changes which affect them. Outside of a batch, each change is retraced immediately.
+    """
+    if (batch := current_batch.get()) is not None:
+        yield batch
+        return
+
+    batch = CablePathBatch()
+    token = current_batch.set(batch)
+    try:
+        yield batch
+    finally:
+        current_batch.reset(token)
+    batch.commit()
@@ -1,5 +1,4 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
 
 
 def compile_path_node(ct_id, object_id):
@@ -36,23 +35,17 @@ def create_cablepath(terminations):
 
     :param terminations: Iterable of CableTermination objects
     """
-    from dcim.models import CablePath
+    from dcim.tracing import cable_path_batch
 
-    cp = CablePath.from_origin(terminations)
-    if cp:
-        cp.save()
+    with cable_path_batch() as batch:
+        batch.create(terminations)
 
 
 def rebuild_paths(terminations):
     """
     Rebuild all CablePaths which traverse the specified nodes.
     """
-    from dcim.models import CablePath
+    from dcim.tracing import cable_path_batch
 
-    for obj in terminations:
-        cable_paths = CablePath.objects.filter(_nodes__contains=obj)
-
-        with transaction.atomic():
-            for cp in cable_paths:
-                cp.delete()
-                create_cablepath(cp.origins)
+    with cable_path_batch() as batch:
+        batch.retrace(terminations)
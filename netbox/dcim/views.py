@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
 from django.core.paginator import EmptyPage, PageNotAnInteger
@@ -35,6 +36,7 @@ from virtualization.tables import VirtualMachineTable
 from . import filtersets, forms, tables
 from .choices import DeviceFaceChoices, InterfaceModeChoices
 from .models import *
+from .svg import render_rack_elevations
 
 CABLE_TERMINATION_TYPES = {
     'dcim.consoleport': ConsolePort,
@@ -638,7 +640,7 @@ class RackTypeBulkDeleteView(generic.BulkDeleteView):
 class RackListView(generic.ObjectListView):
     queryset = Rack.objects.annotate(
         device_count=count_related(Device, 'rack')
-    )
+    ).annotate_occupancy()
     filterset = filtersets.RackFilterSet
     filterset_form = forms.RackFilterForm
     table = tables.RackTable
@@ -685,6 +687,11 @@ class RackElevationListView(generic.ObjectListView):
         if rack_face not in DeviceFaceChoices.values():
             rack_face = DeviceFaceChoices.FACE_FRONT
 
+        # Render the elevations of all racks on the page together, so that each is retrieved from the cache when
+        # subsequently requested via the REST API
+        if settings.RACK_ELEVATION_CACHE_TIMEOUT:
+            render_rack_elevations(page, face=rack_face, user=request.user, base_url=request.build_absolute_uri('/'))
+
         return render(request, 'dcim/rack_elevation_list.html', {
             'paginator': paginator,
             'page': page,
@@ -700,7 +707,7 @@ class RackElevationListView(generic.ObjectListView):
 
 @register_model_view(Rack)
 class RackView(GetRelatedModelsMixin, generic.ObjectView):
-    queryset = Rack.objects.prefetch_related('site__region', 'tenant__group', 'location', 'role')
+    queryset = Rack.objects.prefetch_related('site__region', 'tenant__group', 'location', 'role').annotate_occupancy()
 
     def get_extra_context(self, request, instance):
         peer_racks = Rack.objects.restrict(request.user, 'view').filter(site=instance.site)
@@ -783,14 +790,14 @@ class RackBulkImportView(generic.BulkImportView):
 
 
 class RackBulkEditView(generic.BulkEditView):
-    queryset = Rack.objects.all()
+    queryset = Rack.objects.annotate_occupancy()
     filterset = filtersets.RackFilterSet
     table = tables.RackTable
     form = forms.RackBulkEditForm
 
 
 class RackBulkDeleteView(generic.BulkDeleteView):
-    queryset = Rack.objects.all()
+    queryset = Rack.objects.annotate_occupancy()
     filterset = filtersets.RackFilterSet
     table = tables.RackTable
 
@@ -6,7 +6,7 @@ class ExtrasConfig(AppConfig):
 
     def ready(self):
         from netbox.models.features import register_models
-        from . import dashboard, lookups, search, signals  # noqa: F401
+        from . import dashboard, housekeeping, lookups, search, signals  # noqa: F401
 
         # Register models
         register_models(*self.get_models())
@@ -1,8 +1,8 @@
 import logging
-from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import prefetch_related_objects
 from django.utils import timezone
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext as _
@@ -13,11 +13,11 @@ from netbox.config import get_config
 from netbox.constants import RQ_QUEUE_DEFAULT
 from netbox.registry import registry
 from users.models import User
-from utilities.api import get_serializer_for_model
+from utilities.api import get_prefetches_for_serializer, get_serializer_for_model
 from utilities.rqworker import get_rq_retry
 from utilities.serialization import serialize_object
 from .choices import EventRuleActionChoices
-from .models import EventRule
+from .metadata import metadata_cache
 
 logger = logging.getLogger('netbox.events_processor')
 
@@ -81,6 +81,23 @@ def enqueue_event(queue, instance, user, request_id, event_type):
         }
 
 
+def enqueue_events(queue, instances, user, request_id, event_type):
+    """
+    Enqueue serialized representations of a set of objects of the same type (e.g. those created in bulk). The related
+    objects referenced by the serializer are prefetched once for the entire set, rather than for each object.
+    """
+    if not instances:
+        return
+    model = instances[0]._meta.model
+    if model._meta.model_name not in registry['model_features']['event_rules'].get(model._meta.app_label, []):
+        return
+
+    serializer_class = get_serializer_for_model(model)
+    prefetch_related_objects(instances, *get_prefetches_for_serializer(serializer_class))
+    for instance in instances:
+        enqueue_event(queue, instance, user, request_id, event_type)
+
+
 def process_event_rules(event_rules, object_type, event_type, data, username=None, snapshots=None, request_id=None):
     user = User.objects.get(username=username) if username else None
 
@@ -91,8 +108,7 @@ def process_event_rules(event_rules, object_type, event_type, data, username=Non
             continue
 
         # Compile event data
-        event_data = event_rule.action_data or {}
-        event_data.update(data)
+        event_data = {**(event_rule.action_data or {}), **data}
 
         # Webhooks
         if event_rule.action_type == EventRuleActionChoices.WEBHOOK:
@@ -157,24 +173,10 @@ def process_event_queue(events):
     """
     Flush a list of object representation to RQ for EventRule processing.
     """
-    events_cache = defaultdict(dict)
-
     for event in events:
-        event_type = event['event_type']
-        object_type = event['object_type']
-
-        # Cache applicable Event Rules
-        if object_type not in events_cache[event_type]:
-            events_cache[event_type][object_type] = EventRule.objects.filter(
-                event_types__contains=[event['event_type']],
-                object_types=object_type,
-                enabled=True
-            )
-        event_rules = events_cache[event_type][object_type]
-
         process_event_rules(
-            event_rules=event_rules,
-            object_type=object_type,
+            event_rules=metadata_cache.get_event_rules(event['object_type'], event['event_type']),
+            object_type=event['object_type'],
             event_type=event['event_type'],
             data=event['data'],
             username=event['username'],
@@ -0,0 +1,36 @@
+from django.db.models import Exists, OuterRef
+
+from core.models import ObjectType
+from netbox.housekeeping import HousekeepingTask
+from netbox.utils import register_housekeeping_task
+from .models import CachedValue
+
+__all__ = (
+    'DeleteOrphanedCachedValuesTask',
+)
+
+
+@register_housekeeping_task
+class DeleteOrphanedCachedValuesTask(HousekeepingTask):
+    """
+    Delete any cached search values pertaining to objects which no longer exist (e.g. because they were deleted
+    without sending signals).
+    """
+    description = "Checking for cached values of deleted objects"
+
+    def run(self):
+        deleted_count = 0
+        object_type_ids = CachedValue.objects.order_by().values_list('object_type', flat=True).distinct()
+        for object_type in ObjectType.objects.filter(pk__in=list(object_type_ids)):
+            if self.time_expired:
+                break
+            queryset = CachedValue.objects.filter(object_type=object_type)
+            if model := object_type.model_class():
+                queryset = queryset.filter(~Exists(model._base_manager.filter(pk=OuterRef('object_id'))))
+            self.log(f"Checking {object_type.app_label}.{object_type.model}", level=2)
+            deleted_count += self.delete_in_batches(queryset)
+
+        if deleted_count:
+            self.log(f"Deleted {deleted_count} orphaned cached values.", self.command.style.SUCCESS)
+        else:
+            self.log("No orphaned cached values found.", self.command.style.SUCCESS)
@@ -1,135 +1,37 @@
-from datetime import timedelta
-from importlib import import_module
+import time
 
-import requests
-from django.conf import settings
-from django.core.cache import cache
 from django.core.management.base import BaseCommand
-from django.db import DEFAULT_DB_ALIAS
-from django.utils import timezone
-from packaging import version
 
-from core.models import Job, ObjectChange
-from netbox.config import Config
+from netbox.registry import registry
 
 
 class Command(BaseCommand):
     help = "Perform nightly housekeeping tasks. (This command can be run at any time.)"
 
-    def handle(self, *args, **options):
-        config = Config()
-
-        # Clear expired authentication sessions (essentially replicating the `clearsessions` command)
-        if options['verbosity']:
-            self.stdout.write("[*] Clearing expired authentication sessions")
-            if options['verbosity'] >= 2:
-                self.stdout.write(f"\tConfigured session engine: {settings.SESSION_ENGINE}")
-        engine = import_module(settings.SESSION_ENGINE)
-        try:
-            engine.SessionStore.clear_expired()
-            if options['verbosity']:
-                self.stdout.write("\tSessions cleared.", self.style.SUCCESS)
-        except NotImplementedError:
-            if options['verbosity']:
-                self.stdout.write(
-                    f"\tThe configured session engine ({settings.SESSION_ENGINE}) does not support "
-                    f"clearing sessions; skipping."
-                )
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000, dest='batch_size',
+            help="Maximum number of records to delete at once (default: 1000)"
+        )
+        parser.add_argument(
+            '--time-limit', type=int, dest='time_limit',
+            help="Stop deleting records after the given number of seconds; any remaining records will be deleted on "
+                 "the next run"
+        )
 
-        # Delete expired ObjectChanges
-        if options['verbosity']:
-            self.stdout.write("[*] Checking for expired changelog records")
-        if config.CHANGELOG_RETENTION:
-            cutoff = timezone.now() - timedelta(days=config.CHANGELOG_RETENTION)
-            if options['verbosity'] >= 2:
-                self.stdout.write(f"\tRetention period: {config.CHANGELOG_RETENTION} days")
-                self.stdout.write(f"\tCut-off time: {cutoff}")
-            expired_records = ObjectChange.objects.filter(time__lt=cutoff).count()
-            if expired_records:
-                if options['verbosity']:
-                    self.stdout.write(
-                        f"\tDeleting {expired_records} expired records... ",
-                        self.style.WARNING,
-                        ending=""
-                    )
-                    self.stdout.flush()
-                ObjectChange.objects.filter(time__lt=cutoff)._raw_delete(using=DEFAULT_DB_ALIAS)
-                if options['verbosity']:
-                    self.stdout.write("Done.", self.style.SUCCESS)
-            elif options['verbosity']:
-                self.stdout.write("\tNo expired records found.", self.style.SUCCESS)
-        elif options['verbosity']:
-            self.stdout.write(
-                f"\tSkipping: No retention period specified (CHANGELOG_RETENTION = {config.CHANGELOG_RETENTION})"
-            )
-
-        # Delete expired Jobs
-        if options['verbosity']:
-            self.stdout.write("[*] Checking for expired jobs")
-        if config.JOB_RETENTION:
-            cutoff = timezone.now() - timedelta(days=config.JOB_RETENTION)
-            if options['verbosity'] >= 2:
-                self.stdout.write(f"\tRetention period: {config.JOB_RETENTION} days")
-                self.stdout.write(f"\tCut-off time: {cutoff}")
-            expired_records = Job.objects.filter(created__lt=cutoff).count()
-            if expired_records:
-                if options['verbosity']:
-                    self.stdout.write(
-                        f"\tDeleting {expired_records} expired records... ",
-                        self.style.WARNING,
-                        ending=""
-                    )
-                    self.stdout.flush()
-                Job.objects.filter(created__lt=cutoff).delete()
-                if options['verbosity']:
-                    self.stdout.write("Done.", self.style.SUCCESS)
-            elif options['verbosity']:
-                self.stdout.write("\tNo expired records found.", self.style.SUCCESS)
-        elif options['verbosity']:
-            self.stdout.write(
-                f"\tSkipping: No retention period specified (JOB_RETENTION = {config.JOB_RETENTION})"
+    def handle(self, *args, **options):
+        deadline = time.monotonic() + options['time_limit'] if options['time_limit'] else None
+
+        for task_class in registry['housekeeping_tasks']:
+            task = task_class(
+                self,
+                verbosity=options['verbosity'],
+                batch_size=options['batch_size'],
+                deadline=deadline
             )
-
-        # Check for new releases (if enabled)
-        if options['verbosity']:
-            self.stdout.write("[*] Checking for latest release")
-        if settings.ISOLATED_DEPLOYMENT:
-            if options['verbosity']:
-                self.stdout.write("\tSkipping: ISOLATED_DEPLOYMENT is enabled")
-        elif settings.RELEASE_CHECK_URL:
-            headers = {
-                'Accept': 'application/vnd.github.v3+json',
-            }
-
-            try:
-                if options['verbosity'] >= 2:
-                    self.stdout.write(f"\tFetching {settings.RELEASE_CHECK_URL}")
-                response = requests.get(
-                    url=settings.RELEASE_CHECK_URL,
-                    headers=headers,
-                    proxies=settings.HTTP_PROXIES
-                )
-                response.raise_for_status()
-
-                releases = []
-                for release in response.json():
-                    if 'tag_name' not in release or release.get('devrelease') or release.get('prerelease'):
-                        continue
-                    releases.append((version.parse(release['tag_name']), release.get('html_url')))
-                latest_release = max(releases)
-                if options['verbosity'] >= 2:
-                    self.stdout.write(f"\tFound {len(response.json())} releases; {len(releases)} usable")
-                if options['verbosity']:
-                    self.stdout.write(f"\tLatest release: {latest_release[0]}", self.style.SUCCESS)
-
-                # Cache the most recent release
-                cache.set('latest_release', latest_release, None)
-
-            except requests.exceptions.RequestException as exc:
-                self.stdout.write(f"\tRequest error: {exc}", self.style.ERROR)
-        else:
             if options['verbosity']:
-                self.stdout.write("\tSkipping: RELEASE_CHECK_URL not set")
+                self.stdout.write(f"[*] {task.description}")
+            task.run()
 
         if options['verbosity']:
             self.stdout.write("Finished.", self.style.SUCCESS)
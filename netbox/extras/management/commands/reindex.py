@@ -1,10 +1,38 @@
+import datetime
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
 from django.utils.translation import gettext as _
 
 from netbox.registry import registry
 from netbox.search.backends import search_backend
 
+CHECKPOINT_CACHE_KEY = 'reindex_checkpoint'
+
+
+def reindex_range(label, start, end, since=None, chunk_size=1000):
+    """
+    Cache all objects of the specified model with a primary key in the range [start, end), optionally limited to
+    those modified since the given time. Returns the number of objects indexed and the number of entries cached.
+    """
+    queryset = registry['search'][label].model.objects.filter(pk__gte=start, pk__lt=end)
+    if since:
+        queryset = queryset.filter(last_updated__gte=since)
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=chunk_size))
+    if not pks:
+        return 0, 0
+
+    return len(pks), search_backend.cache_objects({label: pks})
+
 
 class Command(BaseCommand):
     help = 'Reindex objects for search'
@@ -21,6 +49,27 @@ class Command(BaseCommand):
             action='store_true',
             help="For each model, reindex objects only if no cache entries already exist"
         )
+        parser.add_argument(
+            '--since',
+            help="Reindex only objects modified since the given date or time (ISO 8601)"
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Number of worker processes to use (default: 1)"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=10000, dest='batch_size',
+            help="Size of the primary key range assigned to a worker at a time (default: 10000)"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000, dest='chunk_size',
+            help="Number of rows to fetch from the database at a time (default: 1000)"
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help="Resume an interrupted run, skipping any primary key ranges which have already been reindexed"
+        )
 
     def _get_indexers(self, *model_names):
         indexers = {}
@@ -58,7 +107,67 @@ class Command(BaseCommand):
 
         return indexers
 
+    def _get_since(self, value):
+        """
+        Parse the value of the --since argument as a timezone-aware datetime.
+        """
+        if not value:
+            return None
+        if (since := parse_datetime(value)) is None:
+            if (date := parse_date(value)) is None:
+                raise CommandError(f"Invalid date or time: {value}")
+            since = datetime.datetime.combine(date, datetime.time())
+        if is_naive(since):
+            since = make_aware(since)
+
+        return since
+
+    def _get_checkpoint(self, model_labels, since, batch_size, resume):
+        """
+        Return the checkpoint for the current run. The checkpoint records the primary key ranges of each model which
+        have been reindexed, and is discarded unless resuming an interrupted run with the same arguments.
+        """
+        arguments = {
+            'models': sorted(model_labels),
+            'since': since.isoformat() if since else None,
+            'batch_size': batch_size,
+        }
+        if resume:
+            checkpoint = cache.get(CHECKPOINT_CACHE_KEY)
+            if checkpoint is None:
+                raise CommandError("No interrupted run found to resume.")
+            if checkpoint['arguments'] != arguments:
+                raise CommandError(
+                    f"The interrupted run was started with different arguments: {checkpoint['arguments']}"
+                )
+            return checkpoint
+
+        return {
+            'arguments': arguments,
+            'completed': {},
+        }
+
+    def _get_ranges(self, model, batch_size, since=None):
+        """
+        Partition the primary keys of a model into ranges of the given size. Ranges are aligned to multiples of the
+        batch size, so that they remain stable between runs.
+        """
+        queryset = model.objects.all()
+        if since:
+            queryset = queryset.filter(last_updated__gte=since)
+        bounds = queryset.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            return []
+
+        return [
+            (i * batch_size, (i + 1) * batch_size)
+            for i in range(bounds['first'] // batch_size, bounds['last'] // batch_size + 1)
+        ]
+
     def handle(self, *model_labels, **kwargs):
+        since = self._get_since(kwargs['since'])
+        if kwargs['workers'] < 1 or kwargs['batch_size'] < 1 or kwargs['chunk_size'] < 1:
+            raise CommandError("--workers, --batch-size, and --chunk-size must be positive integers.")
 
         # Determine which models to reindex
         indexers = self._get_indexers(*model_labels)
@@ -66,8 +175,12 @@ class Command(BaseCommand):
             raise CommandError(_("No indexers found!"))
         self.stdout.write(f'Reindexing {len(indexers)} models.')
 
-        # Clear cached values for the specified models (if not being lazy)
-        if not kwargs['lazy']:
+        checkpoint = self._get_checkpoint(model_labels, since, kwargs['batch_size'], kwargs['resume'])
+        cache.set(CHECKPOINT_CACHE_KEY, checkpoint, None)
+
+        # Clear cached values for the specified models (if not being lazy or resuming an interrupted run). When
+        # reindexing only recently modified objects, the cached values of each object are replaced individually.
+        if not (kwargs['lazy'] or kwargs['resume'] or since):
             if model_labels:
                 content_types = [ContentType.objects.get_for_model(model) for model in indexers.keys()]
             else:
@@ -78,27 +191,86 @@ class Command(BaseCommand):
             deleted_count = search_backend.clear(object_types=content_types)
             self.stdout.write(f'{deleted_count} entries deleted.')
 
+        # Start the worker processes (if any). Database connections are closed first so that they are not shared with
+        # the workers.
+        executor = None
+        if kwargs['workers'] > 1:
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                max_workers=kwargs['workers'],
+                mp_context=multiprocessing.get_context('fork')
+            )
+
         # Index models
         self.stdout.write('Indexing models')
-        for model, idx in indexers.items():
-            app_label = model._meta.app_label
-            model_name = model._meta.model_name
-            self.stdout.write(f'  {app_label}.{model_name}... ', ending='')
-            self.stdout.flush()
+        try:
+            for model in indexers:
+                self._reindex_model(model, since, checkpoint, executor, **kwargs)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
-            if kwargs['lazy']:
-                content_type = ContentType.objects.get_for_model(model)
-                if cached_count := search_backend.count(object_types=[content_type]):
-                    self.stdout.write(f'Skipping (found {cached_count} existing).')
-                    continue
-
-            i = search_backend.cache(model.objects.iterator(), remove_existing=False)
-            if i:
-                self.stdout.write(f'{i} entries cached.')
-            else:
-                self.stdout.write('No objects found.')
+        # The run has completed, so its checkpoint is no longer needed
+        cache.delete(CHECKPOINT_CACHE_KEY)
 
         msg = 'Completed.'
         if total_count := search_backend.size:
             msg += f' Total entries: {total_count}'
         self.stdout.write(msg, self.style.SUCCESS)
+
+    def _reindex_model(self, model, since, checkpoint, executor, **kwargs):
+        app_label = model._meta.app_label
+        model_name = model._meta.model_name
+        label = f'{app_label}.{model_name}'
+        self.stdout.write(f'  {label}... ', ending='')
+        self.stdout.flush()
+
+        if kwargs['lazy']:
+            content_type = ContentType.objects.get_for_model(model)
+            if cached_count := search_backend.count(object_types=[content_type]):
+                self.stdout.write(f'Skipping (found {cached_count} existing).')
+                return
+
+        if since:
+            try:
+                model._meta.get_field('last_updated')
+            except FieldDoesNotExist:
+                self.stdout.write('Skipping (modification time not recorded).')
+                return
+
+        # Determine which primary key ranges remain to be reindexed
+        completed = checkpoint['completed'].setdefault(label, [])
+        ranges = [
+            (start, end) for start, end in self._get_ranges(model, kwargs['batch_size'], since=since)
+            if start not in completed
+        ]
+
+        start_time = time.monotonic()
+        object_count = entry_count = 0
+        if executor is None:
+            results = (
+                (start, reindex_range(label, start, end, since=since, chunk_size=kwargs['chunk_size']))
+                for start, end in ranges
+            )
+        else:
+            futures = {
+                executor.submit(reindex_range, label, start, end, since=since, chunk_size=kwargs['chunk_size']): start
+                for start, end in ranges
+            }
+            results = ((futures[future], future.result()) for future in as_completed(futures))
+
+        # Record the completion of each range as the results arrive
+        for start, (objects, entries) in results:
+            object_count += objects
+            entry_count += entries
+            completed.append(start)
+            cache.set(CHECKPOINT_CACHE_KEY, checkpoint, None)
+        elapsed = time.monotonic() - start_time
+
+        if object_count:
+            self.stdout.write(
+                f'{entry_count} entries cached for {object_count} objects in {elapsed:.2f} seconds '
+                f'({object_count / elapsed:.0f} objects/second).'
+            )
+        else:
+            self.stdout.write('No objects found.')
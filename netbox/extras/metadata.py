@@ -0,0 +1,181 @@
+import copy
+import threading
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from core.models import ObjectType
+
+__all__ = (
+    'MetadataCache',
+    'metadata_cache',
+)
+
+# Identifies the current state of all custom fields, custom links, export templates, and event rules
+VERSION_KEY = 'extras.metadata.version'
+
+# The version token retrieved while tracking is active (see MetadataCache.track_version())
+tracked_version = ContextVar('tracked_version', default=None)
+
+
+class MetadataCache:
+    """
+    A per-process cache of the custom fields, custom links, export templates, and event rules assigned to each object
+    type. These are consulted (often repeatedly) when rendering tables, forms, filtersets, and serializers, and when
+    processing events, yet change only rarely.
+
+    Cached definitions are validated against a version token stored in the shared cache, which is replaced whenever
+    any definition is modified (see invalidate()). Thus a change made by any process takes effect for all others.
+
+    Definitions are retrieved from the database, but not cached, while the current transaction has modified them. The
+    instances returned by the cache are shared and must not be modified, with the exception of event rules, which are
+    copied as they may be annotated during processing.
+    """
+    def __init__(self):
+        # A tuple of the version token and a dictionary of entries cached under it
+        self._cache = (None, {})
+        self._local = threading.local()
+
+    def _fetch_version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(VERSION_KEY, version, timeout=None):
+                version = cache.get(VERSION_KEY, version)
+        return version
+
+    def get_version(self):
+        """
+        Return the current version token. While tracking is active, it is retrieved from the shared cache only once.
+        """
+        if (tracked := tracked_version.get()) is None:
+            return self._fetch_version()
+        if 'version' not in tracked:
+            tracked['version'] = self._fetch_version()
+        return tracked['version']
+
+    @contextmanager
+    def track_version(self):
+        """
+        Retrieve the version token from the shared cache at most once within the block (e.g. while processing a request
+        or job), rather than on every lookup. Definitions modified by another process while the block executes take
+        effect once it has exited; those modified by the current process take effect immediately. Nested blocks defer
+        to the outermost one.
+        """
+        if tracked_version.get() is not None:
+            yield
+            return
+
+        token = tracked_version.set({})
+        try:
+            yield
+        finally:
+            tracked_version.reset(token)
+
+    def _bump_version(self):
+        version = uuid.uuid4().hex
+        cache.set(VERSION_KEY, version, timeout=None)
+        self._cache = (None, {})
+        if (tracked := tracked_version.get()) is not None:
+            tracked['version'] = version
+
+    def _commit(self):
+        self._local.dirty = False
+        self._bump_version()
+
+    def invalidate(self):
+        """
+        Invalidate all cached definitions. Invalidation is repeated once the current transaction (if any) has been
+        committed, so that definitions read by another process prior to the commit are not retained.
+        """
+        self._bump_version()
+        if connection.in_atomic_block:
+            self._local.dirty = True
+        transaction.on_commit(self._commit)
+
+    def _is_cacheable(self):
+        if not connection.in_atomic_block:
+            self._local.dirty = False
+            return True
+        return not getattr(self._local, 'dirty', False)
+
+    def get(self, key, loader):
+        """
+        Return the cached value for the given key, calling loader() to populate it if necessary.
+        """
+        if not self._is_cacheable():
+            return loader()
+
+        version = self.get_version()
+        cached_version, entries = self._cache
+        if cached_version != version:
+            entries = {}
+            self._cache = (version, entries)
+        if key not in entries:
+            entries[key] = loader()
+
+        return entries[key]
+
+    @staticmethod
+    def _get_object_type(model):
+        if isinstance(model, ContentType):
+            return model
+        return ObjectType.objects.get_for_model(model._meta.concrete_model)
+
+    def get_custom_fields(self, model):
+        """
+        Return a tuple of all CustomFields assigned to the given model, ObjectType, or ContentType.
+        """
+        from extras.models import CustomField
+
+        object_type = self._get_object_type(model)
+        return self.get(('custom_fields', object_type.pk), partial(tuple, CustomField.objects.filter(
+            object_types=object_type
+        ).select_related('related_object_type', 'choice_set')))
+
+    def get_custom_links(self, model):
+        """
+        Return a tuple of all enabled CustomLinks assigned to the given model, ObjectType, or ContentType.
+        """
+        from extras.models import CustomLink
+
+        object_type = self._get_object_type(model)
+        return self.get(('custom_links', object_type.pk), partial(tuple, CustomLink.objects.filter(
+            object_types=object_type,
+            enabled=True
+        )))
+
+    def get_export_templates(self, model):
+        """
+        Return a tuple of all ExportTemplates assigned to the given model, ObjectType, or ContentType.
+        """
+        from extras.models import ExportTemplate
+
+        object_type = self._get_object_type(model)
+        return self.get(('export_templates', object_type.pk), partial(tuple, ExportTemplate.objects.filter(
+            object_types=object_type
+        )))
+
+    def get_event_rules(self, model, event_type):
+        """
+        Return a list of all enabled EventRules assigned to the given model, ObjectType, or ContentType which are
+        triggered by the specified type of event.
+        """
+        from extras.models import EventRule
+
+        object_type = self._get_object_type(model)
+        event_rules = self.get(('event_rules', object_type.pk), partial(tuple, EventRule.objects.filter(
+            object_types=object_type,
+            enabled=True
+        )))
+        return [
+            copy.copy(event_rule) for event_rule in event_rules if event_type in event_rule.event_types
+        ]
+
+
+metadata_cache = MetadataCache()
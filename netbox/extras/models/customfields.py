@@ -62,9 +62,9 @@ class CustomFieldManager(models.Manager.from_queryset(RestrictedQuerySet)):
         """
         Return a dictionary of serialized default values for all CustomFields applicable to the given model.
         """
-        custom_fields = self.get_for_model(model).filter(default__isnull=False)
+        from extras.metadata import metadata_cache
         return {
-            cf.name: cf.default for cf in custom_fields
+            cf.name: cf.default for cf in metadata_cache.get_custom_fields(model) if cf.default is not None
         }
 
 
@@ -1,3 +1,4 @@
+import itertools
 import json
 import urllib.parse
 
@@ -6,7 +7,7 @@ from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelatio
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import ValidationError
 from django.db import models
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -23,8 +24,9 @@ from netbox.models import ChangeLoggedModel
 from netbox.models.features import (
     CloningMixin, CustomFieldsMixin, CustomLinksMixin, ExportTemplatesMixin, SyncedDataMixin, TagsMixin,
 )
+from utilities.export import buffer_stream
 from utilities.html import clean_html
-from utilities.jinja2 import render_jinja2
+from utilities.jinja2 import render_jinja2, stream_jinja2
 from utilities.querydict import dict_to_querydict
 from utilities.querysets import RestrictedQuerySet
 
@@ -459,25 +461,41 @@ class ExportTemplate(SyncedDataMixin, CloningMixin, ExportTemplatesMixin, Change
         """
         Render the contents of the template.
         """
+        return ''.join(self.stream(queryset))
+
+    def stream(self, queryset):
+        """
+        Render the contents of the template incrementally, yielding the output in portions as it is rendered.
+        """
         context = {
             'queryset': queryset
         }
-        output = render_jinja2(self.template_code, context)
+        pending = ''
+        for output in buffer_stream(stream_jinja2(self.template_code, context)):
+
+            # Hold back a trailing carriage return, which may begin a line terminator split across portions
+            output = pending + output
+            pending = '\r' if output.endswith('\r') else ''
+            output = output.removesuffix('\r')
 
-        # Replace CRLF-style line terminators
-        output = output.replace('\r\n', '\n')
+            # Replace CRLF-style line terminators
+            yield output.replace('\r\n', '\n')
 
-        return output
+        if pending:
+            yield pending
 
     def render_to_response(self, queryset):
         """
-        Render the template to an HTTP response, delivered as a named file attachment
+        Render the template to a streaming HTTP response, delivered as a named file attachment. The first portion of
+        the output is rendered immediately, so that any error encountered at the start of rendering (e.g. a syntax
+        error) is raised here rather than once the response has begun.
         """
-        output = self.render(queryset)
+        content = self.stream(queryset)
+        output = next(content, '')
         mime_type = 'text/plain; charset=utf-8' if not self.mime_type else self.mime_type
 
         # Build the response
-        response = HttpResponse(output, content_type=mime_type)
+        response = StreamingHttpResponse(itertools.chain((output,), content), content_type=mime_type)
 
         if self.as_attachment:
             basename = queryset.model._meta.verbose_name_plural.replace(' ', '_')
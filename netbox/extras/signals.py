@@ -1,17 +1,18 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from core.events import *
 from core.models import ObjectType
 from core.signals import job_end, job_start
 from extras.events import process_event_rules
-from extras.models import EventRule, Notification, Subscription
+from extras.models import Notification, Subscription
 from netbox.config import get_config
 from netbox.registry import registry
 from netbox.signals import post_clean
 from utilities.exceptions import AbortRequest
-from .models import CustomField, TaggedItem
+from .metadata import metadata_cache
+from .models import CustomField, CustomFieldChoiceSet, CustomLink, EventRule, ExportTemplate, TaggedItem
 from .utils import run_validators
 
 
@@ -56,6 +57,25 @@ m2m_changed.connect(handle_cf_added_obj_types, sender=CustomField.object_types.t
 m2m_changed.connect(handle_cf_removed_obj_types, sender=CustomField.object_types.through)
 
 
+#
+# Metadata cache
+#
+
+def invalidate_metadata_cache(**kwargs):
+    """
+    Invalidate the cached custom fields, custom links, export templates, and event rules when any of them (or their
+    assigned object types) are modified.
+    """
+    metadata_cache.invalidate()
+
+
+for model in (CustomField, CustomFieldChoiceSet, CustomLink, EventRule, ExportTemplate):
+    post_save.connect(invalidate_metadata_cache, sender=model)
+    post_delete.connect(invalidate_metadata_cache, sender=model)
+for model in (CustomField, CustomLink, EventRule, ExportTemplate):
+    m2m_changed.connect(invalidate_metadata_cache, sender=model.object_types.through)
+
+
 #
 # Custom validation
 #
@@ -98,11 +118,7 @@ def process_job_start_event_rules(sender, **kwargs):
     """
     Process event rules for jobs starting.
     """
-    event_rules = EventRule.objects.filter(
-        event_types__contains=[JOB_STARTED],
-        enabled=True,
-        object_types=sender.object_type
-    )
+    event_rules = metadata_cache.get_event_rules(sender.object_type, JOB_STARTED)
     username = sender.user.username if sender.user else None
     process_event_rules(
         event_rules=event_rules,
@@ -118,11 +134,7 @@ def process_job_end_event_rules(sender, **kwargs):
     """
     Process event rules for jobs terminating.
     """
-    event_rules = EventRule.objects.filter(
-        event_types__contains=[JOB_COMPLETED],
-        enabled=True,
-        object_types=sender.object_type
-    )
+    event_rules = metadata_cache.get_event_rules(sender.object_type, JOB_COMPLETED)
     username = sender.user.username if sender.user else None
     process_event_rules(
         event_rules=event_rules,
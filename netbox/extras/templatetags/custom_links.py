@@ -2,8 +2,7 @@ from django import template
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
 
-from core.models import ObjectType
-from extras.models import CustomLink
+from extras.metadata import metadata_cache
 from netbox.choices import ButtonColorChoices
 
 
@@ -34,8 +33,7 @@ def custom_links(context, obj):
     """
     Render all applicable links for the given object.
     """
-    object_type = ObjectType.objects.get_for_model(obj)
-    custom_links = CustomLink.objects.filter(object_types=object_type, enabled=True)
+    custom_links = metadata_cache.get_custom_links(obj)
     if not custom_links:
         return ''
 
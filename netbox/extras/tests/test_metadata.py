@@ -0,0 +1,94 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from core.events import *
+from core.models import ObjectType
+from dcim.filtersets import SiteFilterSet
+from dcim.models import Site
+from dcim.tables import SiteTable
+from extras.choices import CustomFieldTypeChoices, EventRuleActionChoices
+from extras import metadata
+from extras.metadata import metadata_cache
+from extras.models import CustomField, CustomLink, EventRule, Webhook
+
+
+class MetadataCacheTestCase(TestCase):
+
+    def setUp(self):
+        # Discard any definitions cached by the test, which are rolled back on completion
+        self.addCleanup(metadata_cache.invalidate)
+
+    def test_custom_fields(self):
+        site_type = ObjectType.objects.get_for_model(Site)
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_field = CustomField.objects.create(name='cf1', type=CustomFieldTypeChoices.TYPE_TEXT)
+            custom_field.object_types.set([site_type])
+            custom_link = CustomLink.objects.create(name='Link 1', link_text='Link', link_url='http://example.com')
+            custom_link.object_types.set([site_type])
+
+        self.assertEqual(metadata_cache.get_custom_fields(Site), (custom_field,))
+        self.assertEqual(metadata_cache.get_custom_links(Site), (custom_link,))
+
+        # Once cached, custom fields & links are applied to tables and filtersets without any queries
+        with self.assertNumQueries(0):
+            table = SiteTable(Site.objects.none())
+            filterset = SiteFilterSet()
+        self.assertIn('cf_cf1', table.columns.names())
+        self.assertIn('cl_Link 1', table.columns.names())
+        self.assertIn('cf_cf1', filterset.filters)
+
+        # Modifying a custom field's object types should invalidate the cache
+        with self.captureOnCommitCallbacks(execute=True):
+            custom_field.object_types.clear()
+        self.assertEqual(metadata_cache.get_custom_fields(Site), ())
+
+    def test_event_rules(self):
+        webhook = Webhook.objects.create(name='Webhook 1', payload_url='http://localhost:9000/')
+        with self.captureOnCommitCallbacks(execute=True):
+            event_rule = EventRule.objects.create(
+                name='Event Rule 1',
+                event_types=[OBJECT_CREATED, OBJECT_UPDATED],
+                action_type=EventRuleActionChoices.WEBHOOK,
+                action_object=webhook
+            )
+            event_rule.object_types.set([ObjectType.objects.get_for_model(Site)])
+
+        self.assertEqual(metadata_cache.get_event_rules(Site, OBJECT_CREATED), [event_rule])
+        with self.assertNumQueries(0):
+            self.assertEqual(metadata_cache.get_event_rules(Site, OBJECT_UPDATED), [event_rule])
+            self.assertEqual(metadata_cache.get_event_rules(Site, OBJECT_DELETED), [])
+
+        # Disabling the event rule should invalidate the cache
+        with self.captureOnCommitCallbacks(execute=True):
+            event_rule.enabled = False
+            event_rule.save()
+        self.assertEqual(metadata_cache.get_event_rules(Site, OBJECT_CREATED), [])
+
+    def test_track_version(self):
+        site_type = ObjectType.objects.get_for_model(Site)
+        metadata_cache.get_custom_fields(Site)
+
+        # The version token is retrieved from the shared cache only once while tracking
+        with patch.object(metadata, 'cache', wraps=metadata.cache) as cache:
+            with metadata_cache.track_version():
+                for _ in range(10):
+                    self.assertEqual(metadata_cache.get_custom_fields(Site), ())
+                    metadata_cache.get_custom_links(Site)
+            self.assertEqual(cache.get.call_count, 1)
+
+            # Definitions modified while tracking take effect immediately
+            with metadata_cache.track_version():
+                metadata_cache.get_custom_fields(Site)
+                with self.captureOnCommitCallbacks(execute=True):
+                    custom_field = CustomField.objects.create(name='cf1', type=CustomFieldTypeChoices.TYPE_TEXT)
+                    custom_field.object_types.set([site_type])
+                self.assertEqual(metadata_cache.get_custom_fields(Site), (custom_field,))
+
+            # Modifications by another process take effect once tracking has ended
+            with metadata_cache.track_version():
+                metadata_cache.get_custom_fields(Site)
+                CustomField.object_types.through.objects.filter(customfield=custom_field).delete()
+                metadata.cache.set(metadata.VERSION_KEY, 'other', timeout=None)
+                self.assertEqual(metadata_cache.get_custom_fields(Site), (custom_field,))
+            self.assertEqual(metadata_cache.get_custom_fields(Site), ())
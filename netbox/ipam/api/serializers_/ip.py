@@ -28,7 +28,21 @@ __all__ = (
 )
 
 
-class AggregateSerializer(NetBoxModelSerializer):
+class UtilizationSerializerMixin(serializers.Serializer):
+    """
+    Return the utilization annotated by annotate_utilization(), calculating it for each object where the queryset has
+    not been annotated (e.g. when an object has just been created or updated).
+    """
+    utilization = serializers.SerializerMethodField(read_only=True)
+
+    @extend_schema_field(serializers.FloatField())
+    def get_utilization(self, obj):
+        if hasattr(obj, 'utilization'):
+            return obj.utilization
+        return obj.get_utilization()
+
+
+class AggregateSerializer(UtilizationSerializerMixin, NetBoxModelSerializer):
     family = ChoiceField(choices=IPAddressFamilyChoices, read_only=True)
     rir = RIRSerializer(nested=True)
     tenant = TenantSerializer(nested=True, required=False, allow_null=True)
@@ -38,12 +52,12 @@ class AggregateSerializer(NetBoxModelSerializer):
         model = Aggregate
         fields = [
             'id', 'url', 'display_url', 'display', 'family', 'prefix', 'rir', 'tenant', 'date_added', 'description',
-            'comments', 'tags', 'custom_fields', 'created', 'last_updated',
+            'comments', 'tags', 'custom_fields', 'created', 'last_updated', 'utilization',
         ]
         brief_fields = ('id', 'url', 'display', 'family', 'prefix', 'description')
 
 
-class PrefixSerializer(NetBoxModelSerializer):
+class PrefixSerializer(UtilizationSerializerMixin, NetBoxModelSerializer):
     family = ChoiceField(choices=IPAddressFamilyChoices, read_only=True)
     site = SiteSerializer(nested=True, required=False, allow_null=True)
     vrf = VRFSerializer(nested=True, required=False, allow_null=True)
@@ -60,7 +74,7 @@ class PrefixSerializer(NetBoxModelSerializer):
         fields = [
             'id', 'url', 'display_url', 'display', 'family', 'prefix', 'site', 'vrf', 'tenant', 'vlan', 'status',
             'role', 'is_pool', 'mark_utilized', 'description', 'comments', 'tags', 'custom_fields',
-            'created', 'last_updated', 'children', '_depth',
+            'created', 'last_updated', 'children', '_depth', 'utilization',
         ]
         brief_fields = ('id', 'url', 'display', 'family', 'prefix', 'description', '_depth')
 
@@ -1,4 +1,5 @@
 from copy import deepcopy
+from itertools import islice
 
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.db import transaction
@@ -66,7 +67,18 @@ class RIRViewSet(NetBoxModelViewSet):
     filterset_class = filtersets.RIRFilterSet
 
 
-class AggregateViewSet(NetBoxModelViewSet):
+class UtilizationMixin:
+    """
+    Annotate the utilization of each object, unless the field has been excluded from the response (e.g. in brief mode).
+    """
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.requested_fields and 'utilization' not in self.requested_fields:
+            return queryset
+        return queryset.annotate_utilization()
+
+
+class AggregateViewSet(UtilizationMixin, NetBoxModelViewSet):
     queryset = Aggregate.objects.all()
     serializer_class = serializers.AggregateSerializer
     filterset_class = filtersets.AggregateFilterSet
@@ -78,7 +90,7 @@ class RoleViewSet(NetBoxModelViewSet):
     filterset_class = filtersets.RoleFilterSet
 
 
-class PrefixViewSet(NetBoxModelViewSet):
+class PrefixViewSet(UtilizationMixin, NetBoxModelViewSet):
     queryset = Prefix.objects.all()
     serializer_class = serializers.PrefixSerializer
     filterset_class = filtersets.PrefixFilterSet
@@ -379,13 +391,8 @@ class AvailableIPAddressesView(AvailableObjectsView):
     advisory_lock_key = 'available-ips'
 
     def get_available_objects(self, parent, limit=None):
-        # Calculate available IPs within the parent
-        ip_list = []
-        for index, ip in enumerate(parent.get_available_ips(), start=1):
-            ip_list.append(ip)
-            if index == limit:
-                break
-        return ip_list
+        # Calculate available IPs within the parent, stopping once the limit has been reached
+        return list(islice(parent.iter_available_ips(), limit or None))
 
     def get_extra_context(self, parent):
         return {
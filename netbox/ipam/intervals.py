@@ -0,0 +1,42 @@
+__all__ = (
+    'get_covered_size',
+    'iter_gaps',
+    'iter_integers',
+)
+
+
+def iter_gaps(first, last, intervals):
+    """
+    Yield each (first, last) interval between `first` and `last` (inclusive) which is not covered by any of the
+    specified intervals. Intervals must be sorted by their first value, but may overlap one another. Iteration over the
+    intervals stops as soon as `last` has been passed.
+    """
+    next_value = first
+    for start, end in intervals:
+        if next_value > last or start > last:
+            break
+        if end < next_value:
+            continue
+        if start > next_value:
+            yield next_value, start - 1
+        next_value = max(next_value, end + 1)
+
+    if next_value <= last:
+        yield next_value, last
+
+
+def iter_integers(gaps):
+    """
+    Yield every integer within an iterable of (first, last) intervals.
+    """
+    for first, last in gaps:
+        yield from range(first, last + 1)
+
+
+def get_covered_size(first, last, intervals):
+    """
+    Return the number of integers between `first` and `last` (inclusive) which are covered by at least one of the
+    specified intervals. Intervals must be sorted by their first value.
+    """
+    available = sum(gap_last - gap_first + 1 for gap_first, gap_last in iter_gaps(first, last, intervals))
+    return last - first + 1 - available
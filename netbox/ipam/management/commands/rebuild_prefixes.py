@@ -5,13 +5,13 @@ from ipam.utils import rebuild_prefixes
 
 
 class Command(BaseCommand):
-    help = "Rebuild the prefix hierarchy (depth and children counts)"
+    help = "Rebuild the prefix hierarchy (depth, children counts, and parent prefixes)"
 
     def handle(self, *model_names, **options):
         self.stdout.write(f'Rebuilding {Prefix.objects.count()} prefixes...')
 
         # Reset existing counts
-        Prefix.objects.update(_depth=0, _children=0)
+        Prefix.objects.update(_depth=0, _children=0, _parent=None)
 
         # Rebuild the global table
         global_count = Prefix.objects.filter(vrf__isnull=True).count()
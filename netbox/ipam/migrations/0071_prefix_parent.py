@@ -0,0 +1,59 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_prefix_parents(apps, schema_editor):
+    """
+    Assign each Prefix the most specific Prefix containing it (within the same VRF) as its parent.
+    """
+    Prefix = apps.get_model('ipam', 'Prefix')
+
+    update_queue = []
+    for vrf_id in Prefix.objects.values_list('vrf_id', flat=True).distinct():
+        stack = []
+        for pk, prefix in Prefix.objects.filter(vrf_id=vrf_id).order_by('prefix', 'pk').values_list('pk', 'prefix'):
+
+            # Pop nodes from the stack until we reach a prefix which contains (or duplicates) this one
+            while stack and prefix not in stack[-1]['prefix']:
+                stack.pop()
+
+            # Duplicate prefixes share the same parent
+            if stack and prefix == stack[-1]['prefix']:
+                parent_id = stack[-1]['parent_id']
+            else:
+                parent_id = stack[-1]['pk'] if stack else None
+                stack.append({'pk': pk, 'prefix': prefix, 'parent_id': parent_id})
+
+            if parent_id is not None:
+                update_queue.append(Prefix(pk=pk, _parent_id=parent_id))
+            if len(update_queue) >= 100:
+                Prefix.objects.bulk_update(update_queue, ['_parent'])
+                update_queue = []
+
+    Prefix.objects.bulk_update(update_queue, ['_parent'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipam', '0070_vlangroup_vlan_id_ranges'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prefix',
+            name='_parent',
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='+',
+                to='ipam.prefix'
+            ),
+        ),
+        migrations.RunPython(
+            code=populate_prefix_parents,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -1,3 +1,5 @@
+import heapq
+
 import netaddr
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.core.exceptions import ValidationError
@@ -12,9 +14,10 @@ from core.models import ObjectType
 from ipam.choices import *
 from ipam.constants import *
 from ipam.fields import IPNetworkField, IPAddressField
-from ipam.lookups import Host
+from ipam.intervals import get_covered_size, iter_gaps, iter_integers
+from ipam.lookups import Host, Inet
 from ipam.managers import IPAddressManager
-from ipam.querysets import PrefixQuerySet
+from ipam.querysets import AggregateQuerySet, PrefixQuerySet
 from ipam.validators import DNSValidator
 from netbox.config import get_config
 from netbox.models import OrganizationalModel, PrimaryModel
@@ -103,6 +106,8 @@ class Aggregate(ContactsMixin, GetAvailablePrefixesMixin, PrimaryModel):
         null=True
     )
 
+    objects = AggregateQuerySet.as_manager()
+
     clone_fields = (
         'rir', 'tenant', 'date_added', 'description',
     )
@@ -281,6 +286,14 @@ class Prefix(ContactsMixin, GetAvailablePrefixesMixin, PrimaryModel):
         default=0,
         editable=False
     )
+    _parent = models.ForeignKey(
+        to='self',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True,
+        editable=False
+    )
 
     objects = PrefixQuerySet.as_manager()
 
@@ -354,6 +367,10 @@ class Prefix(ContactsMixin, GetAvailablePrefixesMixin, PrimaryModel):
     def children(self):
         return self._children
 
+    @property
+    def parent(self):
+        return self._parent
+
     def _set_prefix_length(self, value):
         """
         Expose the IPNetwork object's prefixlen attribute on the parent model so that it can be manipulated directly,
@@ -419,6 +436,39 @@ class Prefix(ContactsMixin, GetAvailablePrefixesMixin, PrimaryModel):
         else:
             return IPAddress.objects.filter(address__net_host_contained=str(self.prefix), vrf=self.vrf)
 
+    def get_used_intervals(self):
+        """
+        Return an iterator of (first, last) integer bounds for all child IPAddresses and IPRanges, ordered by first
+        address. Child IP addresses are streamed from the database as the iterator is consumed.
+        """
+        # Order by host address, ignoring masks
+        child_ips = (
+            (int(address.ip), int(address.ip)) for address in self.get_child_ips().order_by(
+                Inet(Host('address'))
+            ).values_list('address', flat=True).iterator(chunk_size=2000)
+        )
+        child_ranges = sorted(
+            (int(start_address.ip), int(end_address.ip))
+            for start_address, end_address in self.get_child_ranges().values_list('start_address', 'end_address')
+        )
+        return heapq.merge(child_ips, child_ranges)
+
+    def _get_usable_bounds(self):
+        """
+        Return the first and last usable IPs within the prefix, as integers.
+        """
+        # IPv6 /127's, pool, or IPv4 /31-/32 sets are fully usable
+        if (self.family == 6 and self.prefix.prefixlen >= 127) or self.is_pool or (self.family == 4 and self.prefix.prefixlen >= 31):
+            return self.prefix.first, self.prefix.last
+
+        if self.family == 4:
+            # For "normal" IPv4 prefixes, omit first and last addresses
+            return self.prefix.first + 1, self.prefix.last - 1
+
+        # For IPv6 prefixes, omit the Subnet-Router anycast address
+        # per RFC 4291
+        return self.prefix.first + 1, self.prefix.last
+
     def get_available_ips(self):
         """
         Return all available IPs within this prefix as an IPSet.
@@ -426,37 +476,29 @@ class Prefix(ContactsMixin, GetAvailablePrefixesMixin, PrimaryModel):
         if self.mark_utilized:
             return netaddr.IPSet()
 
-        prefix = netaddr.IPSet(self.prefix)
-        child_ips = netaddr.IPSet([ip.address.ip for ip in self.get_child_ips()])
-        child_ranges = []
-        for iprange in self.get_child_ranges():
-            child_ranges.append(iprange.range)
-        available_ips = prefix - child_ips - netaddr.IPSet(child_ranges)
+        first, last = self._get_usable_bounds()
+        return netaddr.IPSet([
+            netaddr.IPRange(netaddr.IPAddress(start, self.family), netaddr.IPAddress(end, self.family))
+            for start, end in iter_gaps(first, last, self.get_used_intervals())
+        ])
 
-        # IPv6 /127's, pool, or IPv4 /31-/32 sets are fully usable
-        if (self.family == 6 and self.prefix.prefixlen >= 127) or self.is_pool or (self.family == 4 and self.prefix.prefixlen >= 31):
-            return available_ips
+    def iter_available_ips(self):
+        """
+        Yield each available IP within this prefix in order, without computing the entire set of available IPs.
+        """
+        if self.mark_utilized:
+            return
 
-        if self.family == 4:
-            # For "normal" IPv4 prefixes, omit first and last addresses
-            available_ips -= netaddr.IPSet([
-                netaddr.IPAddress(self.prefix.first),
-                netaddr.IPAddress(self.prefix.last),
-            ])
-        else:
-            # For IPv6 prefixes, omit the Subnet-Router anycast address
-            # per RFC 4291
-            available_ips -= netaddr.IPSet([netaddr.IPAddress(self.prefix.first)])
-        return available_ips
+        first, last = self._get_usable_bounds()
+        for ip in iter_integers(iter_gaps(first, last, self.get_used_intervals())):
+            yield netaddr.IPAddress(ip, self.family)
 
     def get_first_available_ip(self):
         """
         Return the first available IP within the prefix (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
-            return None
-        return '{}/{}'.format(next(available_ips.__iter__()), self.prefix.prefixlen)
+        if (first_ip := next(self.iter_available_ips(), None)) is not None:
+            return '{}/{}'.format(first_ip, self.prefix.prefixlen)
 
     def get_utilization(self):
         """
@@ -470,19 +512,19 @@ class Prefix(ContactsMixin, GetAvailablePrefixesMixin, PrimaryModel):
             queryset = Prefix.objects.filter(
                 prefix__net_contained=str(self.prefix),
                 vrf=self.vrf
-            )
-            child_prefixes = netaddr.IPSet([p.prefix for p in queryset])
-            utilization = float(child_prefixes.size) / self.prefix.size * 100
+            ).values_list('prefix', flat=True)
+            child_prefixes = ((prefix.first, prefix.last) for prefix in queryset.iterator(chunk_size=2000))
+            utilization = float(
+                get_covered_size(self.prefix.first, self.prefix.last, child_prefixes)
+            ) / self.prefix.size * 100
         else:
-            # Compile an IPSet to avoid counting duplicate IPs
-            child_ips = netaddr.IPSet(
-                [_.range for _ in self.get_child_ranges()] + [_.address.ip for _ in self.get_child_ips()]
-            )
+            # Count each IP only once, even if covered by multiple child IPs and/or ranges
+            child_ips = get_covered_size(self.prefix.first, self.prefix.last, self.get_used_intervals())
 
             prefix_size = self.prefix.size
             if self.prefix.version == 4 and self.prefix.prefixlen < 31 and not self.is_pool:
                 prefix_size -= 2
-            utilization = float(child_ips.size) / prefix_size * 100
+            utilization = float(child_ips) / prefix_size * 100
 
         return min(utilization, 100)
 
@@ -660,25 +702,44 @@ class IPRange(ContactsMixin, PrimaryModel):
             vrf=self.vrf
         )
 
+    def get_used_intervals(self):
+        """
+        Return an iterator of (first, last) integer bounds for all child IPAddresses, ordered by address. Child IP
+        addresses are streamed from the database as the iterator is consumed.
+        """
+        # Order by host address, ignoring masks
+        return (
+            (int(address.ip), int(address.ip)) for address in self.get_child_ips().order_by(
+                Inet(Host('address'))
+            ).values_list('address', flat=True).iterator(chunk_size=2000)
+        )
+
     def get_available_ips(self):
         """
         Return all available IPs within this range as an IPSet.
         """
-        range = netaddr.IPRange(self.start_address.ip, self.end_address.ip)
-        child_ips = netaddr.IPSet([ip.address.ip for ip in self.get_child_ips()])
+        gaps = iter_gaps(int(self.start_address.ip), int(self.end_address.ip), self.get_used_intervals())
 
-        return netaddr.IPSet(range) - child_ips
+        return netaddr.IPSet([
+            netaddr.IPRange(netaddr.IPAddress(start, self.family), netaddr.IPAddress(end, self.family))
+            for start, end in gaps
+        ])
+
+    def iter_available_ips(self):
+        """
+        Yield each available IP within this range in order, without computing the entire set of available IPs.
+        """
+        gaps = iter_gaps(int(self.start_address.ip), int(self.end_address.ip), self.get_used_intervals())
+        for ip in iter_integers(gaps):
+            yield netaddr.IPAddress(ip, self.family)
 
     @cached_property
     def first_available_ip(self):
         """
         Return the first available IP within the range (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
-            return None
-
-        return '{}/{}'.format(next(available_ips.__iter__()), self.start_address.prefixlen)
+        if (first_ip := next(self.iter_available_ips(), None)) is not None:
+            return '{}/{}'.format(first_ip, self.start_address.prefixlen)
 
     @cached_property
     def utilization(self):
@@ -812,19 +873,18 @@ class IPAddress(ContactsMixin, PrimaryModel):
         Return the next available IP address within this IP's network (if any)
         """
         if self.address and self.address.broadcast:
-            start_ip = self.address.ip + 1
-            end_ip = self.address.broadcast - 1
-            if start_ip <= end_ip:
-                available_ips = netaddr.IPSet(netaddr.IPRange(start_ip, end_ip))
-                available_ips -= netaddr.IPSet([
-                    address.ip for address in IPAddress.objects.filter(
-                        vrf=self.vrf,
-                        address__gt=self.address,
-                        address__net_contained_or_equal=self.address.cidr
-                    ).values_list('address', flat=True)
-                ])
-                if available_ips:
-                    return next(iter(available_ips))
+            start_ip = int(self.address.ip) + 1
+            end_ip = int(self.address.broadcast) - 1
+            child_ips = (
+                (int(address.ip), int(address.ip)) for address in IPAddress.objects.filter(
+                    vrf=self.vrf,
+                    address__gt=self.address,
+                    address__net_contained_or_equal=self.address.cidr
+                ).values_list('address', flat=True).iterator(chunk_size=2000)
+            )
+            next_ip = next(iter_integers(iter_gaps(start_ip, end_ip, child_ips)), None)
+            if next_ip is not None:
+                return netaddr.IPAddress(next_ip, self.family)
 
     def get_related_ips(self):
         """
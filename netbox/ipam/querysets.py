@@ -1,5 +1,5 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models import Count, F, FloatField, OuterRef, Q, Subquery, Value
 from django.db.models.expressions import RawSQL
 from django.db.models.functions import Round
 
@@ -8,6 +8,7 @@ from utilities.querysets import RestrictedQuerySet
 
 __all__ = (
     'ASNRangeQuerySet',
+    'AggregateQuerySet',
     'PrefixQuerySet',
     'VLANGroupQuerySet',
     'VLANQuerySet',
@@ -32,6 +33,34 @@ class ASNRangeQuerySet(RestrictedQuerySet):
         return self.annotate(asn_count=Subquery(asns))
 
 
+def prefix_size_sql(column):
+    """
+    Return SQL for the number of IP addresses within a CIDR column, as a numeric value.
+    """
+    return f'POWER(2::numeric, (CASE FAMILY({column}) WHEN 4 THEN 32 ELSE 128 END) - MASKLEN({column}))'
+
+
+class AggregateQuerySet(RestrictedQuerySet):
+
+    def annotate_utilization(self):
+        """
+        Annotate the percentage of each Aggregate's IP space which is covered by Prefixes (in any VRF). Only the
+        outermost child Prefixes are counted, so that nested Prefixes do not inflate utilization.
+        """
+        return self.annotate(
+            utilization=RawSQL(
+                'SELECT CAST(LEAST(100, COALESCE(SUM(' + prefix_size_sql('U0."prefix"') + '), 0) * 100 / ' +
+                prefix_size_sql('"ipam_aggregate"."prefix"') + ') AS DOUBLE PRECISION) '
+                'FROM (SELECT DISTINCT U0."prefix" FROM "ipam_prefix" U0 '
+                'WHERE U0."prefix" <<= "ipam_aggregate"."prefix" '
+                'AND NOT EXISTS (SELECT 1 FROM "ipam_prefix" U1 '
+                'WHERE U1."prefix" >> U0."prefix" AND U1."prefix" <<= "ipam_aggregate"."prefix")) U0',
+                (),
+                output_field=FloatField()
+            )
+        )
+
+
 class PrefixQuerySet(RestrictedQuerySet):
 
     def annotate_hierarchy(self):
@@ -56,6 +85,59 @@ class PrefixQuerySet(RestrictedQuerySet):
             )
         )
 
+    def annotate_utilization(self):
+        """
+        Annotate the utilization of each Prefix as a percentage, equivalent to Prefix.get_utilization(). For
+        containers, this is the share of IP space covered by the outermost child Prefixes in the same VRF. For all
+        others, it is the number of distinct child IP addresses (excluding those within a child IP range) plus the
+        size of all child IP ranges. (IP ranges within a VRF may not overlap.)
+        """
+        from .choices import PrefixStatusChoices
+
+        vrf_match = 'COALESCE({}."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0)'
+        child_prefixes = (
+            'SELECT COALESCE(SUM(' + prefix_size_sql('U0."prefix"') + '), 0) '
+            'FROM (SELECT DISTINCT U0."prefix" FROM "ipam_prefix" U0 '
+            'WHERE U0."prefix" << "ipam_prefix"."prefix" AND ' + vrf_match.format('U0') + ' '
+            'AND NOT EXISTS (SELECT 1 FROM "ipam_prefix" U1 '
+            'WHERE U1."prefix" >> U0."prefix" AND U1."prefix" << "ipam_prefix"."prefix" '
+            'AND ' + vrf_match.format('U1') + ')) U0'
+        )
+        child_range_condition = (
+            vrf_match.format('{0}') + ' '
+            'AND CAST(HOST({0}."start_address") AS INET) <<= "ipam_prefix"."prefix" '
+            'AND CAST(HOST({0}."end_address") AS INET) <<= "ipam_prefix"."prefix"'
+        )
+        child_ips = (
+            'SELECT COUNT(DISTINCT CAST(HOST(U2."address") AS INET)) FROM "ipam_ipaddress" U2 '
+            'WHERE CAST(HOST(U2."address") AS INET) <<= "ipam_prefix"."prefix" AND ' + vrf_match.format('U2') + ' '
+            'AND NOT EXISTS (SELECT 1 FROM "ipam_iprange" U3 WHERE ' + child_range_condition.format('U3') + ' '
+            'AND CAST(HOST(U2."address") AS INET) BETWEEN CAST(HOST(U3."start_address") AS INET) '
+            'AND CAST(HOST(U3."end_address") AS INET))'
+        )
+        child_ranges = (
+            'SELECT COALESCE(SUM(U4."size"), 0) FROM "ipam_iprange" U4 WHERE ' + child_range_condition.format('U4')
+        )
+        # Omit the network and broadcast addresses for non-pool IPv4 prefixes larger than /31
+        usable_size = (
+            prefix_size_sql('"ipam_prefix"."prefix"') + ' - CASE WHEN FAMILY("ipam_prefix"."prefix") = 4 '
+            'AND MASKLEN("ipam_prefix"."prefix") < 31 AND NOT "ipam_prefix"."is_pool" THEN 2 ELSE 0 END'
+        )
+
+        return self.annotate(
+            utilization=RawSQL(
+                'CAST(CASE '
+                'WHEN "ipam_prefix"."mark_utilized" THEN 100 '
+                'WHEN "ipam_prefix"."status" = %s THEN LEAST(100, (' + child_prefixes + ') * 100 / ' +
+                prefix_size_sql('"ipam_prefix"."prefix"') + ') '
+                'ELSE LEAST(100, ((' + child_ips + ') + (' + child_ranges + ')) * 100 / '
+                'NULLIF(' + usable_size + ', 0)) '
+                'END AS DOUBLE PRECISION)',
+                (PrefixStatusChoices.STATUS_CONTAINER,),
+                output_field=FloatField()
+            )
+        )
+
 
 class VLANGroupQuerySet(RestrictedQuerySet):
 
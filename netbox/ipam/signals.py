@@ -1,29 +1,97 @@
+import netaddr
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
 from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from dcim.models import Device
 from virtualization.models import VirtualMachine
 from .models import IPAddress, Prefix
+from .utils import deferred_prefix_vrfs
 
 
-def update_parents_children(prefix):
+def get_ancestors(prefix, vrf_id, exclude_pk=None):
     """
-    Update depth on prefix & containing prefixes
+    Return the PKs and prefixes of all Prefixes containing the specified prefix within a VRF.
     """
-    parents = prefix.get_parents(include_self=True).annotate_hierarchy()
-    for parent in parents:
-        parent._children = parent.hierarchy_children
-    Prefix.objects.bulk_update(parents, ['_children'], batch_size=100)
+    return Prefix.objects.filter(vrf_id=vrf_id, prefix__net_contains=prefix).exclude(pk=exclude_pk).values_list(
+        'pk', 'prefix'
+    )
 
 
-def update_children_depth(prefix):
+def get_duplicate(prefix, vrf_id, exclude_pk=None):
     """
-    Update children count on prefix & contained prefixes
+    Return the PK of a Prefix identical to the specified prefix within a VRF (if any).
     """
-    children = prefix.get_children(include_self=True).annotate_hierarchy()
-    for child in children:
-        child._depth = child.hierarchy_depth
-    Prefix.objects.bulk_update(children, ['_depth'], batch_size=100)
+    return Prefix.objects.filter(vrf_id=vrf_id, prefix=prefix).exclude(pk=exclude_pk).values_list(
+        'pk', flat=True
+    ).first()
+
+
+def get_nearest(ancestors):
+    """
+    Return the PK of the most specific Prefix from a list of (pk, prefix) tuples.
+    """
+    if ancestors:
+        return max(ancestors, key=lambda a: (a[1].prefixlen, -a[0]))[0]
+
+
+def attach_prefix(instance):
+    """
+    Add a Prefix to the hierarchy at its current position. Only its own ancestors and descendants are updated.
+    """
+    prefix = netaddr.IPNetwork(str(instance.prefix))
+    ancestors = list(get_ancestors(prefix, instance.vrf_id, exclude_pk=instance.pk))
+    descendants = Prefix.objects.filter(
+        vrf_id=instance.vrf_id,
+        prefix__net_contained=prefix
+    ).exclude(pk=instance.pk)
+
+    # Increment the child count of each ancestor
+    Prefix.objects.filter(pk__in=[a[0] for a in ancestors]).update(_children=F('_children') + 1)
+
+    # If this prefix is not a duplicate, it introduces a new level to the hierarchy above its descendants and becomes
+    # the parent of any which were previously attached to one of its ancestors
+    if get_duplicate(prefix, instance.vrf_id, exclude_pk=instance.pk) is None:
+        descendants.update(_depth=F('_depth') + 1)
+        descendants.filter(
+            Q(_parent__isnull=True) | Q(_parent__in=[a[0] for a in ancestors])
+        ).update(_parent=instance.pk)
+
+    instance._depth = len({a[1] for a in ancestors})
+    instance._children = descendants.count()
+    instance._parent_id = get_nearest(ancestors)
+    Prefix.objects.filter(pk=instance.pk).update(
+        _depth=instance._depth,
+        _children=instance._children,
+        _parent=instance._parent_id
+    )
+
+
+def detach_prefix(pk, prefix, vrf_id):
+    """
+    Remove a Prefix from the hierarchy at the specified (previous) position. Only its former ancestors and descendants
+    are updated.
+    """
+    if prefix is None:
+        return
+    prefix = netaddr.IPNetwork(str(prefix))
+    ancestors = list(get_ancestors(prefix, vrf_id, exclude_pk=pk))
+    duplicate = get_duplicate(prefix, vrf_id, exclude_pk=pk)
+    descendants = Prefix.objects.filter(vrf_id=vrf_id, prefix__net_contained=prefix).exclude(pk=pk)
+
+    # Decrement the child count of each ancestor (never below zero, in case the existing counts are stale)
+    Prefix.objects.filter(pk__in=[a[0] for a in ancestors]).update(_children=Greatest(F('_children') - 1, 0))
+
+    # If no duplicate remains, the descendants of this prefix move up one level
+    if duplicate is None:
+        descendants.update(_depth=Greatest(F('_depth') - 1, 0))
+
+    # Reassign any children to the duplicate (if any) or to the nearest ancestor. Children of a deleted Prefix have
+    # already had their parent nullified.
+    Prefix.objects.filter(
+        Q(_parent=pk) | Q(pk__in=descendants.filter(_parent__isnull=True).values('pk'))
+    ).exclude(pk=pk).update(_parent=duplicate or get_nearest(ancestors))
 
 
 @receiver(post_save, sender=Prefix)
@@ -32,21 +100,30 @@ def handle_prefix_saved(instance, created, **kwargs):
     # Prefix has changed (or new instance has been created)
     if created or instance.vrf_id != instance._vrf_id or instance.prefix != instance._prefix:
 
-        update_parents_children(instance)
-        update_children_depth(instance)
+        # Defer to a single rebuild of each affected VRF if a bulk operation is in progress
+        if (vrfs := deferred_prefix_vrfs.get()) is not None:
+            vrfs.add(instance.vrf_id)
+            if not created:
+                vrfs.add(instance._vrf_id)
+
+        else:
+            # If this is not a new prefix, remove it from its previous position in the hierarchy
+            if not created:
+                detach_prefix(instance.pk, instance._prefix, instance._vrf_id)
+            attach_prefix(instance)
 
-        # If this is not a new prefix, clean up parent/children of previous prefix
-        if not created:
-            old_prefix = Prefix(vrf_id=instance._vrf_id, prefix=instance._prefix)
-            update_parents_children(old_prefix)
-            update_children_depth(old_prefix)
+        # Reset the cached prefix & VRF so that subsequent saves are not mistaken for changes
+        instance._prefix = instance.prefix
+        instance._vrf_id = instance.vrf_id
 
 
 @receiver(post_delete, sender=Prefix)
 def handle_prefix_deleted(instance, **kwargs):
 
-    update_parents_children(instance)
-    update_children_depth(instance)
+    if (vrfs := deferred_prefix_vrfs.get()) is not None:
+        vrfs.add(instance.vrf_id)
+    else:
+        detach_prefix(instance.pk, instance.prefix, instance.vrf_id)
 
 
 @receiver(pre_delete, sender=IPAddress)
@@ -76,6 +76,28 @@ VRF_LINK = """
 """
 
 
+class AnnotatedUtilizationColumn(columns.UtilizationColumn):
+    """
+    Display the utilization annotated by annotate_utilization(), calculating it for each record where the queryset
+    has not been annotated.
+    """
+    empty_values = ()
+
+    @staticmethod
+    def get_utilization(record, value):
+        if record.pk and not hasattr(record, 'utilization'):
+            return record.get_utilization()
+        return value
+
+    def render(self, record, table, value, bound_column, **kwargs):
+        value = self.get_utilization(record, value)
+        return super().render(record, table, value, bound_column, **kwargs)
+
+    def value(self, record, value):
+        if (value := self.get_utilization(record, value)) is not None:
+            return super().value(value)
+
+
 #
 # RIRs
 #
@@ -127,9 +149,8 @@ class AggregateTable(TenancyColumnsMixin, NetBoxTable):
     child_count = tables.Column(
         verbose_name=_('Prefixes')
     )
-    utilization = columns.UtilizationColumn(
+    utilization = AnnotatedUtilizationColumn(
         verbose_name=_('Utilization'),
-        accessor='get_utilization',
         orderable=False
     )
     comments = columns.MarkdownColumn(
@@ -192,9 +213,9 @@ class RoleTable(NetBoxTable):
 # Prefixes
 #
 
-class PrefixUtilizationColumn(columns.UtilizationColumn):
+class PrefixUtilizationColumn(AnnotatedUtilizationColumn):
     """
-    Extend UtilizationColumn to allow disabling the warning & danger thresholds for prefixes
+    Extend AnnotatedUtilizationColumn to allow disabling the warning & danger thresholds for prefixes
     marked as fully utilized.
     """
     template_code = """
@@ -268,7 +289,6 @@ class PrefixTable(TenancyColumnsMixin, NetBoxTable):
     )
     utilization = PrefixUtilizationColumn(
         verbose_name=_('Utilization'),
-        accessor='get_utilization',
         orderable=False
     )
     comments = columns.MarkdownColumn(
@@ -320,7 +340,7 @@ class IPRangeTable(TenancyColumnsMixin, NetBoxTable):
         verbose_name=_('Marked Utilized'),
         false_mark=None
     )
-    utilization = columns.UtilizationColumn(
+    utilization = AnnotatedUtilizationColumn(
         verbose_name=_('Utilization'),
         accessor='utilization',
         orderable=False
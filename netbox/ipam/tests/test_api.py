@@ -321,6 +321,21 @@ class AggregateTest(APIViewTestCases.APIViewTestCase):
             },
         ]
 
+    def test_create_object_utilization(self):
+        """
+        Test that the utilization of a newly created Aggregate is included in the response.
+        """
+        Prefix.objects.create(prefix=IPNetwork('103.0.0.0/9'))
+        self.add_permissions('ipam.add_aggregate')
+        data = {
+            'prefix': '103.0.0.0/8',
+            'rir': RIR.objects.first().pk,
+        }
+
+        response = self.client.post(self._get_list_url(), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['utilization'], 50)
+
 
 class RoleTest(APIViewTestCases.APIViewTestCase):
     model = Role
@@ -382,6 +397,21 @@ class PrefixTest(APIViewTestCases.APIViewTestCase):
         )
         Prefix.objects.bulk_create(prefixes)
 
+    def test_create_object_utilization(self):
+        """
+        Test that the utilization of a newly created Prefix is included in the response.
+        """
+        Prefix.objects.create(prefix=IPNetwork('192.168.4.0/25'))
+        self.add_permissions('ipam.add_prefix')
+        data = {
+            'prefix': '192.168.4.0/24',
+            'status': PrefixStatusChoices.STATUS_CONTAINER,
+        }
+
+        response = self.client.post(self._get_list_url(), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['utilization'], 50)
+
     def test_list_available_prefixes(self):
         """
         Test retrieval of all available prefixes within a parent prefix.
@@ -5,6 +5,7 @@ from utilities.data import string_to_ranges
 
 from ipam.choices import *
 from ipam.models import *
+from ipam.utils import deferred_prefix_hierarchy, rebuild_prefixes
 
 
 class TestAggregate(TestCase):
@@ -35,6 +36,20 @@ class TestAggregate(TestCase):
         ))
         self.assertEqual(aggregate.get_utilization(), 100)
 
+    def test_annotate_utilization(self):
+        rir = RIR.objects.create(name='RIR 1', slug='rir-1')
+        aggregate = Aggregate.objects.create(prefix=IPNetwork('10.0.0.0/8'), rir=rir)
+
+        # 50% utilization (including nested & duplicate prefixes)
+        Prefix.objects.bulk_create((
+            Prefix(prefix=IPNetwork('10.0.0.0/9')),
+            Prefix(prefix=IPNetwork('10.0.0.0/10')),
+            Prefix(prefix=IPNetwork('10.0.0.0/9')),
+        ))
+        aggregate = Aggregate.objects.annotate_utilization().get(pk=aggregate.pk)
+        self.assertEqual(aggregate.utilization, aggregate.get_utilization())
+        self.assertEqual(aggregate.utilization, 50)
+
 
 class TestIPRange(TestCase):
 
@@ -202,6 +217,24 @@ class TestPrefix(TestCase):
         Prefix.objects.create(prefix=IPNetwork('10.0.3.0/24'))
         self.assertEqual(prefixes[0].get_first_available_prefix(), IPNetwork('10.0.4.0/22'))
 
+    def test_iter_available_ips(self):
+
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/24'))
+        IPAddress.objects.bulk_create((
+            IPAddress(address=IPNetwork('10.0.0.1/24')),
+            IPAddress(address=IPNetwork('10.0.0.3/26')),
+            IPAddress(address=IPNetwork('10.0.0.3/24')),  # Duplicate
+        ))
+        IPRange.objects.create(
+            start_address=IPNetwork('10.0.0.4/24'),
+            end_address=IPNetwork('10.0.0.9/24')
+        )
+        available_ips = parent_prefix.iter_available_ips()
+
+        self.assertEqual(str(next(available_ips)), '10.0.0.2')
+        self.assertEqual(str(next(available_ips)), '10.0.0.10')
+        self.assertEqual(len(list(available_ips)), 244)  # 10.0.0.11 - 10.0.0.254
+
     def test_get_first_available_ip(self):
 
         parent_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/24'))
@@ -215,6 +248,33 @@ class TestPrefix(TestCase):
         IPAddress.objects.create(address=IPNetwork('10.0.0.4/24'))
         self.assertEqual(parent_prefix.get_first_available_ip(), '10.0.0.5/24')
 
+    def test_get_first_available_ip_mixed_masks(self):
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/24'))
+        IPAddress.objects.bulk_create((
+            IPAddress(address=IPNetwork('10.0.0.2/24')),
+            IPAddress(address=IPNetwork('10.0.0.1/32')),
+            IPAddress(address=IPNetwork('10.0.0.4/24')),
+            IPAddress(address=IPNetwork('10.0.0.3/32')),
+        ))
+        self.assertEqual(parent_prefix.get_first_available_ip(), '10.0.0.5/24')
+        self.assertEqual(parent_prefix.get_utilization(), 4 / 254 * 100)
+
+        iprange = IPRange.objects.create(
+            start_address=IPNetwork('10.0.0.1/24'),
+            end_address=IPNetwork('10.0.0.9/24')
+        )
+        self.assertEqual(iprange.first_available_ip, '10.0.0.5/24')
+
+    def test_get_first_available_ip_zero(self):
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('0.0.0.0/31'))
+        self.assertEqual(parent_prefix.get_first_available_ip(), '0.0.0.0/31')
+
+        iprange = IPRange.objects.create(
+            start_address=IPNetwork('0.0.0.0/24'),
+            end_address=IPNetwork('0.0.0.9/24')
+        )
+        self.assertEqual(iprange.first_available_ip, '0.0.0.0/24')
+
     def test_get_first_available_ip_ipv6(self):
         parent_prefix = Prefix.objects.create(prefix=IPNetwork('2001:db8:500::/64'))
         self.assertEqual(parent_prefix.get_first_available_ip(), '2001:db8:500::1/64')
@@ -236,6 +296,23 @@ class TestPrefix(TestCase):
         Prefix.objects.bulk_create(prefixes)
         self.assertEqual(prefixes[0].get_utilization(), 50)  # 50% utilization
 
+    def test_annotate_utilization(self):
+        prefixes = Prefix.objects.bulk_create((
+            Prefix(prefix=IPNetwork('10.0.0.0/24'), status=PrefixStatusChoices.STATUS_CONTAINER),
+            Prefix(prefix=IPNetwork('10.0.0.0/26')),
+            Prefix(prefix=IPNetwork('10.0.0.0/27')),
+            Prefix(prefix=IPNetwork('10.0.0.128/26'), mark_utilized=True),
+        ))
+        IPAddress.objects.bulk_create((
+            IPAddress(address=IPNetwork('10.0.0.1/26')),
+            IPAddress(address=IPNetwork('10.0.0.1/24')),  # Duplicate
+            IPAddress(address=IPNetwork('10.0.0.10/26')),  # Within child range
+        ))
+        IPRange.objects.create(start_address=IPNetwork('10.0.0.9/26'), end_address=IPNetwork('10.0.0.12/26'))
+
+        for prefix in Prefix.objects.filter(pk__in=[p.pk for p in prefixes]).annotate_utilization():
+            self.assertAlmostEqual(prefix.utilization, prefix.get_utilization())
+
     def test_get_utilization_noncontainer(self):
         prefix = Prefix.objects.create(
             prefix=IPNetwork('10.0.0.0/24'),
@@ -477,6 +554,52 @@ class TestPrefixHierarchy(TestCase):
         self.assertEqual(prefixes[3]._depth, 2)
         self.assertEqual(prefixes[3]._children, 0)
 
+    def test_parent_prefix(self):
+        rebuild_prefixes(None)
+        prefixes = {str(p.prefix): p for p in Prefix.objects.filter(prefix__family=4)}
+        self.assertIsNone(prefixes['10.0.0.0/8']._parent_id)
+        self.assertEqual(prefixes['10.0.0.0/16']._parent_id, prefixes['10.0.0.0/8'].pk)
+        self.assertEqual(prefixes['10.0.0.0/24']._parent_id, prefixes['10.0.0.0/16'].pk)
+
+        # Create 10.0.0.0/12
+        prefix = Prefix(prefix='10.0.0.0/12')
+        prefix.save()
+        prefixes = {str(p.prefix): p for p in Prefix.objects.filter(prefix__family=4)}
+        self.assertEqual(prefixes['10.0.0.0/12']._parent_id, prefixes['10.0.0.0/8'].pk)
+        self.assertEqual(prefixes['10.0.0.0/16']._parent_id, prefix.pk)
+        self.assertEqual(prefixes['10.0.0.0/24']._parent_id, prefixes['10.0.0.0/16'].pk)
+
+        # Delete 10.0.0.0/16
+        prefixes['10.0.0.0/16'].delete()
+        self.assertEqual(Prefix.objects.get(prefix='10.0.0.0/24')._parent_id, prefix.pk)
+
+        # Move 10.0.0.0/12 to 10.1.0.0/16
+        prefix.prefix = '10.1.0.0/16'
+        prefix.save()
+        self.assertEqual(Prefix.objects.get(prefix='10.0.0.0/24')._parent_id, prefixes['10.0.0.0/8'].pk)
+        self.assertEqual(Prefix.objects.get(pk=prefix.pk)._parent_id, prefixes['10.0.0.0/8'].pk)
+
+    def test_deferred_hierarchy(self):
+        with deferred_prefix_hierarchy():
+            Prefix(prefix='10.0.0.0/12').save()
+            Prefix.objects.get(prefix='10.0.0.0/16').delete()
+
+            # Hierarchy maintenance has been deferred
+            self.assertEqual(Prefix.objects.get(prefix='10.0.0.0/12')._depth, 0)
+
+        prefixes = Prefix.objects.filter(prefix__family=4)
+        self.assertEqual(prefixes[0].prefix, IPNetwork('10.0.0.0/8'))
+        self.assertEqual(prefixes[0]._depth, 0)
+        self.assertEqual(prefixes[0]._children, 2)
+        self.assertEqual(prefixes[1].prefix, IPNetwork('10.0.0.0/12'))
+        self.assertEqual(prefixes[1]._depth, 1)
+        self.assertEqual(prefixes[1]._children, 1)
+        self.assertEqual(prefixes[1]._parent_id, prefixes[0].pk)
+        self.assertEqual(prefixes[2].prefix, IPNetwork('10.0.0.0/24'))
+        self.assertEqual(prefixes[2]._depth, 2)
+        self.assertEqual(prefixes[2]._children, 0)
+        self.assertEqual(prefixes[2]._parent_id, prefixes[1].pk)
+
 
 class TestIPAddress(TestCase):
 
@@ -1,5 +1,9 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 import netaddr
 
+from netbox.utils import register_bulk_operation_processor
 from .constants import *
 from .models import Prefix, VLAN
 
@@ -7,10 +11,14 @@ __all__ = (
     'add_available_ipaddresses',
     'add_available_vlans',
     'add_requested_prefixes',
+    'deferred_prefix_hierarchy',
     'get_next_available_prefix',
     'rebuild_prefixes',
 )
 
+# The set of VRF IDs (None for the global table) in which the prefix hierarchy must be rebuilt, if deferred
+deferred_prefix_vrfs = ContextVar('deferred_prefix_vrfs', default=None)
+
 
 def add_requested_prefixes(parent, prefix_list, show_available=True, show_assigned=True):
     """
@@ -150,7 +158,8 @@ def add_available_vlans(vlans, vlan_group):
 
 def rebuild_prefixes(vrf):
     """
-    Rebuild the prefix hierarchy for all prefixes in the specified VRF (or global table).
+    Rebuild the prefix hierarchy for all prefixes in the specified VRF (or global table). Each Prefix is assigned the
+    most specific Prefix containing it as its parent; duplicate Prefixes share the same parent.
     """
     def contains(parent, child):
         return child in parent and child != parent
@@ -162,6 +171,7 @@ def rebuild_prefixes(vrf):
         stack.append({
             'pk': [prefix['pk']],
             'prefix': prefix['prefix'],
+            'parent': stack[-1]['pk'][0] if stack else None,
             'children': 0,
         })
 
@@ -187,13 +197,13 @@ def rebuild_prefixes(vrf):
                 node = stack.pop()
                 for pk in node['pk']:
                     update_queue.append(
-                        Prefix(pk=pk, _depth=len(stack), _children=node['children'])
+                        Prefix(pk=pk, _depth=len(stack), _children=node['children'], _parent_id=node['parent'])
                     )
             push_to_stack(p)
 
         # Flush the update queue once it reaches 100 Prefixes
         if len(update_queue) >= 100:
-            Prefix.objects.bulk_update(update_queue, ['_depth', '_children'])
+            Prefix.objects.bulk_update(update_queue, ['_depth', '_children', '_parent'])
             update_queue = []
 
     # Clear out any prefixes remaining in the stack
@@ -201,11 +211,34 @@ def rebuild_prefixes(vrf):
         node = stack.pop()
         for pk in node['pk']:
             update_queue.append(
-                Prefix(pk=pk, _depth=len(stack), _children=node['children'])
+                Prefix(pk=pk, _depth=len(stack), _children=node['children'], _parent_id=node['parent'])
             )
 
     # Final flush of any remaining Prefixes
-    Prefix.objects.bulk_update(update_queue, ['_depth', '_children'])
+    Prefix.objects.bulk_update(update_queue, ['_depth', '_children', '_parent'])
+
+
+@register_bulk_operation_processor
+@contextmanager
+def deferred_prefix_hierarchy():
+    """
+    Defer maintenance of the prefix hierarchy until the end of the block, then rebuild it once for each VRF in which a
+    Prefix has been created, modified, or deleted. Nested blocks defer to the outermost one. The hierarchy is not
+    rebuilt if an exception is raised, as the enclosing transaction is expected to be rolled back.
+    """
+    if deferred_prefix_vrfs.get() is not None:
+        yield
+        return
+
+    token = deferred_prefix_vrfs.set(set())
+    try:
+        yield
+        vrfs = deferred_prefix_vrfs.get()
+    finally:
+        deferred_prefix_vrfs.reset(token)
+
+    for vrf in vrfs:
+        rebuild_prefixes(vrf)
 
 
 def get_next_available_prefix(ipset, prefix_size):
@@ -323,7 +323,7 @@ class ASNBulkDeleteView(generic.BulkDeleteView):
 class AggregateListView(generic.ObjectListView):
     queryset = Aggregate.objects.annotate(
         child_count=RawSQL('SELECT COUNT(*) FROM ipam_prefix WHERE ipam_prefix.prefix <<= ipam_aggregate.prefix', ())
-    )
+    ).annotate_utilization()
     filterset = filtersets.AggregateFilterSet
     filterset_form = forms.AggregateFilterForm
     table = tables.AggregateTable
@@ -352,7 +352,7 @@ class AggregatePrefixesView(generic.ObjectChildrenView):
     def get_children(self, request, parent):
         return Prefix.objects.restrict(request.user, 'view').filter(
             prefix__net_contained_or_equal=str(parent.prefix)
-        ).prefetch_related('site', 'role', 'tenant', 'tenant__group', 'vlan')
+        ).prefetch_related('site', 'role', 'tenant', 'tenant__group', 'vlan').annotate_utilization()
 
     def prep_table_data(self, request, queryset, parent):
         # Determine whether to show assigned prefixes, available prefixes, or both
@@ -389,7 +389,7 @@ class AggregateBulkImportView(generic.BulkImportView):
 class AggregateBulkEditView(generic.BulkEditView):
     queryset = Aggregate.objects.annotate(
         child_count=RawSQL('SELECT COUNT(*) FROM ipam_prefix WHERE ipam_prefix.prefix <<= ipam_aggregate.prefix', ())
-    )
+    ).annotate_utilization()
     filterset = filtersets.AggregateFilterSet
     table = tables.AggregateTable
     form = forms.AggregateBulkEditForm
@@ -398,7 +398,7 @@ class AggregateBulkEditView(generic.BulkEditView):
 class AggregateBulkDeleteView(generic.BulkDeleteView):
     queryset = Aggregate.objects.annotate(
         child_count=RawSQL('SELECT COUNT(*) FROM ipam_prefix WHERE ipam_prefix.prefix <<= ipam_aggregate.prefix', ())
-    )
+    ).annotate_utilization()
     filterset = filtersets.AggregateFilterSet
     table = tables.AggregateTable
 
@@ -467,7 +467,7 @@ class RoleBulkDeleteView(generic.BulkDeleteView):
 #
 
 class PrefixListView(generic.ObjectListView):
-    queryset = Prefix.objects.all()
+    queryset = Prefix.objects.annotate_utilization()
     filterset = filtersets.PrefixFilterSet
     filterset_form = forms.PrefixFilterForm
     table = tables.PrefixTable
@@ -539,7 +539,7 @@ class PrefixPrefixesView(generic.ObjectChildrenView):
     def get_children(self, request, parent):
         return parent.get_child_prefixes().restrict(request.user, 'view').prefetch_related(
             'site', 'vrf', 'vlan', 'role', 'tenant', 'tenant__group'
-        )
+        ).annotate_utilization()
 
     def prep_table_data(self, request, queryset, parent):
         # Determine whether to show assigned prefixes, available prefixes, or both
@@ -631,14 +631,14 @@ class PrefixBulkImportView(generic.BulkImportView):
 
 
 class PrefixBulkEditView(generic.BulkEditView):
-    queryset = Prefix.objects.prefetch_related('vrf__tenant')
+    queryset = Prefix.objects.prefetch_related('vrf__tenant').annotate_utilization()
     filterset = filtersets.PrefixFilterSet
     table = tables.PrefixTable
     form = forms.PrefixBulkEditForm
 
 
 class PrefixBulkDeleteView(generic.BulkDeleteView):
-    queryset = Prefix.objects.prefetch_related('vrf__tenant')
+    queryset = Prefix.objects.prefetch_related('vrf__tenant').annotate_utilization()
     filterset = filtersets.PrefixFilterSet
     table = tables.PrefixTable
 
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from netbox.choices import CSVDelimiterChoices, ImportFormatChoices
 from .base import *
 from .features import *
 from .generic import *
@@ -26,3 +27,9 @@ class NestedGroupModelSerializer(NetBoxModelSerializer):
 
 class BulkOperationSerializer(serializers.Serializer):
     id = serializers.IntegerField()
+
+
+class BulkImportSerializer(serializers.Serializer):
+    data = serializers.CharField(trim_whitespace=False)
+    format = serializers.ChoiceField(choices=ImportFormatChoices, default=ImportFormatChoices.AUTO)
+    csv_delimiter = serializers.ChoiceField(choices=CSVDelimiterChoices, default=CSVDelimiterChoices.AUTO)
@@ -1,4 +1,5 @@
 import logging
+from contextlib import nullcontext
 from functools import cached_property
 
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
@@ -8,9 +9,12 @@ from django_pglocks import advisory_lock
 from netbox.constants import ADVISORY_LOCK_KEYS
 from rest_framework import mixins as drf_mixins
 from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
 from rest_framework.viewsets import GenericViewSet
 
+from netbox.utils import bulk_operation
 from utilities.api import get_annotations_for_serializer, get_prefetches_for_serializer
+from utilities.counters import deferred_counter_updates
 from utilities.exceptions import AbortRequest
 from . import mixins
 
@@ -96,6 +100,7 @@ class NetBoxReadOnlyModelViewSet(
 
 
 class NetBoxModelViewSet(
+    mixins.BulkImportMixin,
     mixins.BulkUpdateModelMixin,
     mixins.BulkDestroyModelMixin,
     mixins.ObjectValidationMixin,
@@ -109,7 +114,7 @@ class NetBoxModelViewSet(
     BaseViewSet
 ):
     """
-    Extend DRF's ModelViewSet to support bulk update and delete functions.
+    Extend DRF's ModelViewSet to support bulk import, update, and delete functions.
     """
     def get_object_with_snapshot(self):
         """
@@ -163,9 +168,12 @@ class NetBoxModelViewSet(
         logger = logging.getLogger(f'netbox.api.views.{self.__class__.__name__}')
         logger.info(f"Creating new {model._meta.verbose_name}")
 
+        # Apply any bulk operation processors when creating multiple objects at once
+        processors = bulk_operation() if isinstance(serializer, ListSerializer) else nullcontext()
+
         # Enforce object-level permissions on save()
         try:
-            with transaction.atomic():
+            with transaction.atomic(), processors:
                 instance = serializer.save()
                 self._validate_objects(instance)
         except ObjectDoesNotExist:
@@ -203,7 +211,9 @@ class NetBoxModelViewSet(
         logger = logging.getLogger(f'netbox.api.views.{self.__class__.__name__}')
         logger.info(f"Deleting {model._meta.verbose_name} {instance} (PK: {instance.pk})")
 
-        return super().perform_destroy(instance)
+        # Apply the changes to counters made by the deletion of any dependent objects together
+        with transaction.atomic(), deferred_counter_updates():
+            return super().perform_destroy(instance)
 
 
 class MPTTLockedMixin:
@@ -223,3 +233,7 @@ class MPTTLockedMixin:
     def destroy(self, request, *args, **kwargs):
         with advisory_lock(ADVISORY_LOCK_KEYS[self.queryset.model._meta.model_name]):
             return super().destroy(request, *args, **kwargs)
+
+    def perform_bulk_import(self, view, form, request):
+        with advisory_lock(ADVISORY_LOCK_KEYS[self.queryset.model._meta.model_name]):
+            return super().perform_bulk_import(view, form, request)
@@ -1,15 +1,25 @@
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db import transaction
 from django.http import Http404
-from rest_framework import status
+from django.utils.translation import gettext as _
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 
 from core.models import ObjectType
-from extras.models import ExportTemplate
-from netbox.api.serializers import BulkOperationSerializer
+from core.signals import clear_events
+from extras.metadata import metadata_cache
+from netbox.api.serializers import BulkImportSerializer, BulkOperationSerializer
+from netbox.bulk_import import get_import_view
+from netbox.utils import bulk_operation
+from utilities.exceptions import AbortRequest, AbortTransaction, PermissionsViolation
+from utilities.forms.bulk_import import BulkImportForm
 
 __all__ = (
     'BulkDestroyModelMixin',
+    'BulkImportMixin',
     'BulkUpdateModelMixin',
     'CustomFieldsMixin',
     'ExportTemplatesMixin',
@@ -40,8 +50,8 @@ class ExportTemplatesMixin:
     """
     def list(self, request, *args, **kwargs):
         if 'export' in request.GET:
-            object_type = ObjectType.objects.get_for_model(self.get_serializer_class().Meta.model)
-            et = ExportTemplate.objects.filter(object_types=object_type, name=request.GET['export']).first()
+            export_templates = metadata_cache.get_export_templates(self.get_serializer_class().Meta.model)
+            et = next((et for et in export_templates if et.name == request.GET['export']), None)
             if et is None:
                 raise Http404
             queryset = self.filter_queryset(self.get_queryset())
@@ -113,7 +123,7 @@ class BulkUpdateModelMixin:
         return Response(data, status=status.HTTP_200_OK)
 
     def perform_bulk_update(self, objects, update_data, partial):
-        with transaction.atomic():
+        with transaction.atomic(), bulk_operation():
             data_list = []
             for obj in objects:
                 data = update_data.get(obj.id)
@@ -157,13 +167,65 @@ class BulkDestroyModelMixin:
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def perform_bulk_destroy(self, objects):
-        with transaction.atomic():
+        with transaction.atomic(), bulk_operation():
             for obj in objects:
                 if hasattr(obj, 'snapshot'):
                     obj.snapshot()
                 self.perform_destroy(obj)
 
 
+class BulkImportMixin:
+    """
+    Support the creation and modification of objects in bulk from CSV, JSON, or YAML data, as performed by the UI's
+    bulk import view for a model. Accepts a POST request to the `import/` endpoint for a model. For example:
+
+    POST /api/dcim/sites/import/
+    {
+        "data": "name,slug,status\nSite 1,site-1,active\nSite 2,site-2,planned",
+        "format": "csv"
+    }
+    """
+    @extend_schema(request=BulkImportSerializer)
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request, *args, **kwargs):
+        serializer = BulkImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        if (import_view := get_import_view(self.queryset.model)) is None:
+            raise AbortRequest(_("Bulk import is not supported for this object type."))
+        view = import_view()
+        view.setup(request)
+        view.queryset = self.queryset
+
+        form = BulkImportForm(data=serializer.validated_data)
+        if form.is_valid():
+            try:
+                objects = self.perform_bulk_import(view, form, request)
+            except (AbortTransaction, ValidationError) as e:
+                clear_events.send(sender=self)
+                # Errors are normally recorded on the form; any other failure is unexpected
+                if not form.errors:
+                    if isinstance(e, ValidationError):
+                        raise serializers.ValidationError(e.messages)
+                    raise
+            except PermissionsViolation:
+                clear_events.send(sender=self)
+                raise PermissionDenied()
+        if form.errors:
+            raise serializers.ValidationError({
+                'non_field_errors' if field == '__all__' else field: errors for field, errors in form.errors.items()
+            })
+
+        queryset = self.get_queryset().filter(pk__in=[obj.pk for obj in objects])
+        data = self.get_serializer(queryset, many=True).data
+
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def perform_bulk_import(self, view, form, request):
+        with transaction.atomic(), bulk_operation():
+            return view.create_and_update_objects(form, request)
+
+
 class ObjectValidationMixin:
 
     def _validate_objects(self, instance):
@@ -0,0 +1,384 @@
+"""
+The engine used to create and update objects in bulk from imported data. Given a set of records (as parsed from CSV,
+JSON, or YAML data by BulkImportForm), it:
+
+  * Resolves the objects referenced by each foreign key column once for the entire set of records
+  * Validates records in batches, using the model form defined for the import
+  * Writes each batch of objects using bulk_create() and bulk_update(), where the model permits, and then repeats
+    model validation for the batch to detect any conflicts between its records
+
+The pre_save and post_save signals are sent for each object written in bulk, so change logging, search caching, and
+counter updates proceed as they would otherwise. Call run() within a bulk_operation() block to defer their work until
+the import has completed.
+"""
+from django import forms
+from django.core.exceptions import EmptyResultSet, FieldError, ValidationError
+from django.db import IntegrityError, models, router, transaction
+from django.db.models.signals import post_save, pre_save
+from django.urls import NoReverseMatch, resolve, reverse
+from django.utils.translation import gettext as _
+
+from extras.choices import CustomFieldUIEditableChoices
+from extras.metadata import metadata_cache
+from utilities.exceptions import PermissionsViolation
+from utilities.forms import restrict_form_fields
+from utilities.forms.fields import CSVContentTypeField, CSVModelChoiceField
+from utilities.querysets import RestrictedQuerySet
+from utilities.tracking import TrackingModelMixin
+from utilities.views import get_viewname
+
+__all__ = (
+    'BULK_IMPORT_BATCH_SIZE',
+    'BulkImporter',
+    'get_import_view',
+    'supports_bulk_write',
+)
+
+# The maximum number of records to validate and write to the database at once
+BULK_IMPORT_BATCH_SIZE = 500
+
+# The maximum number of values to look up per query when resolving related objects
+LOOKUP_CHUNK_SIZE = 10000
+
+
+def supports_bulk_write(model_form):
+    """
+    Return True if objects saved using the given model form can be written to the database in bulk: that is, neither
+    the form nor the model implements any custom logic when saving an object.
+    """
+    if model_form.save is not forms.BaseModelForm.save:
+        return False
+
+    model = model_form._meta.model
+    if model._meta.parents:
+        return False
+    for cls in model.__mro__:
+        if cls is models.Model:
+            break
+        # TrackingModelMixin only clears its tracker once the object has been saved
+        if 'save' in cls.__dict__ and cls is not TrackingModelMixin:
+            return False
+
+    return True
+
+
+def get_import_view(model):
+    """
+    Return the BulkImportView class registered for the given model, or None if the model does not support imports.
+    """
+    try:
+        return resolve(reverse(get_viewname(model, action='import'))).func.view_class
+    except NoReverseMatch:
+        return None
+
+
+def get_queryset_signature(queryset):
+    """
+    Return the SQL and parameters which would be used to evaluate a QuerySet, or None if it can never return results.
+    """
+    try:
+        return queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+
+
+class BulkImporter:
+    """
+    Create and/or update objects from a set of import records, each of which is validated using a model form.
+
+    Args:
+        model_form: The ModelForm class used to validate each record
+        queryset: A QuerySet matching the objects which the user is permitted to create
+        user: The User performing the import
+        headers: A dictionary mapping CSV column headers to custom to_field_name values (CSV data only)
+        save_object: A callable which accepts a valid model form and returns the saved object. If defined, each object
+            is saved individually using this callable.
+        batch_size: The maximum number of records to validate and write to the database at once
+    """
+    def __init__(self, model_form, queryset, user, headers=None, save_object=None, batch_size=BULK_IMPORT_BATCH_SIZE):
+        self.model = model_form._meta.model
+        self.model_form = model_form
+        self.queryset = queryset
+        self.user = user
+        self.headers = headers
+        self.save_object = save_object
+        self.batch_size = batch_size
+        self.bulk_write = save_object is None and supports_bulk_write(model_form)
+
+        # A list of (field, message) tuples describing any validation errors. The field is None for errors which
+        # apply to a record as a whole.
+        self.errors = []
+
+        # Maps the name of each foreign key field to a tuple of the signature of the QuerySet used to resolve its
+        # values, and a dictionary mapping each value to its object
+        self.resolved_objects = {}
+
+        # Fields which reference objects of the type being imported (e.g. a parent object)
+        self.self_references = [
+            name for name, field in self.model_form.base_fields.items()
+            if isinstance(field, forms.ModelChoiceField) and field.queryset is not None and
+            field.queryset.model is self.model
+        ]
+
+    def run(self, records, start=1):
+        """
+        Validate and save all records, returning a list of the objects created or updated. Raises ValidationError
+        (with the errors recorded under `errors`) if any record is invalid.
+
+        Args:
+            records: An iterable of dictionaries mapping form field names to values
+            start: The number of the first record (for reporting errors)
+        """
+        records = [dict(record) for record in records]
+        instances = self.get_instances(records, start)
+        self.resolve_related_objects(records)
+
+        # For newly created objects, apply any default custom field values
+        custom_field_defaults = {}
+        if any(not record.get('id') for record in records):
+            custom_field_defaults = {
+                f'cf_{cf.name}': cf.default for cf in metadata_cache.get_custom_fields(self.model)
+                if cf.ui_editable == CustomFieldUIEditableChoices.YES
+            }
+
+        saved_objects = []
+        batch = []
+        for i, record in enumerate(records, start=start):
+            object_id = int(record.pop('id')) if record.get('id') else None
+            instance = instances[object_id] if object_id else None
+
+            # Write any pending objects to the database before validating a record which might refer to one of them,
+            # or which modifies an object already pending
+            if batch and (
+                any(record.get(name) for name in self.self_references) or
+                (instance is not None and any(item[2] is instance for item in batch))
+            ):
+                saved_objects.extend(self.save_batch(batch))
+                batch = []
+
+            if instance is None:
+                for field_name, default in custom_field_defaults.items():
+                    record.setdefault(field_name, default)
+
+            batch.append((i, record, instance, self.get_form(record, instance)))
+            if len(batch) >= self.batch_size:
+                saved_objects.extend(self.save_batch(batch))
+                batch = []
+
+        if batch:
+            saved_objects.extend(self.save_batch(batch))
+
+        return saved_objects
+
+    def get_instances(self, records, start=1):
+        """
+        Retrieve all existing objects to be updated, taking a snapshot of each for change logging.
+        """
+        object_ids = [int(record['id']) for record in records if record.get('id')]
+        if not object_ids:
+            return {}
+
+        instances = {
+            obj.pk: obj for obj in self.model.objects.filter(pk__in=object_ids)
+        }
+        for i, record in enumerate(records, start=start):
+            if record.get('id') and int(record['id']) not in instances:
+                self.errors.append((
+                    'data',
+                    _("Row {i}: Object with ID {id} does not exist").format(i=i, id=record['id'])
+                ))
+        if self.errors:
+            raise ValidationError('')
+
+        for instance in instances.values():
+            if hasattr(instance, 'snapshot'):
+                instance.snapshot()
+
+        return instances
+
+    def resolve_related_objects(self, records):
+        """
+        Retrieve the objects referenced by each foreign key field, using a single query (per chunk of values) for all
+        records. Fields which cannot be resolved in this manner are left to the form to resolve for each record.
+        """
+        for name, field in self.model_form.base_fields.items():
+            if not isinstance(field, CSVModelChoiceField) or isinstance(field, CSVContentTypeField):
+                continue
+            if field.queryset is None or name in self.self_references:
+                continue
+            to_field = (self.headers or {}).get(name) or field.to_field_name or 'pk'
+            if '__' in to_field:
+                continue
+
+            values = {
+                str(record[name]) for record in records
+                if type(record.get(name)) in (str, int) and record[name] != ''
+            }
+            if not values:
+                continue
+
+            queryset = field.queryset.all()
+            if isinstance(queryset, RestrictedQuerySet):
+                queryset = queryset.restrict(self.user, 'view')
+
+            objects = {}
+            duplicates = set()
+            values = sorted(values)
+            try:
+                for offset in range(0, len(values), LOOKUP_CHUNK_SIZE):
+                    chunk = values[offset:offset + LOOKUP_CHUNK_SIZE]
+                    for obj in queryset.filter(**{f'{to_field}__in': chunk}):
+                        key = str(getattr(obj, to_field))
+                        if key in objects:
+                            duplicates.add(key)
+                        objects[key] = obj
+            except (FieldError, TypeError, ValidationError, ValueError):
+                # Values of an invalid type will be reported when validating each record
+                continue
+
+            # Leave ambiguous values for the form to report
+            for key in duplicates:
+                del objects[key]
+
+            self.resolved_objects[name] = (get_queryset_signature(queryset), to_field, objects)
+
+    def get_form(self, record, instance):
+        """
+        Instantiate and return the model form for a record.
+        """
+        model_form_kwargs = {
+            'data': record,
+            'instance': instance,
+        }
+        if self.headers is not None:
+            model_form_kwargs['headers'] = self.headers
+        model_form = self.model_form(**model_form_kwargs)
+
+        # When updating, omit all form fields other than those specified in the record. (No
+        # fields are required when modifying an existing object.)
+        if instance is not None:
+            unused_fields = [f for f in model_form.fields if f not in record]
+            for field_name in unused_fields:
+                del model_form.fields[field_name]
+
+        restrict_form_fields(model_form, self.user)
+
+        # Supply any previously resolved objects to the form's foreign key fields, provided that the form has not
+        # altered the set of objects available
+        for name, (signature, to_field, objects) in self.resolved_objects.items():
+            field = model_form.fields.get(name)
+            if field is None or str(record.get(name)) not in objects:
+                continue
+            if (field.to_field_name or 'pk') == to_field and get_queryset_signature(field.queryset) == signature:
+                field.resolved_objects = objects
+
+        return model_form
+
+    def add_form_errors(self, i, model_form):
+        """
+        Replicate model form errors for display.
+        """
+        for field, errors in model_form.errors.items():
+            for err in errors:
+                if field == '__all__':
+                    self.errors.append((None, f'Record {i}: {err}'))
+                else:
+                    self.errors.append((None, f'Record {i} {field}: {err}'))
+
+    def save_batch(self, batch):
+        """
+        Validate and save a batch of (index, record, instance, form) tuples, returning the saved objects. Raises
+        ValidationError if any record is invalid.
+        """
+        for i, record, instance, model_form in batch:
+            if not model_form.is_valid():
+                self.add_form_errors(i, model_form)
+            elif not self.bulk_write and not self.errors:
+                model_form.instance = self.save_object(model_form) if self.save_object else model_form.save()
+        if self.errors:
+            raise ValidationError('')
+
+        if self.bulk_write:
+            objects = self.write_batch(batch)
+        else:
+            objects = [model_form.instance for i, record, instance, model_form in batch]
+
+        # Enforce object-level permissions
+        pks = {obj.pk for obj in objects}
+        if self.queryset.filter(pk__in=pks).count() != len(pks):
+            raise PermissionsViolation()
+
+        return objects
+
+    def write_batch(self, batch):
+        """
+        Write a batch of validated objects to the database using bulk_create() and bulk_update(). If an integrity
+        error is encountered, fall back to saving the objects individually, to identify the offending record.
+        """
+        using = router.db_for_write(self.model)
+        objects = [model_form.save(commit=False) for i, record, instance, model_form in batch]
+        created = [obj._state.adding for obj in objects]
+
+        for obj in objects:
+            pre_save.send(sender=self.model, instance=obj, raw=False, using=using, update_fields=None)
+        for obj, is_new in zip(objects, created):
+            if not is_new:
+                for field in self.model._meta.concrete_fields:
+                    if getattr(field, 'auto_now', False):
+                        field.pre_save(obj, False)
+
+        try:
+            with transaction.atomic(using=using):
+                if new_objects := [obj for obj, is_new in zip(objects, created) if is_new]:
+                    self.model.objects.using(using).bulk_create(new_objects)
+                if existing_objects := [obj for obj, is_new in zip(objects, created) if not is_new]:
+                    self.model.objects.using(using).bulk_update(existing_objects, [
+                        field.name for field in self.model._meta.concrete_fields
+                        if not field.primary_key and not field.generated
+                    ])
+                if len(objects) > 1:
+                    self.revalidate_batch(batch, objects)
+        except IntegrityError:
+            return self.save_individually(batch)
+
+        for (i, record, instance, model_form), obj, is_new in zip(batch, objects, created):
+            post_save.send(
+                sender=self.model, instance=obj, created=is_new, update_fields=None, raw=False, using=using
+            )
+            model_form.save_m2m()
+            if isinstance(obj, TrackingModelMixin):
+                obj.tracker.clear()
+
+        return objects
+
+    def revalidate_batch(self, batch, objects):
+        """
+        Repeat model validation for a batch of objects once they have been written (but not committed). Each record is
+        validated before any object in its batch is written, so validation which queries other objects (e.g. checking
+        for overlapping aggregates) would not otherwise detect conflicts between records in the same batch. Raises
+        ValidationError if any object is now invalid.
+        """
+        for (i, record, instance, model_form), obj in zip(batch, objects):
+            try:
+                obj.clean()
+            except ValidationError as e:
+                for message in e.messages:
+                    self.errors.append((None, f'Record {i}: {message}'))
+        if self.errors:
+            raise ValidationError('')
+
+    def save_individually(self, batch):
+        """
+        Validate and save each record in a batch individually, returning the saved objects.
+        """
+        objects = []
+        for i, record, instance, model_form in batch:
+            model_form = self.get_form(record, instance)
+            if not model_form.is_valid():
+                self.add_form_errors(i, model_form)
+            elif not self.errors:
+                objects.append(model_form.save())
+        if self.errors:
+            raise ValidationError('')
+
+        return objects
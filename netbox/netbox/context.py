@@ -3,8 +3,10 @@ from contextvars import ContextVar
 __all__ = (
     'current_request',
     'events_queue',
+    'objectchange_buffer',
 )
 
 
 current_request = ContextVar('current_request', default=None)
 events_queue = ContextVar('events_queue', default=dict())
+objectchange_buffer = ContextVar('objectchange_buffer', default=None)
@@ -1,8 +1,46 @@
 from contextlib import contextmanager
 
-from netbox.context import current_request, events_queue
-from netbox.utils import register_request_processor
+from core.models import ObjectChange
+from netbox.context import current_request, events_queue, objectchange_buffer
+from netbox.search.backends import deferred_caching
+from netbox.utils import register_bulk_operation_processor, register_request_processor
 from extras.events import flush_events
+from extras.metadata import metadata_cache
+
+
+class ObjectChangeBuffer:
+    """
+    An in-memory, ordered buffer of ObjectChange records awaiting creation. The most recent record for each changed
+    object is tracked so that subsequent many-to-many changes can be merged into it.
+    """
+    def __init__(self):
+        self.objectchanges = []
+        self.latest = {}
+
+    def __len__(self):
+        return len(self.objectchanges)
+
+    def add(self, objectchange):
+        # Record the user's name and the object's representation as static strings (see ObjectChange.save())
+        if not objectchange.user_name:
+            objectchange.user_name = objectchange.user.username
+        if not objectchange.object_repr:
+            objectchange.object_repr = str(objectchange.changed_object)
+
+        self.objectchanges.append(objectchange)
+        key = (objectchange.changed_object_type_id, objectchange.changed_object_id, objectchange.request_id)
+        self.latest[key] = objectchange
+
+    def get_latest(self, object_type, object_id, request_id):
+        """
+        Return the most recent buffered ObjectChange for the specified object and request, if any.
+        """
+        return self.latest.get((object_type.pk, object_id, request_id))
+
+    def flush(self):
+        ObjectChange.objects.bulk_create(self.objectchanges)
+        self.objectchanges = []
+        self.latest = {}
 
 
 @register_request_processor
@@ -26,3 +64,51 @@ def event_tracking(request):
     # Clear context vars
     current_request.set(None)
     events_queue.set({})
+
+
+@register_request_processor
+@contextmanager
+def search_caching(request):
+    """
+    Defer the caching of objects for search until the request has been processed, so that each object created or
+    modified is cached only once.
+
+    :param request: WSGIRequest object with a unique `id` set
+    """
+    with deferred_caching():
+        yield
+
+
+@register_request_processor
+@contextmanager
+def metadata_version_tracking(request):
+    """
+    Check the version of the cached custom fields, custom links, export templates, and event rules only once while
+    processing a request, rather than on every lookup.
+
+    :param request: WSGIRequest object with a unique `id` set
+    """
+    with metadata_cache.track_version():
+        yield
+
+
+@register_bulk_operation_processor
+@contextmanager
+def change_logging_buffer():
+    """
+    Buffer the ObjectChange records generated within the block in memory, then create them all at once (preserving
+    their order) when the block exits. Nested blocks defer to the outermost one. Buffered records are discarded if an
+    exception is raised, as the enclosing transaction is expected to be rolled back.
+    """
+    if objectchange_buffer.get() is not None:
+        yield
+        return
+
+    token = objectchange_buffer.set(ObjectChangeBuffer())
+    try:
+        yield
+        buffer = objectchange_buffer.get()
+    finally:
+        objectchange_buffer.reset(token)
+
+    buffer.flush()
@@ -1,17 +1,21 @@
 import django_filters
+from collections import defaultdict
 from copy import deepcopy
+from django import forms
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.db.models import Q
 from django_filters.exceptions import FieldLookupError
 from django_filters.utils import get_model_field, resolve_field
+from django_filters.widgets import SuffixedMultiWidget
 from django.utils.translation import gettext as _
 
 from core.choices import ObjectChangeActionChoices
 from core.models import ObjectChange
 from extras.choices import CustomFieldFilterLogicChoices
 from extras.filters import TagFilter
-from extras.models import CustomField, SavedFilter
+from extras.metadata import metadata_cache
+from extras.models import SavedFilter
 from utilities.constants import (
     FILTER_CHAR_BASED_LOOKUP_MAP, FILTER_NEGATION_LOOKUP_MAP, FILTER_TREENODE_NEGATION_LOOKUP_MAP,
     FILTER_NUMERIC_BASED_LOOKUP_MAP
@@ -27,6 +31,46 @@ __all__ = (
 )
 
 
+def get_filter_data_keys(name, filter_):
+    """
+    Return the keys under which a value for the given filter may appear in a FilterSet's data.
+    """
+    widget = filter_.extra.get('widget') or filter_.field_class.widget
+    if isinstance(widget, type):
+        widget = widget()
+    if isinstance(widget, SuffixedMultiWidget):
+        return [widget.suffixed(name, suffix) for suffix in widget.suffixes]
+    if isinstance(widget, forms.MultiWidget):
+        return [f'{name}{suffix}' for suffix in widget.widgets_names]
+    return [name]
+
+
+class CompiledFilters:
+    """
+    A set of generated filters, indexed by the keys under which their values may appear in a FilterSet's data, from
+    which the filters needed to process a particular request can be selected quickly.
+    """
+    def __init__(self, filters):
+        self.filters = filters
+        self.positions = {name: i for i, name in enumerate(filters)}
+        self.keys = defaultdict(list)
+        for name, filter_ in filters.items():
+            for key in get_filter_data_keys(name, filter_):
+                self.keys[key].append(name)
+
+    def select(self, data=None):
+        """
+        Return the filters for which a value is present in the given data (in their original order), or all filters
+        if no data is given.
+        """
+        if data is None:
+            return self.filters
+        names = {name for key in data if key in self.keys for name in self.keys[key]}
+        return {
+            name: self.filters[name] for name in sorted(names, key=self.positions.__getitem__)
+        }
+
+
 #
 # FilterSets
 #
@@ -85,11 +129,6 @@ class BaseFilterSet(django_filters.FilterSet):
     })
 
     def __init__(self, data=None, *args, **kwargs):
-        # bit of a hack for #9231 - extras.lookup.Empty is registered in apps.ready
-        # however FilterSet Factory is setup before this which creates the
-        # initial filters.  This recreates the filters so Empty is picked up correctly.
-        self.base_filters = self.__class__.get_filters()
-
         # Apply any referenced SavedFilters
         if data and ('filter' in data or 'filter_id' in data):
             data = data.copy()  # Get a mutable copy
@@ -108,8 +147,26 @@ class BaseFilterSet(django_filters.FilterSet):
                     else:
                         data.setlist(key, value)
 
+        # Bind only those filters for which values have been provided. (All filters are bound when a prefix is used, as
+        # it applies to the keys of the data.)
+        self.base_filters = self.get_compiled_filters(None if kwargs.get('prefix') else data)
+
         super().__init__(data, *args, **kwargs)
 
+    @classmethod
+    def get_compiled_filters(cls, data=None):
+        """
+        Return the filters to be bound to a new instance: those for which a value is present in the given data, or all
+        filters if no data is given. The filters are generated by get_filters() once per class, upon first use.
+        """
+        # bit of a hack for #9231 - extras.lookup.Empty is registered in apps.ready
+        # however FilterSet Factory is setup before this which creates the
+        # initial filters.  This recreates the filters so Empty is picked up correctly.
+        if '_compiled_filters' not in cls.__dict__:
+            cls._compiled_filters = CompiledFilters(cls.get_filters())
+
+        return cls._compiled_filters.select(data)
+
     @staticmethod
     def _get_filter_lookup_dict(existing_filter):
         # Choose the lookup expression map based on the filter type
@@ -283,15 +340,15 @@ class NetBoxModelFilterSet(ChangeLoggedModelFilterSet):
     )
     tag = TagFilter()
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # Dynamically add a Filter for each CustomField applicable to the parent model
-        custom_fields = CustomField.objects.filter(
-            object_types=ContentType.objects.get_for_model(self._meta.model)
-        ).exclude(
-            filter_logic=CustomFieldFilterLogicChoices.FILTER_DISABLED
-        )
+    @classmethod
+    def get_custom_field_filters(cls):
+        """
+        Generate a Filter for each CustomField applicable to the parent model.
+        """
+        custom_fields = [
+            cf for cf in metadata_cache.get_custom_fields(cls._meta.model)
+            if cf.filter_logic != CustomFieldFilterLogicChoices.FILTER_DISABLED
+        ]
 
         custom_field_filters = {}
         for custom_field in custom_fields:
@@ -301,10 +358,23 @@ class NetBoxModelFilterSet(ChangeLoggedModelFilterSet):
                 custom_field_filters[filter_name] = filter_instance
 
                 # Add relevant additional lookups
-                additional_lookups = self.get_additional_lookups(filter_name, filter_instance)
+                additional_lookups = cls.get_additional_lookups(filter_name, filter_instance)
                 custom_field_filters.update(additional_lookups)
 
-        self.filters.update(custom_field_filters)
+        return custom_field_filters
+
+    @classmethod
+    def get_compiled_filters(cls, data=None):
+        # Custom field filters are cached until any custom field is modified
+        custom_field_filters = metadata_cache.get(
+            ('custom_field_filters', cls),
+            lambda: CompiledFilters(cls.get_custom_field_filters())
+        )
+
+        return {
+            **super().get_compiled_filters(data),
+            **custom_field_filters.select(data),
+        }
 
     def search(self, queryset, name, value):
         """
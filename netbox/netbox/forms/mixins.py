@@ -3,6 +3,7 @@ from django.utils.translation import gettext as _
 
 from core.models import ObjectType
 from extras.choices import *
+from extras.metadata import metadata_cache
 from extras.models import *
 from utilities.forms.fields import DynamicModelMultipleChoiceField
 
@@ -41,9 +42,10 @@ class CustomFieldsMixin:
         return ObjectType.objects.get_for_model(self.model)
 
     def _get_custom_fields(self, content_type):
-        return CustomField.objects.filter(object_types=content_type).exclude(
-            ui_editable=CustomFieldUIEditableChoices.HIDDEN
-        )
+        return [
+            cf for cf in metadata_cache.get_custom_fields(content_type)
+            if cf.ui_editable != CustomFieldUIEditableChoices.HIDDEN
+        ]
 
     def _get_form_field(self, customfield):
         return customfield.to_form_field()
@@ -0,0 +1,113 @@
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+
+from netbox.config import get_config
+
+__all__ = (
+    'ExpiredRecordsTask',
+    'HousekeepingTask',
+)
+
+
+class HousekeepingTask:
+    """
+    Base class for tasks performed by the `housekeeping` management command. Subclasses must define `description` and
+    extend the `run()` method.
+
+    Args:
+        command: The management command instance (used to write output)
+        verbosity: The verbosity level of output
+        batch_size: The maximum number of records to delete at once
+        deadline: The time (per time.monotonic()) by which the task should stop, if any
+    """
+    description = None
+
+    def __init__(self, command, verbosity=1, batch_size=1000, deadline=None):
+        self.command = command
+        self.verbosity = verbosity
+        self.batch_size = batch_size
+        self.deadline = deadline
+
+    def run(self):
+        raise NotImplementedError(f"{self.__class__.__name__} must implement run()")
+
+    def log(self, message, style=None, level=1, ending=None):
+        """
+        Write a message to the command's output if the verbosity level is at least the specified level.
+        """
+        if self.verbosity >= level:
+            self.command.stdout.write(f"\t{message}", style, ending=ending)
+            self.command.stdout.flush()
+
+    @property
+    def time_expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def delete_in_batches(self, queryset):
+        """
+        Delete all records matching the given queryset in batches, each in its own transaction, until none remain or
+        the deadline has passed. Records are deleted directly in the database (without loading them into memory or
+        sending signals). Returns the number of records deleted.
+        """
+        deleted_count = 0
+        while True:
+            if self.time_expired:
+                self.log(
+                    f"Time limit reached after deleting {deleted_count} records; the remainder will be deleted on "
+                    f"the next run.",
+                    self.command.style.WARNING
+                )
+                break
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:self.batch_size])
+            if not pks:
+                break
+            deleted_count += self.delete_batch(queryset.model._base_manager.filter(pk__in=pks))
+            self.log(f"Deleted {deleted_count} records...", level=2)
+
+        return deleted_count
+
+    def delete_batch(self, queryset):
+        """
+        Delete a single batch of records directly in the database and return the number deleted. Subclasses may extend
+        this method to perform any cleanup normally handled by the model's delete() method or signal receivers.
+        """
+        return queryset._raw_delete(using=queryset.db)
+
+
+class ExpiredRecordsTask(HousekeepingTask):
+    """
+    Delete all records of a model older than the retention period (in days) specified by a configuration parameter.
+
+    Attributes:
+        model: The model of records to delete
+        timestamp_field: The name of the field indicating the time of each record's creation
+        retention_parameter: The name of the configuration parameter specifying the retention period
+    """
+    model = None
+    timestamp_field = 'created'
+    retention_parameter = None
+
+    def get_retention(self):
+        return getattr(get_config(), self.retention_parameter)
+
+    def get_queryset(self, cutoff):
+        return self.model.objects.filter(**{f'{self.timestamp_field}__lt': cutoff})
+
+    def run(self):
+        retention = self.get_retention()
+        if not retention:
+            self.log(f"Skipping: No retention period specified ({self.retention_parameter} = {retention})")
+            return
+
+        cutoff = timezone.now() - timedelta(days=retention)
+        self.log(f"Retention period: {retention} days", level=2)
+        self.log(f"Cut-off time: {cutoff}", level=2)
+        self.delete_expired(cutoff)
+
+    def delete_expired(self, cutoff):
+        if deleted_count := self.delete_in_batches(self.get_queryset(cutoff)):
+            self.log(f"Deleted {deleted_count} expired records.", self.command.style.SUCCESS)
+        else:
+            self.log("No expired records found.", self.command.style.SUCCESS)
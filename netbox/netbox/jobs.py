@@ -8,6 +8,7 @@ from rq.timeouts import JobTimeoutException
 
 from core.choices import JobStatusChoices
 from core.models import Job, ObjectType
+from extras.metadata import metadata_cache
 from netbox.constants import ADVISORY_LOCK_KEYS
 
 __all__ = (
@@ -56,7 +57,8 @@ class JobRunner(ABC):
         """
         try:
             job.start()
-            cls(job).run(*args, **kwargs)
+            with metadata_cache.track_version():
+                cls(job).run(*args, **kwargs)
             job.terminate()
 
         except Exception as e:
@@ -214,10 +214,10 @@ class CustomFieldsMixin(models.Model):
         Args:
             omit_hidden: If True, custom fields with no UI visibility will be omitted.
         """
-        from extras.models import CustomField
+        from extras.metadata import metadata_cache
         data = {}
 
-        for field in CustomField.objects.get_for_model(self):
+        for field in metadata_cache.get_custom_fields(self):
             value = self.custom_field_data.get(field.name)
 
             # Skip hidden fields if 'omit_hidden' is True
@@ -243,13 +243,12 @@ class CustomFieldsMixin(models.Model):
         }
         ```
         """
-        from extras.models import CustomField
+        from extras.metadata import metadata_cache
         groups = defaultdict(dict)
-        visible_custom_fields = CustomField.objects.get_for_model(self).exclude(
-            ui_visible=CustomFieldUIVisibleChoices.HIDDEN
-        )
 
-        for cf in visible_custom_fields:
+        for cf in metadata_cache.get_custom_fields(self):
+            if cf.ui_visible == CustomFieldUIVisibleChoices.HIDDEN:
+                continue
             value = self.custom_field_data.get(cf.name)
             if value in CUSTOMFIELD_EMPTY_VALUES and cf.ui_visible == CustomFieldUIVisibleChoices.IF_SET:
                 continue
@@ -262,16 +261,17 @@ class CustomFieldsMixin(models.Model):
         """
         Apply the default value for each custom field
         """
-        for cf in self.custom_fields:
+        from extras.metadata import metadata_cache
+        for cf in metadata_cache.get_custom_fields(self):
             self.custom_field_data[cf.name] = cf.default
     populate_custom_field_defaults.alters_data = True
 
     def clean(self):
         super().clean()
-        from extras.models import CustomField
+        from extras.metadata import metadata_cache
 
         custom_fields = {
-            cf.name: cf for cf in CustomField.objects.get_for_model(self)
+            cf.name: cf for cf in metadata_cache.get_custom_fields(self)
         }
 
         # Validate all field values
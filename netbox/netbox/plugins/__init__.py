@@ -8,7 +8,7 @@ from packaging import version
 
 from netbox.registry import registry
 from netbox.search import register_search
-from netbox.utils import register_data_backend
+from netbox.utils import register_data_backend, register_housekeeping_task
 from .navigation import *
 from .registration import *
 from .templates import *
@@ -26,6 +26,7 @@ registry['plugins'].update({
 DEFAULT_RESOURCE_PATHS = {
     'search_indexes': 'search.indexes',
     'data_backends': 'data_backends.backends',
+    'housekeeping_tasks': 'housekeeping.tasks',
     'graphql_schema': 'graphql.schema',
     'menu': 'navigation.menu',
     'menu_items': 'navigation.menu_items',
@@ -73,6 +74,7 @@ class PluginConfig(AppConfig):
     # Optional plugin resources
     search_indexes = None
     data_backends = None
+    housekeeping_tasks = None
     graphql_schema = None
     menu = None
     menu_items = None
@@ -111,6 +113,11 @@ class PluginConfig(AppConfig):
         for backend in data_backends:
             register_data_backend()(backend)
 
+        # Register housekeeping tasks (if defined)
+        housekeeping_tasks = self._load_resource('housekeeping_tasks') or []
+        for task in housekeeping_tasks:
+            register_housekeeping_task(task)
+
         # Register template content (if defined)
         if template_extensions := self._load_resource('template_extensions'):
             register_template_extensions(template_extensions)
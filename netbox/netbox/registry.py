@@ -22,10 +22,12 @@ class Registry(dict):
 
 # Initialize the global registry
 registry = Registry({
+    'bulk_operation_processors': list(),
     'counter_fields': collections.defaultdict(dict),
     'data_backends': dict(),
     'denormalized_fields': collections.defaultdict(list),
     'event_types': dict(),
+    'housekeeping_tasks': list(),
     'model_features': dict(),
     'models': collections.defaultdict(set),
     'plugins': dict(),
@@ -1,20 +1,28 @@
 from collections import defaultdict
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
 from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
 from django.db.models import F, Window, Q, prefetch_related_objects
 from django.db.models.fields.related import ForeignKey
-from django.db.models.functions import window
-from django.db.models.signals import post_delete, post_save
+from django.db.models.functions import Upper, window
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
+from django_rq import get_queue
 import netaddr
 from netaddr.core import AddrFormatError
 
 from core.models import ObjectType
-from extras.models import CachedValue, CustomField
+from extras.metadata import metadata_cache
+from extras.models import CachedValue
 from netbox.registry import registry
+from netbox.signals import post_bulk_create
 from utilities.object_types import object_type_identifier
 from utilities.querysets import RestrictedPrefetch
 from utilities.string import title
@@ -22,12 +30,21 @@ from . import FieldTypes, LookupTypes, get_indexer
 
 DEFAULT_LOOKUP_TYPE = LookupTypes.PARTIAL
 MAX_RESULTS = 1000
+FULL_TEXT_SEARCH_CONFIG = 'simple'
+
+# The primary keys of objects awaiting caching, mapped by model label, while caching is deferred
+deferred_cache_queue = ContextVar('deferred_cache_queue', default=None)
 
 
 class SearchBackend:
     """
     Base class for search backends. Subclasses must extend the `cache()`, `remove()`, and `clear()` methods below.
+
+    Backends which support cursor pagination set `supports_cursor` to True. Their `search()` method accepts an `after`
+    argument, and sets a `cursor` attribute on each result which can be passed as `after` to retrieve subsequent
+    results.
     """
+    supports_cursor = False
     _object_types = None
 
     def get_object_types(self):
@@ -58,12 +75,38 @@ class SearchBackend:
         """
         raise NotImplementedError
 
+    def install(self, using=DEFAULT_DB_ALIAS):
+        """
+        Create any database objects (e.g. extensions or indexes) required by the backend. Called after migrations have
+        been applied.
+        """
+        pass
+
     def caching_handler(self, sender, instance, created, **kwargs):
         """
-        Receiver for the post_save signal, responsible for caching object creation/changes.
+        Receiver for the post_save signal, responsible for caching object creation/changes. If caching has been
+        deferred, the object is queued to be cached at the end of the deferral instead.
         """
+        if (queue := deferred_cache_queue.get()) is not None:
+            label = instance._meta.label_lower
+            if label in registry['search']:
+                queue[label].add(instance.pk)
+            return
+
         self.cache(instance, remove_existing=not created)
 
+    def bulk_caching_handler(self, sender, instances, **kwargs):
+        """
+        Receiver for the post_bulk_create signal, responsible for caching a set of newly created objects at once.
+        """
+        if (queue := deferred_cache_queue.get()) is not None:
+            label = sender._meta.label_lower
+            if label in registry['search']:
+                queue[label].update(instance.pk for instance in instances)
+            return
+
+        self.cache(instances, remove_existing=False)
+
     def removal_handler(self, sender, instance, **kwargs):
         """
         Receiver for the post_delete signal, responsible for caching object deletion.
@@ -76,6 +119,18 @@ class SearchBackend:
         """
         raise NotImplementedError
 
+    def cache_objects(self, objects):
+        """
+        Create or update the cached representations of objects specified as a mapping of model labels (e.g.
+        "dcim.site") to primary keys. Objects which no longer exist are ignored.
+        """
+        counter = 0
+        for label, pks in objects.items():
+            indexer = registry['search'][label]
+            counter += self.cache(indexer.model.objects.filter(pk__in=pks), indexer=indexer)
+
+        return counter
+
     def remove(self, instance):
         """
         Delete any cached representation of an instance.
@@ -104,10 +159,12 @@ class SearchBackend:
 
 
 class CachedValueSearchBackend(SearchBackend):
+    cache_batch_size = 1000
 
-    def search(self, value, user=None, object_types=None, lookup=DEFAULT_LOOKUP_TYPE):
-
-        # Build the filter used to find relevant CachedValue records
+    def get_query_filter(self, value, object_types=None, lookup=DEFAULT_LOOKUP_TYPE):
+        """
+        Return the filter used to find relevant CachedValue records.
+        """
         query_filter = Q(**{f'value__{lookup}': value})
         if object_types:
             # Limit results by object type
@@ -123,6 +180,38 @@ class CachedValueSearchBackend(SearchBackend):
             except (AddrFormatError, ValueError):
                 pass
 
+        return query_filter
+
+    @staticmethod
+    def prefetch_display_attrs(results, object_types):
+        """
+        Iterate through each ObjectType represented in the search results and prefetch any related objects necessary
+        to render the prescribed display attributes (display_attrs).
+        """
+        for object_type in object_types:
+            model = object_type.model_class()
+            indexer = registry['search'].get(object_type_identifier(object_type))
+            if not (display_attrs := getattr(indexer, 'display_attrs', None)):
+                continue
+
+            # Add ForeignKey fields to prefetch list
+            prefetch_fields = []
+            for attr in display_attrs:
+                field = model._meta.get_field(attr)
+                if type(field) is ForeignKey:
+                    prefetch_fields.append(f'object__{attr}')
+
+            # Compile a list of all CachedValues referencing this object type, and prefetch
+            # any related objects
+            if prefetch_fields:
+                objects = [r for r in results if r.object_type == object_type]
+                prefetch_related_objects(objects, *prefetch_fields)
+
+    def search(self, value, user=None, object_types=None, lookup=DEFAULT_LOOKUP_TYPE):
+
+        # Build the filter used to find relevant CachedValue records
+        query_filter = self.get_query_filter(value, object_types=object_types, lookup=lookup)
+
         # Construct the base queryset to retrieve matching results
         queryset = CachedValue.objects.filter(query_filter).annotate(
             # Annotate the rank of each result for its object according to its weight
@@ -154,26 +243,8 @@ class CachedValueSearchBackend(SearchBackend):
             params
         )
 
-        # Iterate through each ObjectType represented in the search results and prefetch any
-        # related objects necessary to render the prescribed display attributes (display_attrs).
-        for object_type in object_types:
-            model = object_type.model_class()
-            indexer = registry['search'].get(object_type_identifier(object_type))
-            if not (display_attrs := getattr(indexer, 'display_attrs', None)):
-                continue
-
-            # Add ForeignKey fields to prefetch list
-            prefetch_fields = []
-            for attr in display_attrs:
-                field = model._meta.get_field(attr)
-                if type(field) is ForeignKey:
-                    prefetch_fields.append(f'object__{attr}')
-
-            # Compile a list of all CachedValues referencing this object type, and prefetch
-            # any related objects
-            if prefetch_fields:
-                objects = [r for r in results if r.object_type == object_type]
-                prefetch_related_objects(objects, *prefetch_fields)
+        # Prefetch any related objects needed to render display attributes
+        self.prefetch_display_attrs(results, object_types)
 
         # Omit any results pertaining to an object the user does not have permission to view
         ret = []
@@ -197,7 +268,7 @@ class CachedValueSearchBackend(SearchBackend):
         for instance in instances:
 
             # First item
-            if not counter:
+            if object_type is None:
 
                 # Determine the indexer
                 if indexer is None:
@@ -208,7 +279,9 @@ class CachedValueSearchBackend(SearchBackend):
 
                 # Prefetch any associated custom fields
                 object_type = ObjectType.objects.get_for_model(indexer.model)
-                custom_fields = CustomField.objects.filter(object_types=object_type).exclude(search_weight=0)
+                custom_fields = [
+                    cf for cf in metadata_cache.get_custom_fields(object_type) if cf.search_weight
+                ]
 
             # Wipe out any previously cached values for the object
             if remove_existing:
@@ -238,6 +311,28 @@ class CachedValueSearchBackend(SearchBackend):
 
         return counter
 
+    def cache_objects(self, objects):
+        counter = 0
+        for label, pks in objects.items():
+            indexer = registry['search'][label]
+            pks = sorted(pks)
+            object_type = ObjectType.objects.get_for_model(indexer.model)
+
+            for i in range(0, len(pks), self.cache_batch_size):
+                batch = pks[i:i + self.cache_batch_size]
+
+                # Wipe out any previously cached values for the batch of objects
+                qs = CachedValue.objects.filter(object_type=object_type, object_id__in=batch)
+                qs._raw_delete(using=qs.db)
+
+                counter += self.cache(
+                    indexer.model.objects.filter(pk__in=batch),
+                    indexer=indexer,
+                    remove_existing=False
+                )
+
+        return counter
+
     def remove(self, instance):
         # Avoid attempting to query for non-cacheable objects
         try:
@@ -270,6 +365,156 @@ class CachedValueSearchBackend(SearchBackend):
         return CachedValue.objects.count()
 
 
+class FullTextSearchBackend(CachedValueSearchBackend):
+    """
+    Extends CachedValueSearchBackend to match partial search terms against the full-text search vector of each cached
+    value as well as its raw value, and to rank results by trigram similarity and full-text rank within each weight.
+
+    Results are ordered using keyset pagination, so that objects which the user does not have permission to view do
+    not count toward the result limit. The cursor of the last result returned can be passed as `after` to retrieve the
+    next set of results.
+
+    The pg_trgm extension and the GIN indexes used by this backend are created by install(), which is called after
+    migrations have been applied while this backend is configured.
+    """
+    supports_cursor = True
+    batch_size = 250
+    indexes = (
+        GinIndex(SearchVector('value', config=FULL_TEXT_SEARCH_CONFIG), name='extras_cachedvalue_search'),
+        GinIndex(OpClass(Upper('value'), name='gin_trgm_ops'), name='extras_cachedvalue_value_trgm'),
+    )
+
+    def install(self, using=DEFAULT_DB_ALIAS):
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, CachedValue._meta.db_table)
+
+        with connection.schema_editor() as schema_editor:
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for index in self.indexes:
+                if index.name not in constraints:
+                    schema_editor.add_index(CachedValue, index)
+
+    def get_query_filter(self, value, object_types=None, lookup=DEFAULT_LOOKUP_TYPE):
+        query_filter = super().get_query_filter(value, object_types=object_types, lookup=lookup)
+        if lookup == LookupTypes.PARTIAL:
+            query_filter |= Q(search_vector=SearchQuery(value, config=FULL_TEXT_SEARCH_CONFIG))
+            if object_types:
+                query_filter &= Q(object_type__in=object_types)
+
+        return query_filter
+
+    def get_rank(self, value, lookup=DEFAULT_LOOKUP_TYPE):
+        """
+        Return an expression for ranking matching CachedValue records (higher is better).
+        """
+        rank = TrigramSimilarity('value', value)
+        if lookup == LookupTypes.PARTIAL:
+            rank += SearchRank(F('search_vector'), SearchQuery(value, config=FULL_TEXT_SEARCH_CONFIG))
+
+        return rank
+
+    @staticmethod
+    def get_cursor(result):
+        """
+        Return the cursor identifying the position of a result, encoded as a string.
+        """
+        return f'{result.weight}:{result.rank!r}:{result.object_type_id}:{result.object_id}'
+
+    @staticmethod
+    def parse_cursor(cursor):
+        """
+        Decode a cursor returned by get_cursor(). Raises ValueError if the cursor is invalid.
+        """
+        weight, rank, object_type_id, object_id = cursor.split(':')
+        return int(weight), float(rank), int(object_type_id), int(object_id)
+
+    def iter_results(self, queryset, after=None):
+        """
+        Yield batches of the best-ranked result for each object in the queryset, ordered by weight and rank, beginning
+        after the specified (decoded) cursor. The query is executed only once; batches are fetched from a server-side
+        cursor where possible.
+        """
+        sql, params = queryset.query.sql_with_params()
+        params = list(params)
+
+        # Apply keyset pagination
+        keyset = ''
+        if after is not None:
+            weight, rank, object_type_id, object_id = after
+            keyset = (
+                'AND (weight > %s OR (weight = %s AND (rank < %s OR (rank = %s AND '
+                '(object_type_id, object_id) > (%s, %s)))))'
+            )
+            params.extend((weight, weight, rank, rank, object_type_id, object_id))
+
+        connection = connections[queryset.db]
+        columns = [field.attname for field in CachedValue._meta.concrete_fields]
+        sql = (
+            f"SELECT {', '.join(connection.ops.quote_name(c) for c in columns)}, rank "
+            f"FROM ({sql}) t WHERE row_number = 1 {keyset} "
+            f"ORDER BY weight ASC, rank DESC, object_type_id ASC, object_id ASC"
+        )
+
+        if connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+            cursor = connection.cursor()
+        else:
+            cursor = connection.chunked_cursor()
+        with cursor:
+            cursor.execute(sql, params)
+            while rows := cursor.fetchmany(self.batch_size):
+                results = []
+                for *values, rank in rows:
+                    result = CachedValue.from_db(queryset.db, columns, values)
+                    result.rank = rank
+                    result.cursor = self.get_cursor(result)
+                    results.append(result)
+                yield results
+
+    def search(self, value, user=None, object_types=None, lookup=DEFAULT_LOOKUP_TYPE, limit=MAX_RESULTS, after=None):
+        if after is not None:
+            after = self.parse_cursor(after)
+
+        # Annotate the rank of each matching record, and its position relative to other records for the same object
+        queryset = CachedValue.objects.alias(
+            search_vector=SearchVector('value', config=FULL_TEXT_SEARCH_CONFIG)
+        ).filter(
+            self.get_query_filter(value, object_types=object_types, lookup=lookup)
+        ).annotate(
+            rank=self.get_rank(value, lookup=lookup),
+            row_number=Window(
+                expression=window.RowNumber(),
+                partition_by=[F('object_type'), F('object_id')],
+                order_by=[F('weight').asc(), F('rank').desc()],
+            )
+        ).order_by()
+
+        # Construct a Prefetch to pre-fetch only those related objects for which the
+        # user has permission to view.
+        if user:
+            prefetch = (RestrictedPrefetch('object', user, 'view'), 'object_type')
+        else:
+            prefetch = ('object', 'object_type')
+
+        # Consume batches of results until the limit has been reached or all results have been exhausted
+        ret = []
+        with closing(self.iter_results(queryset, after=after)) as batches:
+            for results in batches:
+                prefetch_related_objects(results, *prefetch)
+                self.prefetch_display_attrs(results, {r.object_type for r in results})
+
+                # Omit any results pertaining to an object the user does not have permission to view
+                for r in results:
+                    if r.object is not None:
+                        r.name = str(r.object)
+                        ret.append(r)
+
+                if limit is not None and len(ret) >= limit:
+                    break
+
+        return ret[:limit]
+
+
 def get_backend():
     """
     Initializes and returns the configured search backend.
@@ -287,4 +532,56 @@ search_backend = get_backend()
 
 # Connect handlers to the appropriate model signals
 post_save.connect(search_backend.caching_handler)
+post_bulk_create.connect(search_backend.bulk_caching_handler)
 post_delete.connect(search_backend.removal_handler)
+
+
+def install_search_backend(sender, app_config, using, **kwargs):
+    """
+    Create any database objects required by the configured search backend once the extras app has been migrated.
+    """
+    if app_config.label == 'extras':
+        search_backend.install(using=using)
+
+
+post_migrate.connect(install_search_backend)
+
+
+def cache_objects(objects):
+    """
+    Cache the specified objects using the configured search backend. Called by background workers to process
+    deferred caching.
+    """
+    return search_backend.cache_objects(objects)
+
+
+@contextmanager
+def deferred_caching():
+    """
+    Defer the caching of objects created or modified within the block, then cache each object once at the end of the
+    block. If SEARCH_CACHE_QUEUE has been set, caching is instead delegated to a background worker once the current
+    transaction has been committed. Nested blocks defer to the outermost one.
+    """
+    if deferred_cache_queue.get() is not None:
+        yield
+        return
+
+    token = deferred_cache_queue.set(defaultdict(set))
+    try:
+        yield
+    finally:
+        queue = deferred_cache_queue.get()
+        deferred_cache_queue.reset(token)
+
+        # Skip caching if the current transaction has failed; its changes will be rolled back
+        if queue and not connection.needs_rollback:
+            objects = {label: list(pks) for label, pks in queue.items()}
+            if settings.SEARCH_CACHE_QUEUE:
+                transaction.on_commit(
+                    lambda: get_queue(settings.SEARCH_CACHE_QUEUE).enqueue(
+                        'netbox.search.backends.cache_objects',
+                        objects=objects
+                    )
+                )
+            else:
+                search_backend.cache_objects(objects)
@@ -3,3 +3,7 @@ from django.dispatch import Signal
 
 # Signals that a model has completed its clean() method
 post_clean = Signal()
+
+# Signals that a set of objects of the same model has been created using bulk_create(). Sent in place of post_save for
+# each object, with the arguments "instances" (a list of the created objects) and "using".
+post_bulk_create = Signal()
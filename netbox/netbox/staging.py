@@ -6,6 +6,7 @@ from django.db.models.signals import m2m_changed, pre_delete, post_save
 
 from extras.choices import ChangeActionChoices
 from extras.models import StagedChange
+from netbox.signals import post_bulk_create
 from utilities.serialization import serialize_object
 
 logger = logging.getLogger('netbox.staging')
@@ -47,6 +48,7 @@ class checkout:
         # Connect signal handlers
         logger.debug("Connecting signal handlers")
         post_save.connect(self.post_save_handler)
+        post_bulk_create.connect(self.post_bulk_create_handler)
         m2m_changed.connect(self.post_save_handler)
         pre_delete.connect(self.pre_delete_handler)
 
@@ -55,6 +57,7 @@ class checkout:
         # Disconnect signal handlers
         logger.debug("Disconnecting signal handlers")
         post_save.disconnect(self.post_save_handler)
+        post_bulk_create.disconnect(self.post_bulk_create_handler)
         m2m_changed.disconnect(self.post_save_handler)
         pre_delete.disconnect(self.pre_delete_handler)
 
@@ -136,6 +139,13 @@ class checkout:
         data = serialize_object(instance, resolve_tags=False)
         self.queue[key] = (ChangeActionChoices.ACTION_UPDATE, data)
 
+    def post_bulk_create_handler(self, sender, instances, **kwargs):
+        """
+        Hooks to the post_bulk_create signal when a branch is active to queue create actions.
+        """
+        for instance in instances:
+            self.post_save_handler(sender, instance, created=True)
+
     def pre_delete_handler(self, sender, instance, **kwargs):
         """
         Hooks to the pre_delete signal when a branch is active to queue delete actions.
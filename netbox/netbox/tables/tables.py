@@ -1,3 +1,4 @@
+import logging
 from copy import deepcopy
 from functools import cached_property
 
@@ -13,9 +14,8 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from django_tables2.data import TableQuerysetData
 
-from core.models import ObjectType
 from extras.choices import *
-from extras.models import CustomField, CustomLink
+from extras.metadata import metadata_cache
 from netbox.constants import EMPTY_TABLE_TEXT
 from netbox.registry import registry
 from netbox.tables import columns
@@ -31,19 +31,24 @@ __all__ = (
     'SearchTable',
 )
 
+logger = logging.getLogger('netbox.tables')
+
 
 class BaseTable(tables.Table):
     """
     Base table class for NetBox objects. Adds support for:
 
         * User configuration (column preferences)
-        * Automatic prefetching of related objects
+        * Automatic retrieval of related objects
         * BS5 styling
 
     :param user: Personalize table display for the given user (optional). Has no effect if AnonymousUser is passed.
     """
     exempt_columns = ()
 
+    # Wide fields which are not retrieved from the database unless displayed by a visible column
+    deferrable_fields = ('comments', 'local_context_data')
+
     class Meta:
         attrs = {
             'class': 'table table-hover object-list',
@@ -89,31 +94,110 @@ class BaseTable(tables.Table):
             self.sequence.remove('actions')
             self.sequence.append('actions')
 
-        # Dynamically update the table's QuerySet to ensure related fields are pre-fetched
+        # Dynamically update the table's QuerySet to ensure related fields are retrieved efficiently
         if isinstance(self.data, TableQuerysetData):
+            self.data.data = self._plan_queryset(self.data.data)
+
+    def _plan_queryset(self, queryset):
+        """
+        Plan the retrieval of the related objects displayed by visible columns. Forward ForeignKey and one-to-one
+        relations are followed using select_related() (i.e. joined to the primary query), whereas reverse and many-to-
+        many relations, and GenericForeignKeys, are prefetched. Deferrable fields which are not displayed by any
+        visible column are deferred.
+        """
+        model = self._meta.model
+
+        # Joins and deferrals can't be applied to combined (e.g. union) queries, nor to querysets which already restrict
+        # the fields retrieved
+        can_join = (
+            queryset.model is model and
+            not queryset.query.combinator and
+            queryset.query.deferred_loading == (frozenset(), True)
+        )
+
+        select_fields = set()
+        prefetch_fields = set()
+        accessed_fields = set()
+        for column in self.columns:
+            if not column.visible:
+                continue
+            accessor = column.accessor
+            related_model = model
+            join_path = []
+            prefetch_path = []
+            joinable = can_join
+            for field_name in accessor.split(accessor.SEPARATOR):
+                try:
+                    field = related_model._meta.get_field(field_name)
+                except FieldDoesNotExist:
+                    break
+                if not prefetch_path:
+                    accessed_fields.add(field_name)
+                if isinstance(field, GenericForeignKey):
+                    # Can't follow or join beyond a GenericForeignKey
+                    prefetch_path.append(field_name)
+                    joinable = False
+                    break
+                if not isinstance(field, (RelatedField, ManyToOneRel)):
+                    break
+                # Follow ForeignKeys to the related model, joining forward relations until the first reverse or
+                # many-to-many relation is encountered
+                prefetch_path.append(field_name)
+                joinable = joinable and field.concrete and (field.many_to_one or field.one_to_one)
+                if joinable:
+                    join_path.append(field_name)
+                related_model = field.remote_field.model
+            if join_path:
+                select_fields.add('__'.join(join_path))
+            if len(prefetch_path) > len(join_path):
+                prefetch_fields.add('__'.join(prefetch_path))
+
+        # Omit any prefix of a longer path
+        select_fields = sorted(
+            path for path in select_fields if not any(p.startswith(f'{path}__') for p in select_fields)
+        )
+        prefetch_fields = sorted(prefetch_fields)
+        deferred_fields = [
+            field.name for field in model._meta.concrete_fields
+            if field.name in self.deferrable_fields and field.name not in accessed_fields
+        ] if can_join else []
+
+        if select_fields:
+            queryset = queryset.select_related(*select_fields)
+        if prefetch_fields:
+            queryset = queryset.prefetch_related(*prefetch_fields)
+        if deferred_fields:
+            queryset = queryset.defer(*deferred_fields)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"{self.name}: select_related={select_fields}, prefetch_related={prefetch_fields}, "
+                f"defer={deferred_fields}; estimated queries per page: {self._estimate_query_count(queryset)}"
+            )
+
+        return queryset
+
+    @staticmethod
+    def _estimate_query_count(queryset):
+        """
+        Estimate the number of queries needed to retrieve a page of objects from the given queryset: one for the
+        objects themselves, plus one for each level of prefetched relations not already joined. (GenericForeignKeys
+        require one query per type of related object.)
+        """
+        joined = set()
+        if isinstance(queryset.query.select_related, dict):
+            def walk(tree, prefix=''):
+                for name, subtree in tree.items():
+                    joined.add(f'{prefix}{name}')
+                    walk(subtree, f'{prefix}{name}__')
+            walk(queryset.query.select_related)
+
+        levels = set()
+        for lookup in queryset._prefetch_related_lookups:
+            path = getattr(lookup, 'prefetch_through', lookup).split('__')
+            levels.update('__'.join(path[:i]) for i in range(1, len(path) + 1))
 
-            prefetch_fields = []
-            for column in self.columns:
-                if column.visible:
-                    model = getattr(self.Meta, 'model')
-                    accessor = column.accessor
-                    prefetch_path = []
-                    for field_name in accessor.split(accessor.SEPARATOR):
-                        try:
-                            field = model._meta.get_field(field_name)
-                        except FieldDoesNotExist:
-                            break
-                        if isinstance(field, (RelatedField, ManyToOneRel)):
-                            # Follow ForeignKeys to the related model
-                            prefetch_path.append(field_name)
-                            model = field.remote_field.model
-                        elif isinstance(field, GenericForeignKey):
-                            # Can't prefetch beyond a GenericForeignKey
-                            prefetch_path.append(field_name)
-                            break
-                    if prefetch_path:
-                        prefetch_fields.append('__'.join(prefetch_path))
-            self.data.data = self.data.data.prefetch_related(*prefetch_fields)
+        return 1 + len(levels - joined)
 
     def _get_columns(self, visible=True):
         columns = []
@@ -207,16 +291,14 @@ class NetBoxTable(BaseTable):
             ])
 
         # Add custom field & custom link columns
-        object_type = ObjectType.objects.get_for_model(self._meta.model)
-        custom_fields = CustomField.objects.filter(
-            object_types=object_type
-        ).exclude(ui_visible=CustomFieldUIVisibleChoices.HIDDEN)
         extra_columns.extend([
-            (f'cf_{cf.name}', columns.CustomFieldColumn(cf)) for cf in custom_fields
+            (f'cf_{cf.name}', columns.CustomFieldColumn(cf))
+            for cf in metadata_cache.get_custom_fields(self._meta.model)
+            if cf.ui_visible != CustomFieldUIVisibleChoices.HIDDEN
         ])
-        custom_links = CustomLink.objects.filter(object_types=object_type, enabled=True)
         extra_columns.extend([
-            (f'cl_{cl.name}', columns.CustomLinkColumn(cl)) for cl in custom_links
+            (f'cl_{cl.name}', columns.CustomLinkColumn(cl))
+            for cl in metadata_cache.get_custom_links(self._meta.model)
         ])
 
         super().__init__(*args, extra_columns=extra_columns, **kwargs)
@@ -0,0 +1,215 @@
+import tempfile
+import uuid
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import ObjectChange, ObjectType
+from dcim.forms import InterfaceImportForm, SiteImportForm
+from dcim.models import Region, Site
+from ipam.forms import AggregateImportForm
+from ipam.models import RIR, Aggregate
+from netbox.bulk_import import BulkImporter, get_import_view, supports_bulk_write
+from netbox.context_managers import event_tracking
+from netbox.utils import bulk_operation
+from tenancy.models import Tenant
+from users.models import ObjectPermission, User
+from utilities.request import NetBoxFakeRequest
+from utilities.testing import APITestCase
+
+
+class BulkImporterTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', is_superuser=True)
+
+        regions = (
+            Region(name='Region 1', slug='region-1'),
+            Region(name='Region 2', slug='region-2'),
+        )
+        for region in regions:
+            region.save()
+        Tenant.objects.create(name='Tenant 1', slug='tenant-1')
+
+    def _import(self, records, **kwargs):
+        request = NetBoxFakeRequest({
+            'META': {},
+            'POST': {},
+            'GET': {},
+            'FILES': {},
+            'user': self.user,
+            'path': '',
+            'id': uuid.uuid4(),
+        })
+        importer = BulkImporter(SiteImportForm, Site.objects.all(), self.user, **kwargs)
+        with event_tracking(request), bulk_operation():
+            return importer, importer.run(records)
+
+    def test_supports_bulk_write(self):
+        self.assertTrue(supports_bulk_write(SiteImportForm))
+        self.assertFalse(supports_bulk_write(InterfaceImportForm))
+
+    def test_get_import_view(self):
+        self.assertIs(get_import_view(Site).model_form, SiteImportForm)
+
+    def test_create_objects(self):
+        records = [
+            {'name': f'Site {i}', 'slug': f'site-{i}', 'status': 'active', 'region': f'Region {i % 2 + 1}'}
+            for i in range(1, 6)
+        ]
+        records[0]['tenant'] = 'Tenant 1'
+        importer, sites = self._import(records, batch_size=2)
+
+        self.assertEqual(len(sites), 5)
+        self.assertTrue(importer.bulk_write)
+        self.assertEqual(set(importer.resolved_objects['region'][2]), {'Region 1', 'Region 2'})
+        self.assertEqual(Site.objects.count(), 5)
+        self.assertEqual(Site.objects.get(name='Site 1').region.name, 'Region 2')
+        self.assertEqual(Site.objects.get(name='Site 1').tenant.name, 'Tenant 1')
+        self.assertEqual(Site.objects.get(name='Site 2').region.name, 'Region 1')
+        self.assertEqual(ObjectChange.objects.filter(changed_object_type__model='site').count(), 5)
+
+    def test_update_objects(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        records = [
+            {'id': str(site.pk), 'region': 'Region 1', 'description': 'Updated'},
+        ]
+        importer, sites = self._import(records)
+
+        site.refresh_from_db()
+        self.assertEqual(site.region.name, 'Region 1')
+        self.assertEqual(site.description, 'Updated')
+        self.assertEqual(ObjectChange.objects.get(changed_object_id=site.pk).prechange_data['description'], '')
+
+    def test_invalid_records(self):
+        records = [
+            {'name': 'Site 1', 'slug': 'site-1', 'status': 'active', 'region': 'Region 1'},
+            {'name': 'Site 2', 'slug': 'site-2', 'status': 'active', 'region': 'Region 3'},
+            {'name': 'Site 3', 'slug': 'site-3', 'status': 'invalid'},
+        ]
+        with self.assertRaises(ValidationError):
+            self._import(records)
+
+    def test_duplicate_records(self):
+        """
+        Records which violate a database constraint should be reported as validation errors.
+        """
+        records = [
+            {'name': 'Site 1', 'slug': 'site-1', 'status': 'active'},
+            {'name': 'Site 1', 'slug': 'site-1', 'status': 'active'},
+        ]
+        importer = BulkImporter(SiteImportForm, Site.objects.all(), self.user)
+        with self.assertRaises(ValidationError):
+            importer.run(records)
+        self.assertEqual(len(importer.errors), 2)
+
+    def test_conflicting_records(self):
+        """
+        Records which conflict with another record in the same batch should fail validation, even when written in bulk.
+        """
+        rir = RIR.objects.create(name='RIR 1', slug='rir-1')
+        records = [
+            {'prefix': '10.0.0.0/8', 'rir': rir.name},
+            {'prefix': '10.1.0.0/16', 'rir': rir.name},
+        ]
+        importer = BulkImporter(AggregateImportForm, Aggregate.objects.all(), self.user)
+        self.assertTrue(importer.bulk_write)
+        with self.assertRaises(ValidationError):
+            importer.run(records)
+        self.assertTrue(importer.errors)
+        self.assertFalse(Aggregate.objects.exists())
+
+
+class BulkImportAPITestCase(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('dcim-api:site-bulk-import')
+
+    def test_import_objects(self):
+        self.add_permissions('dcim.add_site', 'dcim.view_site')
+        data = {
+            'data': 'name,slug,status\nSite 1,site-1,active\nSite 2,site-2,planned',
+            'format': 'csv',
+        }
+
+        response = self.client.post(self.url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(Site.objects.get(slug='site-2').status, 'planned')
+
+    def test_import_invalid_objects(self):
+        self.add_permissions('dcim.add_site', 'dcim.view_site')
+        data = {
+            'data': 'name,slug,status\nSite 1,site-1,active\nSite 2,site-2,invalid',
+            'format': 'csv',
+        }
+
+        response = self.client.post(self.url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Site.objects.exists())
+
+        # Validation errors not recorded on the import form should also be reported
+        with patch(
+            'netbox.api.viewsets.mixins.BulkImportMixin.perform_bulk_import',
+            side_effect=ValidationError('Import failed')
+        ):
+            response = self.client.post(self.url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_objects_without_permission(self):
+        data = {
+            'data': 'name,slug,status\nSite 1,site-1,active',
+            'format': 'csv',
+        }
+
+        # Without permission to create sites
+        response = self.client.post(self.url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+
+        # With permission to create only planned sites
+        obj_perm = ObjectPermission(name='Test permission', constraints={'status': 'planned'}, actions=['add', 'view'])
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ObjectType.objects.get_for_model(Site))
+        response = self.client.post(self.url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Site.objects.exists())
+
+
+class ImportObjectsCommandTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username='superuser', is_superuser=True)
+        User.objects.create_user(username='testuser')
+
+    def _import(self, data, **kwargs):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as f:
+            f.write(data)
+            f.flush()
+            call_command('import_objects', 'dcim.site', f.name, stdout=StringIO(), stderr=StringIO(), **kwargs)
+
+    def test_import_objects(self):
+        self._import('name,slug,status\nSite 1,site-1,active\nSite 2,site-2,planned')
+        self.assertEqual(Site.objects.count(), 2)
+        self.assertEqual(ObjectChange.objects.filter(changed_object_type__model='site').count(), 2)
+
+    def test_import_invalid_objects(self):
+        with self.assertRaises(CommandError):
+            self._import('name,slug,status\nSite 1,site-1,active\nSite 2,site-2,invalid')
+        self.assertFalse(Site.objects.exists())
+
+    def test_import_objects_without_permission(self):
+        with self.assertRaises(CommandError):
+            self._import('name,slug,status\nSite 1,site-1,active', user='testuser')
+        with self.assertRaises(CommandError):
+            self._import('name,slug,status\nSite 1,site-1,active', user='nonexistent')
+        self.assertFalse(Site.objects.exists())
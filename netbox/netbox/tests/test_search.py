@@ -1,10 +1,18 @@
+import datetime
+from io import StringIO
+
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
 
 from dcim.models import Site
 from dcim.search import SiteIndex
+from extras.management.commands.reindex import CHECKPOINT_CACHE_KEY
 from extras.models import CachedValue
-from netbox.search.backends import search_backend
+from netbox.search.backends import FullTextSearchBackend, deferred_caching, search_backend
 
 
 class SearchBackendTestCase(TestCase):
@@ -111,6 +119,28 @@ class SearchBackendTestCase(TestCase):
             len(SiteIndex.fields)
         )
 
+    def test_deferred_caching(self):
+        """
+        Test that caching of objects saved within a deferred_caching() block is deferred until the end of the block
+        """
+        content_type = ContentType.objects.get_for_model(Site)
+        with deferred_caching():
+            site = Site.objects.create(name='Site 4', slug='site-4')
+            site.description = 'Fourth test site'
+            site.save()
+            self.assertFalse(
+                CachedValue.objects.filter(object_type=content_type, object_id=site.pk).exists()
+            )
+
+        self.assertTrue(
+            CachedValue.objects.filter(
+                object_type=content_type,
+                object_id=site.pk,
+                field='description',
+                value='Fourth test site'
+            ).exists()
+        )
+
     def test_remove_on_delete(self):
         """
         Test that any cached value for an object are automatically removed on delete().
@@ -151,3 +181,98 @@ class SearchBackendTestCase(TestCase):
         self.assertEqual(len(results), 1)
         results = search_backend.search('xxxxx')
         self.assertEqual(len(results), 0)
+
+    def test_full_text_search(self):
+        """
+        Test searches using the full-text search backend.
+        """
+        backend = FullTextSearchBackend()
+        backend.install()
+        backend.cache(Site.objects.all())
+
+        results = backend.search('site')
+        self.assertEqual(len(results), 3)
+        results = backend.search('fake lincoln')
+        self.assertEqual(len(results), 1)
+        results = backend.search('xxxxx')
+        self.assertEqual(len(results), 0)
+
+        # Test keyset pagination
+        results = backend.search('site', limit=2)
+        self.assertEqual(len(results), 2)
+        results = backend.search('site', after=results[-1].cursor)
+        self.assertEqual(len(results), 1)
+        with self.assertRaises(ValueError):
+            backend.search('site', after='invalid')
+
+
+class ReindexCommandTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 4)
+        ])
+
+    def setUp(self):
+        CachedValue.objects.all().delete()
+        cache.delete(CHECKPOINT_CACHE_KEY)
+
+    def get_cached_sites(self):
+        content_type = ContentType.objects.get_for_model(Site)
+        return set(CachedValue.objects.filter(object_type=content_type).values_list('object_id', flat=True))
+
+    def test_reindex(self):
+        call_command('reindex', 'dcim.site', batch_size=1, stdout=StringIO())
+        self.assertEqual(self.get_cached_sites(), set(Site.objects.values_list('pk', flat=True)))
+        self.assertIsNone(cache.get(CHECKPOINT_CACHE_KEY))
+
+    def test_reindex_resume(self):
+        site1, site2, site3 = Site.objects.order_by('pk')
+
+        # Simulate an interrupted run which reindexed the first site
+        cache.set(CHECKPOINT_CACHE_KEY, {
+            'arguments': {'models': ['dcim.site'], 'since': None, 'batch_size': 1},
+            'completed': {'dcim.site': [site1.pk]},
+        }, None)
+
+        # Resuming with a different batch size should fail, as the completed ranges no longer apply
+        with self.assertRaises(CommandError):
+            call_command('reindex', 'dcim.site', batch_size=2, resume=True, stdout=StringIO())
+
+        call_command('reindex', 'dcim.site', batch_size=1, resume=True, stdout=StringIO())
+        self.assertEqual(self.get_cached_sites(), {site2.pk, site3.pk})
+        self.assertIsNone(cache.get(CHECKPOINT_CACHE_KEY))
+
+        # Resuming when no run has been interrupted should fail
+        with self.assertRaises(CommandError):
+            call_command('reindex', 'dcim.site', batch_size=1, resume=True, stdout=StringIO())
+
+    def test_reindex_since(self):
+        site1, site2, site3 = Site.objects.order_by('pk')
+        now = timezone.now()
+        Site.objects.filter(pk=site1.pk).update(last_updated=now - datetime.timedelta(days=2))
+
+        since = (now - datetime.timedelta(days=1)).isoformat()
+        call_command('reindex', 'dcim.site', since=since, stdout=StringIO())
+        self.assertEqual(self.get_cached_sites(), {site2.pk, site3.pk})
+
+        with self.assertRaises(CommandError):
+            call_command('reindex', 'dcim.site', since='invalid', stdout=StringIO())
+
+
+class ReindexCommandWorkersTestCase(TransactionTestCase):
+    """
+    Worker processes use their own database connections, so objects must be committed to be visible to them.
+    """
+    def test_reindex_workers(self):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 4)
+        ])
+
+        call_command('reindex', 'dcim.site', workers=2, batch_size=1, stdout=StringIO())
+        content_type = ContentType.objects.get_for_model(Site)
+        self.assertEqual(
+            set(CachedValue.objects.filter(object_type=content_type).values_list('object_id', flat=True)),
+            set(Site.objects.values_list('pk', flat=True))
+        )
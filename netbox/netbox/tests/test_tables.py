@@ -1,8 +1,10 @@
 from django.template import Context, Template
 from django.test import TestCase
 
-from dcim.models import Site
+from dcim.models import Region, Site, SiteGroup
+from dcim.tables import SiteTable
 from netbox.tables import NetBoxTable, columns
+from tenancy.models import Tenant
 from utilities.testing import create_tags
 
 
@@ -35,3 +37,46 @@ class TagColumnTest(TestCase):
             'table': table
         })
         template.render(context)
+
+
+class QuerysetPlanTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name='Region 1', slug='region-1')
+        group = SiteGroup.objects.create(name='Site Group 1', slug='site-group-1')
+        tenant = Tenant.objects.create(name='Tenant 1', slug='tenant-1')
+        tags = create_tags('Alpha', 'Bravo')
+
+        sites = [
+            Site(name=f'Site {i}', slug=f'site-{i}', region=region, group=group, tenant=tenant) for i in range(1, 4)
+        ]
+        Site.objects.bulk_create(sites)
+        for site in sites:
+            site.tags.add(*tags)
+
+    def test_select_related(self):
+        table = SiteTable(Site.objects.all())
+        queryset = table.data.data
+
+        # Forward ForeignKeys are joined, and unused wide fields deferred
+        self.assertEqual(queryset.query.select_related, {'group': {}, 'region': {}, 'tenant': {}})
+        self.assertEqual(queryset.query.deferred_loading, ({'comments'}, True))
+
+        # Objects and their related objects are retrieved using a single query
+        with self.assertNumQueries(1):
+            for site in queryset:
+                self.assertEqual(site.region.name, 'Region 1')
+                self.assertEqual(site.group.name, 'Site Group 1')
+                self.assertEqual(site.tenant.name, 'Tenant 1')
+
+    def test_prefetch_related(self):
+        table = TagColumnTable(Site.objects.all())
+        queryset = table.data.data
+
+        # Many-to-many relations are prefetched
+        self.assertEqual(queryset._prefetch_related_lookups, ('tags',))
+        self.assertEqual(table._estimate_query_count(queryset), 2)
+        with self.assertNumQueries(2):
+            for site in queryset:
+                self.assertEqual(len(site.tags.all()), 2)
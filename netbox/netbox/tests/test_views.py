@@ -1,11 +1,13 @@
 import urllib.parse
+from functools import partial
+from unittest.mock import patch
 
 from django.urls import reverse
 from django.test import Client, override_settings
 
 from dcim.models import Site
 from netbox.constants import EMPTY_TABLE_TEXT
-from netbox.search.backends import search_backend
+from netbox.search.backends import FullTextSearchBackend, search_backend
 from utilities.testing import TestCase
 
 
@@ -75,6 +77,50 @@ class SearchViewTestCase(TestCase):
         content = str(response.content)
         self.assertIn(EMPTY_TABLE_TEXT, content)
 
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_search_next_results(self):
+        backend = FullTextSearchBackend()
+        backend.install()
+        url = reverse('search')
+
+        # Limit the search to four results
+        with (
+            patch.object(backend, 'search', partial(backend.search, limit=4)),
+            patch('netbox.views.misc.search_backend', backend),
+            patch('netbox.views.misc.MAX_RESULTS', 4),
+        ):
+            response = self.client.get(url, {'q': 'site'})
+            self.assertHttpStatus(response, 200)
+            first_page = {str(record.object) for record in response.context['table'].data}
+            self.assertEqual(len(first_page), 4)
+            next_cursor = response.context['next_cursor']
+            self.assertIsNotNone(next_cursor)
+
+            # Retrieve the remaining results
+            response = self.client.get(url, {'q': 'site', 'after': next_cursor})
+            self.assertHttpStatus(response, 200)
+            second_page = {str(record.object) for record in response.context['table'].data}
+            self.assertEqual(len(second_page), 2)
+            self.assertIsNone(response.context['next_cursor'])
+
+        self.assertEqual(first_page | second_page, set(Site.objects.values_list('name', flat=True)))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_search_custom_backend(self):
+        """
+        A cursor should not be passed to a custom backend which does not support cursor pagination.
+        """
+        class CustomSearchBackend:
+            def search(self, value, user=None, object_types=None, lookup=None):
+                return search_backend.search(value, user=user, object_types=object_types, lookup=lookup)
+
+        url = reverse('search')
+        with patch('netbox.views.misc.search_backend', CustomSearchBackend()):
+            response = self.client.get(url, {'q': 'red', 'after': '100:0.5:1:1'})
+        self.assertHttpStatus(response, 200)
+        self.assertIn('Site Alpha', str(response.content))
+        self.assertIsNone(response.context['next_cursor'])
+
 
 class MediaViewTestCase(TestCase):
 
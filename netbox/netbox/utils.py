@@ -1,8 +1,13 @@
+from contextlib import ExitStack, contextmanager
+
 from netbox.registry import registry
 
 __all__ = (
+    'bulk_operation',
     'get_data_backend_choices',
+    'register_bulk_operation_processor',
     'register_data_backend',
+    'register_housekeeping_task',
     'register_request_processor',
 )
 
@@ -27,6 +32,15 @@ def register_data_backend():
     return _wrapper
 
 
+def register_housekeeping_task(cls):
+    """
+    Decorator for registering a HousekeepingTask class.
+    """
+    registry['housekeeping_tasks'].append(cls)
+
+    return cls
+
+
 def register_request_processor(func):
     """
     Decorator for registering a request processor.
@@ -34,3 +48,23 @@ def register_request_processor(func):
     registry['request_processors'].append(func)
 
     return func
+
+
+def register_bulk_operation_processor(func):
+    """
+    Decorator for registering a bulk operation processor.
+    """
+    registry['bulk_operation_processors'].append(func)
+
+    return func
+
+
+@contextmanager
+def bulk_operation():
+    """
+    Apply all registered bulk operation processors for the duration of a bulk import, edit, or delete operation.
+    """
+    with ExitStack() as stack:
+        for bulk_operation_processor in registry['bulk_operation_processors']:
+            stack.enter_context(bulk_operation_processor())
+        yield
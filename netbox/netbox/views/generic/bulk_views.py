@@ -1,36 +1,40 @@
 import logging
 import re
 from copy import deepcopy
+from functools import partial
 
 from django.contrib import messages
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRel
-from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist, ValidationError
 from django.db import transaction, IntegrityError
 from django.db.models import ManyToManyField, ProtectedError, RestrictedError
 from django.db.models.fields.reverse_related import ManyToManyRel
 from django.forms import ModelMultipleChoiceField, MultipleHiddenInput
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
-from django_tables2.export import TableExport
 from mptt.models import MPTTModel
 
+from core.jobs import ExportJob
 from core.models import ObjectType
 from core.signals import clear_events
-from extras.choices import CustomFieldUIEditableChoices
-from extras.models import CustomField, ExportTemplate
+from extras.models import ExportTemplate
+from netbox.bulk_import import BulkImporter
+from netbox.choices import ImportMethodChoices
+from netbox.utils import bulk_operation
 from utilities.error_handlers import handle_protectederror
 from utilities.exceptions import AbortRequest, AbortTransaction, PermissionsViolation
+from utilities.export import stream_table_csv, stream_yaml
 from utilities.forms import BulkRenameForm, ConfirmationForm, restrict_form_fields
 from utilities.forms.bulk_import import BulkImportForm
 from utilities.htmx import htmx_partial
 from utilities.permissions import get_permission_for_model
+from utilities.request import copy_safe_request
 from utilities.views import GetReturnURLMixin, get_viewname
 from .base import BaseMultiObjectView
-from .mixins import ActionsMixin, TableMixin
+from .mixins import ActionsMixin, BackgroundJobMixin, TableMixin
 from .utils import get_prerequisite_model
 
 __all__ = (
@@ -67,15 +71,14 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
     def export_yaml(self):
         """
-        Export the queryset of objects as concatenated YAML documents.
+        Export the queryset of objects as concatenated YAML documents. Returns a generator which yields the content in
+        portions, retrieving objects from the database in chunks.
         """
-        yaml_data = [obj.to_yaml() for obj in self.queryset]
-
-        return '---\n'.join(yaml_data)
+        return stream_yaml(self.queryset)
 
     def export_table(self, table, columns=None, filename=None):
         """
-        Export all table data in CSV format.
+        Export all table data in CSV format as a streaming response.
 
         Args:
             table: The Table instance to export
@@ -89,26 +92,29 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             exclude_columns.update({
                 col for col in all_columns if col not in columns
             })
-        exporter = TableExport(
-            export_format=TableExport.CSV,
-            table=table,
-            exclude_columns=exclude_columns
-        )
-        return exporter.response(
-            filename=filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+        response = StreamingHttpResponse(
+            stream_table_csv(table, exclude_columns),
+            content_type='text/csv; charset=utf-8'
         )
+        filename = filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
-    def export_template(self, template, request):
+        return response
+
+    def export_template(self, template, request, background=False):
         """
         Render an ExportTemplate using the current queryset.
 
         Args:
             template: ExportTemplate instance
             request: The current request
+            background: True if rendering within a background job (in which case any error is raised)
         """
         try:
             return template.render_to_response(self.queryset)
         except Exception as e:
+            if background:
+                raise
             messages.error(
                 request,
                 _("There was an error rendering the selected export template ({template}): {error}").format(
@@ -121,6 +127,63 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             query_params.pop('export')
             return redirect(f'{request.path}?{query_params.urlencode()}')
 
+    def export(self, request, background=False):
+        """
+        Return a response containing the export of the current queryset indicated by the `export` query parameter.
+
+        Args:
+            request: The current request
+            background: True if rendering within a background job
+        """
+        model = self.queryset.model
+
+        # Export the current table view
+        if request.GET['export'] == 'table':
+            table = self.get_table(self.queryset, request, bulk_actions=False)
+            columns = [name for name, _ in table.selected_columns]
+            return self.export_table(table, columns)
+
+        # Render an ExportTemplate
+        elif request.GET['export']:
+            object_type = ObjectType.objects.get_for_model(model)
+            template = get_object_or_404(ExportTemplate, object_types=object_type, name=request.GET['export'])
+            return self.export_template(template, request, background=background)
+
+        # Check for YAML export support on the model
+        elif hasattr(model, 'to_yaml'):
+            response = StreamingHttpResponse(self.export_yaml(), content_type='text/yaml')
+            filename = 'netbox_{}.yaml'.format(self.queryset.model._meta.verbose_name_plural)
+            response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
+            return response
+
+        # Fall back to default table/YAML export
+        else:
+            table = self.get_table(self.queryset, request, bulk_actions=False)
+            return self.export_table(table)
+
+    def export_in_background(self, request):
+        """
+        Enqueue a background job to render the export indicated by the `export` query parameter, and redirect the
+        user to the job.
+
+        Args:
+            request: The current request
+        """
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+
+        export_request = copy_safe_request(request)
+        export_request.GET = request.GET.copy()
+        export_request.GET.pop('background')
+        job = ExportJob.enqueue(
+            user=request.user,
+            view=f'{self.__class__.__module__}.{self.__class__.__qualname__}',
+            request=export_request
+        )
+        messages.info(request, _("The export has been enqueued as job {job}.").format(job=job.pk))
+
+        return redirect(job.get_absolute_url())
+
     #
     # Request handlers
     #
@@ -133,40 +196,19 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             request: The current request
         """
         model = self.queryset.model
-        object_type = ObjectType.objects.get_for_model(model)
 
         if self.filterset:
             self.queryset = self.filterset(request.GET, self.queryset, request=request).qs
 
+        if 'export' in request.GET:
+            if request.GET.get('background'):
+                return self.export_in_background(request)
+            return self.export(request)
+
         # Determine the available actions
         actions = self.get_permitted_actions(request.user)
         has_bulk_actions = any([a.startswith('bulk_') for a in actions])
 
-        if 'export' in request.GET:
-
-            # Export the current table view
-            if request.GET['export'] == 'table':
-                table = self.get_table(self.queryset, request, has_bulk_actions)
-                columns = [name for name, _ in table.selected_columns]
-                return self.export_table(table, columns)
-
-            # Render an ExportTemplate
-            elif request.GET['export']:
-                template = get_object_or_404(ExportTemplate, object_types=object_type, name=request.GET['export'])
-                return self.export_template(template, request)
-
-            # Check for YAML export support on the model
-            elif hasattr(model, 'to_yaml'):
-                response = HttpResponse(self.export_yaml(), content_type='text/yaml')
-                filename = 'netbox_{}.yaml'.format(self.queryset.model._meta.verbose_name_plural)
-                response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
-                return response
-
-            # Fall back to default table/YAML export
-            else:
-                table = self.get_table(self.queryset, request, has_bulk_actions)
-                return self.export_table(table)
-
         # Render the objects table
         table = self.get_table(self.queryset, request, has_bulk_actions)
 
@@ -303,7 +345,7 @@ class BulkCreateView(GetReturnURLMixin, BaseMultiObjectView):
         })
 
 
-class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
+class BulkImportView(GetReturnURLMixin, BackgroundJobMixin, BaseMultiObjectView):
     """
     Import objects in bulk (CSV format).
 
@@ -392,78 +434,48 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
         """
         return object_form.save()
 
-    def create_and_update_objects(self, form, request):
-        saved_objects = []
-
-        records = list(form.cleaned_data['data'])
-
-        # Prefetch objects to be updated, if any
-        prefetch_ids = [int(record['id']) for record in records if record.get('id')]
-        prefetched_objects = {
-            obj.pk: obj
-            for obj in self.queryset.model.objects.filter(id__in=prefetch_ids)
-        } if prefetch_ids else {}
-
-        for i, record in enumerate(records, start=1):
-            instance = None
-            object_id = int(record.pop('id')) if record.get('id') else None
-
-            # Determine whether this object is being created or updated
-            if object_id:
-                try:
-                    instance = prefetched_objects[object_id]
-                except KeyError:
-                    form.add_error('data', _("Row {i}: Object with ID {id} does not exist").format(i=i, id=object_id))
-                    raise ValidationError('')
-
-                # Take a snapshot for change logging
-                if instance.pk and hasattr(instance, 'snapshot'):
-                    instance.snapshot()
-
-            else:
-                # For newly created objects, apply any default custom field values
-                custom_fields = CustomField.objects.filter(
-                    object_types=ContentType.objects.get_for_model(self.queryset.model),
-                    ui_editable=CustomFieldUIEditableChoices.YES
-                )
-                for cf in custom_fields:
-                    field_name = f'cf_{cf.name}'
-                    if field_name not in record:
-                        record[field_name] = cf.default
-
-            # Instantiate the model form for the object
-            model_form_kwargs = {
-                'data': record,
-                'instance': instance,
-            }
-            if hasattr(form, '_csv_headers'):
-                model_form_kwargs['headers'] = form._csv_headers  # Add CSV headers
-            model_form = self.model_form(**model_form_kwargs)
-
-            # When updating, omit all form fields other than those specified in the record. (No
-            # fields are required when modifying an existing object.)
-            if object_id:
-                unused_fields = [f for f in model_form.fields if f not in record]
-                for field_name in unused_fields:
-                    del model_form.fields[field_name]
-
-            restrict_form_fields(model_form, request.user)
-
-            if model_form.is_valid():
-                obj = self._save_object(form, model_form, request)
-                saved_objects.append(obj)
-            else:
-                # Replicate model form errors for display
-                for field, errors in model_form.errors.items():
-                    for err in errors:
-                        if field == '__all__':
-                            form.add_error(None, f'Record {i}: {err}')
-                        else:
-                            form.add_error(None, f'Record {i} {field}: {err}')
+    def create_and_update_objects(self, form, request, start=1):
+        """
+        Create and/or update objects from the records provided by a valid import form, returning the saved objects.
 
-                raise ValidationError("")
+        Args:
+            form: The bound BulkImportForm instance
+            request: The current request
+            start: The number of the first record (for reporting errors)
+        """
+        # Save objects individually only if the view implements custom logic for saving them
+        if self.related_object_forms or type(self).save_object is not BulkImportView.save_object:
+            save_object = partial(self._save_object, form, request=request)
+        else:
+            save_object = None
+
+        importer = BulkImporter(
+            model_form=self.model_form,
+            queryset=self.queryset,
+            user=request.user,
+            headers=getattr(form, '_csv_headers', None),
+            save_object=save_object
+        )
+        try:
+            return importer.run(form.cleaned_data['data'], start=start)
+        except ValidationError:
+            for field, message in importer.errors:
+                form.add_error(field, message)
+            raise
+
+    def run_job(self, job, request):
+        form = BulkImportForm(request.POST)
+        if not form.is_valid():
+            raise ValidationError([err for errors in form.errors.values() for err in errors])
+
+        def import_records(records, offset):
+            form.cleaned_data['data'] = records
+            try:
+                self.create_and_update_objects(form, request, start=offset + 1)
+            except (AbortTransaction, ValidationError):
+                raise ValidationError([err for errors in form.errors.values() for err in errors])
 
-        return saved_objects
+        job.process(list(form.cleaned_data['data']), import_records, self.background_chunk_size)
 
     #
     # Request handlers
@@ -488,9 +500,18 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
         if form.is_valid():
             logger.debug("Import form validation was successful")
 
+            if '_background' in request.POST:
+                # Pass the contents of any uploaded file to the job as form data
+                data = request.POST.copy()
+                if upload_file := request.FILES.get('upload_file'):
+                    upload_file.seek(0)
+                    data['data'] = upload_file.read().decode('utf-8-sig')
+                    data['import_method'] = ImportMethodChoices.DIRECT
+                return self.enqueue_job(request, data=data)
+
             try:
                 # Iterate through data and bind each record to a new model form instance.
-                with transaction.atomic():
+                with transaction.atomic(), bulk_operation():
                     new_objs = self.create_and_update_objects(form, request)
 
                     # Enforce object-level permissions
@@ -526,7 +547,7 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
         })
 
 
-class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
+class BulkEditView(GetReturnURLMixin, BackgroundJobMixin, BaseMultiObjectView):
     """
     Edit objects in bulk.
 
@@ -631,17 +652,7 @@ class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
 
         return updated_objects
 
-    #
-    # Request handlers
-    #
-
-    def get(self, request):
-        return redirect(self.get_return_url(request))
-
-    def post(self, request, **kwargs):
-        logger = logging.getLogger('netbox.views.BulkEditView')
-        model = self.queryset.model
-
+    def _get_initial_data(self, request):
         # If we are editing *all* objects in the queryset, replace the PK list with all matched objects.
         if request.POST.get('_all') and self.filterset is not None:
             pk_list = self.filterset(request.GET, self.queryset.values_list('pk', flat=True), request=request).qs
@@ -661,16 +672,51 @@ class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
         elif 'virtual_machine' in request.GET:
             initial_data['virtual_machine'] = request.GET.get('virtual_machine')
 
-        if '_apply' in request.POST:
+        return initial_data
+
+    def run_job(self, job, request):
+        form = self.form(request.POST, initial=self._get_initial_data(request))
+        restrict_form_fields(form, request.user)
+        if not form.is_valid():
+            raise ValidationError([err for errors in form.errors.values() for err in errors])
+
+        def update_objects(pk_list, offset):
+            form.cleaned_data['pk'] = pk_list
+            updated_objects = self._update_objects(form, request)
+
+            # Enforce object-level permissions
+            object_count = self.queryset.filter(pk__in=[obj.pk for obj in updated_objects]).count()
+            if object_count != len(updated_objects):
+                raise PermissionsViolation
+
+        job.process([obj.pk for obj in form.cleaned_data['pk']], update_objects, self.background_chunk_size)
+
+    #
+    # Request handlers
+    #
+
+    def get(self, request):
+        return redirect(self.get_return_url(request))
+
+    def post(self, request, **kwargs):
+        logger = logging.getLogger('netbox.views.BulkEditView')
+        model = self.queryset.model
+        initial_data = self._get_initial_data(request)
+        pk_list = initial_data['pk']
+
+        if '_apply' in request.POST or '_background' in request.POST:
             form = self.form(request.POST, initial=initial_data)
             restrict_form_fields(form, request.user)
 
             if form.is_valid():
                 logger.debug("Form validation was successful")
 
+                if '_background' in request.POST:
+                    return self.enqueue_job(request)
+
                 try:
 
-                    with transaction.atomic():
+                    with transaction.atomic(), bulk_operation():
                         updated_objects = self._update_objects(form, request)
 
                         # Enforce object-level permissions
@@ -813,7 +859,7 @@ class BulkRenameView(GetReturnURLMixin, BaseMultiObjectView):
         })
 
 
-class BulkDeleteView(GetReturnURLMixin, BaseMultiObjectView):
+class BulkDeleteView(GetReturnURLMixin, BackgroundJobMixin, BaseMultiObjectView):
     """
     Delete objects in bulk.
 
@@ -837,6 +883,43 @@ class BulkDeleteView(GetReturnURLMixin, BaseMultiObjectView):
 
         return BulkDeleteForm
 
+    def _get_pk_list(self, request):
+        # Are we deleting *all* objects in the queryset or just a selected subset?
+        if request.POST.get('_all'):
+            qs = self.queryset.model.objects.all()
+            if self.filterset is not None:
+                qs = self.filterset(request.GET, qs, request=request).qs
+            return qs.only('pk').values_list('pk', flat=True)
+
+        return [int(pk) for pk in request.POST.getlist('pk')]
+
+    def run_job(self, job, request):
+        form = self.get_form()(request.POST)
+        if not form.is_valid():
+            raise ValidationError([err for errors in form.errors.values() for err in errors])
+
+        def delete_objects(pk_list, offset):
+            for obj in self.queryset.filter(pk__in=pk_list):
+                # Take a snapshot of change-logged models
+                if hasattr(obj, 'snapshot'):
+                    obj.snapshot()
+                try:
+                    obj.delete()
+                except (ProtectedError, RestrictedError) as e:
+                    if type(e) is ProtectedError:
+                        dependent_objects = list(e.protected_objects)
+                    else:
+                        dependent_objects = list(e.restricted_objects)
+                    raise AbortRequest(
+                        _("Unable to delete {object}. {count} dependent objects were found.").format(
+                            object=obj,
+                            count=len(dependent_objects)
+                        )
+                    )
+
+        pk_list = list(self.queryset.filter(pk__in=self._get_pk_list(request)).values_list('pk', flat=True))
+        job.process(pk_list, delete_objects, self.background_chunk_size)
+
     #
     # Request handlers
     #
@@ -847,28 +930,22 @@ class BulkDeleteView(GetReturnURLMixin, BaseMultiObjectView):
     def post(self, request, **kwargs):
         logger = logging.getLogger('netbox.views.BulkDeleteView')
         model = self.queryset.model
-
-        # Are we deleting *all* objects in the queryset or just a selected subset?
-        if request.POST.get('_all'):
-            qs = model.objects.all()
-            if self.filterset is not None:
-                qs = self.filterset(request.GET, qs, request=request).qs
-            pk_list = qs.only('pk').values_list('pk', flat=True)
-        else:
-            pk_list = [int(pk) for pk in request.POST.getlist('pk')]
-
+        pk_list = self._get_pk_list(request)
         form_cls = self.get_form()
 
-        if '_confirm' in request.POST:
+        if '_confirm' in request.POST or '_background' in request.POST:
             form = form_cls(request.POST)
             if form.is_valid():
                 logger.debug("Form validation was successful")
 
+                if '_background' in request.POST:
+                    return self.enqueue_job(request)
+
                 # Delete objects
                 queryset = self.queryset.filter(pk__in=pk_list)
                 deleted_count = queryset.count()
                 try:
-                    with transaction.atomic():
+                    with transaction.atomic(), bulk_operation():
                         for obj in queryset:
                             # Take a snapshot of change-logged models
                             if hasattr(obj, 'snapshot'):
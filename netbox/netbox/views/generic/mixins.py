@@ -1,8 +1,15 @@
+from django.contrib import messages
+from django.shortcuts import redirect
+from django.utils.translation import gettext as _
+
+from core.jobs import BulkOperationJob
 from netbox.constants import DEFAULT_ACTION_PERMISSIONS
 from utilities.permissions import get_permission_for_model
+from utilities.request import copy_safe_request
 
 __all__ = (
     'ActionsMixin',
+    'BackgroundJobMixin',
     'TableMixin',
 )
 
@@ -36,6 +43,52 @@ class ActionsMixin:
         return permitted_actions
 
 
+class BackgroundJobMixin:
+    """
+    Enables a bulk operation view to perform its work within a background job (when the `_background` field has been
+    submitted) rather than while processing the request. The job processes objects in chunks, committing each chunk
+    separately and recording its progress as it goes.
+
+    Attributes:
+        background_chunk_size: The maximum number of objects to process within each transaction
+    """
+    background_chunk_size = 200
+
+    def enqueue_job(self, request, data=None):
+        """
+        Enqueue a background job to perform the requested operation, and redirect the user to the job.
+
+        Args:
+            request: The current request
+            data: The POST data to pass to the job, if other than that submitted with the request
+        """
+        job_request = copy_safe_request(request)
+        job_request.POST = (data or request.POST).copy()
+        job_request.POST.pop('_background', None)
+        job_request.FILES = {}
+        job = BulkOperationJob.enqueue(
+            user=request.user,
+            view=f'{self.__class__.__module__}.{self.__class__.__qualname__}',
+            request=job_request
+        )
+        messages.info(request, _("The operation has been enqueued as job {job}.").format(job=job.pk))
+
+        return redirect(job.get_absolute_url())
+
+    def run_job(self, job, request):
+        """
+        Perform the operation within a background job. Implementations should call `job.process()` to process each
+        chunk of objects.
+
+        Args:
+            job: The BulkOperationJob instance
+            request: A copy of the request which initiated the operation
+        """
+        raise NotImplementedError(_("{class_name} must implement run_job()").format(
+            class_name=self.__class__.__name__
+        ))
+
+
 class TableMixin:
 
     def get_table(self, data, request, bulk_actions=True):
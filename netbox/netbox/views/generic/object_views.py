@@ -14,6 +14,7 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
 
 from core.signals import clear_events
+from utilities.counters import deferred_counter_updates
 from utilities.error_handlers import handle_protectederror
 from utilities.exceptions import AbortRequest, PermissionsViolation
 from utilities.forms import ConfirmationForm, restrict_form_fields
@@ -440,7 +441,9 @@ class ObjectDeleteView(GetReturnURLMixin, BaseObjectView):
             logger.debug("Form validation was successful")
 
             try:
-                obj.delete()
+                # Apply the changes to counters made by the deletion of any dependent objects together
+                with transaction.atomic(), deferred_counter_updates():
+                    obj.delete()
 
             except (ProtectedError, RestrictedError) as e:
                 logger.info(f"Caught {type(e)} while attempting to delete objects")
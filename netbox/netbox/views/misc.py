@@ -16,7 +16,7 @@ from extras.constants import DEFAULT_DASHBOARD
 from extras.dashboard.utils import get_dashboard, get_default_dashboard
 from netbox.forms import SearchForm
 from netbox.search import LookupTypes
-from netbox.search.backends import search_backend
+from netbox.search.backends import MAX_RESULTS, search_backend
 from netbox.tables import SearchTable
 from utilities.htmx import htmx_partial
 from utilities.paginator import EnhancedPaginator, get_paginate_count
@@ -70,6 +70,7 @@ class SearchView(ConditionalLoginRequiredMixin, View):
     def get(self, request):
         results = []
         highlight = None
+        next_cursor = None
 
         # Initialize search form
         form = SearchForm(request.GET) if 'q' in request.GET else SearchForm()
@@ -83,12 +84,24 @@ class SearchView(ConditionalLoginRequiredMixin, View):
                 object_types.append(ContentType.objects.get_by_natural_key(app_label, model_name))
 
             lookup = form.cleaned_data['lookup'] or LookupTypes.PARTIAL
-            results = search_backend.search(
-                form.cleaned_data['q'],
-                user=request.user,
-                object_types=object_types,
-                lookup=lookup
-            )
+            supports_cursor = getattr(search_backend, 'supports_cursor', False)
+            search_kwargs = {}
+            if supports_cursor and request.GET.get('after'):
+                search_kwargs['after'] = request.GET['after']
+            try:
+                results = search_backend.search(
+                    form.cleaned_data['q'],
+                    user=request.user,
+                    object_types=object_types,
+                    lookup=lookup,
+                    **search_kwargs
+                )
+            except ValueError:
+                messages.error(request, _("Invalid search cursor."))
+
+            # If the backend supports pagination, retrieve the cursor for the next set of results
+            if supports_cursor and len(results) >= MAX_RESULTS:
+                next_cursor = results[-1].cursor
 
             # If performing a regex search, pass the highlight value as a compiled pattern
             if form.cleaned_data['lookup'] == LookupTypes.REGEX:
@@ -116,6 +129,7 @@ class SearchView(ConditionalLoginRequiredMixin, View):
         return render(request, 'search.html', {
             'form': form,
             'table': table,
+            'next_cursor': next_cursor,
         })
 
 
@@ -1,10 +1,52 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.apps import apps
-from django.db.models import F, Count, OuterRef, Subquery
+from django.db.models import Case, F, Count, OuterRef, Subquery, Value, When
 from django.db.models.signals import post_delete, post_save, pre_delete
 
 from netbox.registry import registry
+from netbox.signals import post_bulk_create
+from netbox.utils import register_bulk_operation_processor
 from .fields import CounterCacheField
 
+# Accumulates counter changes while counter updates are deferred
+deferred_counter_deltas = ContextVar('deferred_counter_deltas', default=None)
+
+
+class CounterDeltas:
+    """
+    An accumulator of changes to counter fields, which merges all changes to each field of each object. Accumulated
+    changes are applied using at most one UPDATE statement per object; objects whose counters change by the same
+    amounts share a single statement.
+    """
+    def __init__(self):
+        # Maps each model to a mapping of PKs to the changes in each of the object's counters
+        self.deltas = defaultdict(lambda: defaultdict(Counter))
+
+    def __bool__(self):
+        return bool(self.deltas)
+
+    def add(self, model, pk, counter_name, value):
+        self.deltas[model][pk][counter_name] += value
+
+    def apply(self):
+        for model, objects in self.deltas.items():
+
+            # Group the objects by their (non-zero) counter changes
+            groups = defaultdict(list)
+            for pk, values in objects.items():
+                if changes := tuple(sorted((name, value) for name, value in values.items() if value)):
+                    groups[changes].append(pk)
+
+            for changes, pks in groups.items():
+                model.objects.filter(pk__in=sorted(pks)).update(**{
+                    name: F(name) + value for name, value in changes
+                })
+
+        self.deltas.clear()
+
 
 def get_counters_for_model(model):
     """
@@ -23,6 +65,37 @@ def update_counter(model, pk, counter_name, value):
     )
 
 
+def update_counters(model, counter_name, values):
+    """
+    Increment or decrement a counter field on multiple objects using a single query. Values are given as a mapping of
+    primary keys to the amounts by which their counters are to be incremented (or decremented, if negative).
+    """
+    if not values:
+        return
+    if len(values) == 1:
+        pk, value = next(iter(values.items()))
+        return update_counter(model, pk, counter_name, value)
+
+    model.objects.filter(pk__in=values).update(**{
+        counter_name: F(counter_name) + Case(
+            *[When(pk=pk, then=Value(value)) for pk, value in values.items()],
+            default=Value(0)
+        )
+    })
+
+
+def adjust_counters(model, counter_name, values):
+    """
+    Increment or decrement a counter field on one or more objects, given as a mapping of primary keys to values. The
+    changes are applied immediately, unless counter updates are being deferred.
+    """
+    if (deltas := deferred_counter_deltas.get()) is not None:
+        for pk, value in values.items():
+            deltas.add(model, pk, counter_name, value)
+    else:
+        update_counters(model, counter_name, {pk: value for pk, value in values.items() if value})
+
+
 def update_counts(model, field_name, related_query):
     """
     Perform a bulk update for the given model and counter field. For example,
@@ -56,13 +129,31 @@ def post_save_receiver(sender, instance, created, **kwargs):
         old_pk = instance.tracker.get(field_name) if has_old_field else None
 
         # Update the counters on the old and/or new parents as needed
+        values = Counter()
         if old_pk is not None:
-            update_counter(parent_model, old_pk, counter_name, -1)
+            values[old_pk] -= 1
         if new_pk is not None and (has_old_field or created):
-            update_counter(parent_model, new_pk, counter_name, 1)
+            values[new_pk] += 1
+        adjust_counters(parent_model, counter_name, values)
+
+
+def post_bulk_create_receiver(sender, instances, **kwargs):
+    """
+    Update counter fields on related objects when TrackingModelMixin subclass instances are created in bulk. Each
+    counter is updated using a single query.
+    """
+    for field_name, counter_name in get_counters_for_model(sender):
+        parent_model = sender._meta.get_field(field_name).related_model
+        values = Counter(getattr(instance, field_name, None) for instance in instances)
+        values.pop(None, None)
+        adjust_counters(parent_model, counter_name, values)
 
 
 def pre_delete_receiver(sender, instance, origin, **kwargs):
+    # Objects deleted by cascade have just been retrieved from the database, so only the object on which delete() was
+    # called might have been removed already
+    if origin is not instance:
+        return
     model = instance._meta.model
     if not model.objects.filter(pk=instance.pk).exists():
         instance._previously_removed = True
@@ -78,7 +169,29 @@ def post_delete_receiver(sender, instance, origin, **kwargs):
 
         # Decrement the parent's counter by one
         if parent_pk is not None and not hasattr(instance, "_previously_removed"):
-            update_counter(parent_model, parent_pk, counter_name, -1)
+            adjust_counters(parent_model, counter_name, {parent_pk: -1})
+
+
+@register_bulk_operation_processor
+@contextmanager
+def deferred_counter_updates():
+    """
+    Defer updates to counter fields until the end of the block, then apply the accumulated changes to each object at
+    once. Nested blocks defer to the outermost one. The changes are discarded if an exception is raised, as the
+    enclosing transaction is expected to be rolled back.
+    """
+    if deferred_counter_deltas.get() is not None:
+        yield
+        return
+
+    token = deferred_counter_deltas.set(CounterDeltas())
+    try:
+        yield
+        deltas = deferred_counter_deltas.get()
+    finally:
+        deferred_counter_deltas.reset(token)
+
+    deltas.apply()
 
 
 #
@@ -87,7 +200,8 @@ def post_delete_receiver(sender, instance, origin, **kwargs):
 
 def connect_counters(*models):
     """
-    Register counter fields and connect post_save & post_delete signal handlers for the affected models.
+    Register counter fields and connect post_save, post_bulk_create & post_delete signal handlers for the affected
+    models.
     """
     for model in models:
 
@@ -110,6 +224,12 @@ def connect_counters(*models):
                 weak=False,
                 dispatch_uid=f'{model._meta.label}.{field.name}'
             )
+            post_bulk_create.connect(
+                post_bulk_create_receiver,
+                sender=to_model,
+                weak=False,
+                dispatch_uid=f'{model._meta.label}.{field.name}'
+            )
             pre_delete.connect(
                 pre_delete_receiver,
                 sender=to_model,
@@ -0,0 +1,79 @@
+import csv
+import io
+
+from django_tables2.data import TableQuerysetData
+from django_tables2.rows import BoundRows
+
+__all__ = (
+    'EXPORT_CHUNK_SIZE',
+    'buffer_stream',
+    'stream_table_csv',
+    'stream_yaml',
+)
+
+# The number of objects to retrieve from the database (and for which to prefetch related objects) at a time
+EXPORT_CHUNK_SIZE = 2000
+
+# The minimum length of each portion of content yielded by a streaming export (other than the last)
+STREAM_BUFFER_SIZE = 65536
+
+
+def buffer_stream(iterable, size=STREAM_BUFFER_SIZE):
+    """
+    Join the strings yielded by an iterable into portions of at least the specified length.
+    """
+    buffer = []
+    length = 0
+    for value in iterable:
+        buffer.append(value)
+        length += len(value)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_table_csv(table, exclude_columns=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the contents of a table in CSV format. Where the table is backed by a QuerySet, its objects are retrieved
+    in chunks (with any related objects prefetched for each chunk) rather than all at once.
+
+    Args:
+        table: The Table instance to export
+        exclude_columns: An iterable of names of columns to omit
+        chunk_size: The number of objects to retrieve from the database at a time
+    """
+    if isinstance(table.data, TableQuerysetData):
+        table.rows = BoundRows(data=table.data.data.iterator(chunk_size=chunk_size), table=table)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in table.as_values(exclude_columns):
+        writer.writerow(row)
+        if buffer.tell() >= STREAM_BUFFER_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def stream_yaml(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the YAML representation of each object in a QuerySet as concatenated YAML documents, retrieving objects in
+    chunks.
+
+    Args:
+        queryset: The QuerySet to export. Its model must implement `to_yaml()`.
+        chunk_size: The number of objects to retrieve from the database at a time
+    """
+    def iter_documents():
+        for i, obj in enumerate(queryset.iterator(chunk_size=chunk_size)):
+            if i:
+                yield '---\n'
+            yield obj.to_yaml()
+
+    return buffer_stream(iter_documents())
@@ -57,7 +57,13 @@ class CSVModelChoiceField(forms.ModelChoiceField):
         'invalid_choice': _('Object not found: %(value)s'),
     }
 
+    # An optional dictionary mapping values to objects which have already been retrieved (e.g. when importing many
+    # records at once). Values not found here are looked up as normal.
+    resolved_objects = None
+
     def to_python(self, value):
+        if self.resolved_objects and type(value) in (str, int) and str(value) in self.resolved_objects:
+            return self.resolved_objects[str(value)]
         try:
             return super().to_python(value)
         except MultipleObjectsReturned:
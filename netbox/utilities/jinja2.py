@@ -1,12 +1,31 @@
+import threading
+from collections import OrderedDict
+
 from django.apps import apps
+from django.conf import settings
 from jinja2 import BaseLoader, TemplateNotFound
 from jinja2.meta import find_referenced_templates
 from jinja2.sandbox import SandboxedEnvironment
 
+from prometheus_client import Counter
+
 from netbox.config import get_config
 
 __all__ = (
     'DataFileLoader',
+    'TemplateCache',
+    'render_jinja2',
+    'stream_jinja2',
+    'template_cache',
+)
+
+template_cache_hits = Counter(
+    'netbox_jinja2_template_cache_hits',
+    'Number of Jinja2 templates retrieved from the compiled template cache'
+)
+template_cache_misses = Counter(
+    'netbox_jinja2_template_cache_misses',
+    'Number of Jinja2 templates compiled due to a template cache miss'
 )
 
 
@@ -44,6 +63,90 @@ class DataFileLoader(BaseLoader):
         self._template_cache.update(templates)
 
 
+class TemplateCache:
+    """
+    A process-wide LRU cache of compiled Jinja2 templates. Templates are keyed by their source and by the set of
+    custom filters with which they were compiled, so that a change to either results in the template being compiled
+    anew. A single sandboxed environment is shared among all templates compiled with the same set of filters.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._environments = {}
+        self._templates = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        return settings.JINJA2_TEMPLATE_CACHE_SIZE
+
+    def get_environment(self, filters):
+        """
+        Return the shared SandboxedEnvironment for the given set of filters (a tuple of (name, callable) pairs).
+        """
+        try:
+            return self._environments[filters]
+        except KeyError:
+            pass
+        environment = SandboxedEnvironment()
+        environment.filters.update(filters)
+        with self._lock:
+            # Retain only the environment for the current set of filters
+            self._environments = {filters: environment}
+        return environment
+
+    def get_template(self, template_code, filters):
+        """
+        Return the compiled Template for the given source and filters (a dictionary mapping names to callables),
+        compiling it if not already cached.
+        """
+        filters = tuple(sorted(filters.items(), key=lambda item: item[0]))
+        key = (template_code, filters)
+
+        with self._lock:
+            if (template := self._templates.get(key)) is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                template_cache_hits.inc()
+                return template
+            self.misses += 1
+        template_cache_misses.inc()
+
+        # Compile the template outside the lock; a concurrent miss for the same key merely compiles it twice
+        template = self.get_environment(filters).from_string(source=template_code)
+        if self.maxsize:
+            with self._lock:
+                self._templates[key] = template
+                while len(self._templates) > self.maxsize:
+                    self._templates.popitem(last=False)
+
+        return template
+
+    def clear(self):
+        """
+        Discard all compiled templates and environments, and reset the hit & miss counts.
+        """
+        with self._lock:
+            self._environments = {}
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Return a dictionary reporting the cache's hits, misses, current size, and maximum size.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._templates),
+            'maxsize': self.maxsize,
+        }
+
+
+template_cache = TemplateCache()
+
+
 #
 # Utility functions
 #
@@ -52,6 +155,14 @@ def render_jinja2(template_code, context):
     """
     Render a Jinja2 template with the provided context. Return the rendered content.
     """
-    environment = SandboxedEnvironment()
-    environment.filters.update(get_config().JINJA2_FILTERS)
-    return environment.from_string(source=template_code).render(**context)
+    template = template_cache.get_template(template_code, get_config().JINJA2_FILTERS)
+    return template.render(**context)
+
+
+def stream_jinja2(template_code, context):
+    """
+    Render a Jinja2 template with the provided context incrementally. Return a generator which yields the rendered
+    content in portions as it is produced.
+    """
+    template = template_cache.get_template(template_code, get_config().JINJA2_FILTERS)
+    return template.generate(**context)
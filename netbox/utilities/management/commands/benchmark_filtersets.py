@@ -0,0 +1,69 @@
+import timeit
+from functools import partial
+
+import django_filters
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from dcim.filtersets import DeviceFilterSet, InterfaceFilterSet
+from netbox.filtersets import NetBoxModelFilterSet
+
+# Representative query parameters for each FilterSet
+FILTERSET_PARAMS = (
+    (DeviceFilterSet, 'q=core&status=active&name__ic=sw&has_primary_ip=true'),
+    (InterfaceFilterSet, 'q=eth&enabled=true&mgmt_only=false&name__isw=xe-'),
+)
+
+
+def uncompiled_filterset(filterset_class, data):
+    """
+    Instantiate a FilterSet with all of its filters generated and bound, as BaseFilterSet did previously.
+    """
+    filters = filterset_class.get_filters()
+    if issubclass(filterset_class, NetBoxModelFilterSet):
+        filters.update(filterset_class.get_custom_field_filters())
+
+    filterset = filterset_class.__new__(filterset_class)
+    filterset.base_filters = filters
+    django_filters.FilterSet.__init__(filterset, data)
+
+    return filterset
+
+
+class Command(BaseCommand):
+    help = "Measure the cost of instantiating and applying large FilterSets"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--number", type=int, default=20,
+            help="Number of FilterSets of each type to instantiate per measurement (default: 20)"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5,
+            help="Number of times to repeat each measurement; the fastest is reported (default: 5)"
+        )
+
+    def handle(self, *args, **options):
+        for filterset_class, params in FILTERSET_PARAMS:
+            data = QueryDict(params)
+
+            # Verify that both methods produce the same query
+            if str(uncompiled_filterset(filterset_class, data).qs.query) != str(filterset_class(data).qs.query):
+                raise CommandError(f"Queries produced by {filterset_class.__name__} differ.")
+
+            self.stdout.write(f'{filterset_class.__name__} ({params}):')
+            results = {}
+            for name, func in (
+                ('uncompiled', partial(uncompiled_filterset, filterset_class)),
+                ('compiled', filterset_class),
+            ):
+                elapsed = min(timeit.repeat(
+                    lambda: func(data).qs,
+                    repeat=options['repeat'],
+                    number=options['number']
+                ))
+                results[name] = elapsed / options['number'] * 1000
+                self.stdout.write(f'  {name}: {results[name]:.2f} ms per instance')
+            self.stdout.write(f"  Speedup: {results['uncompiled'] / results['compiled']:.1f}x")
+
+        self.stdout.write(self.style.SUCCESS('Finished.'))
@@ -0,0 +1,59 @@
+import json
+import timeit
+
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+
+from dcim.models import Device, Interface
+from utilities.serialization import serialize_object
+
+
+def django_serialize_object(obj):
+    """
+    Serialize an object using Django's JSON serializer, as serialize_object() did previously.
+    """
+    data = json.loads(serializers.serialize('json', [obj]))[0]['fields']
+    if hasattr(obj, 'custom_field_data'):
+        data['custom_fields'] = data.pop('custom_field_data')
+    data['tags'] = sorted([tag.name for tag in obj.tags.all()])
+
+    return data
+
+
+class Command(BaseCommand):
+    help = "Measure the per-object cost of serializing devices and interfaces for change logging"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count", type=int, default=100,
+            help="Number of objects of each type to serialize (default: 100)"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5,
+            help="Number of times to repeat each measurement; the fastest is reported (default: 5)"
+        )
+
+    def handle(self, *args, **options):
+        for model in (Device, Interface):
+            instances = list(model.objects.prefetch_related('tags')[:options['count']])
+            if not instances:
+                raise CommandError(f"No {model._meta.verbose_name_plural} found.")
+
+            # Verify that both methods produce the same representation
+            for instance in instances:
+                if serialize_object(instance) != django_serialize_object(instance):
+                    raise CommandError(f"Serialized representations of {instance!r} differ.")
+
+            self.stdout.write(f'{model._meta.verbose_name_plural.title()} ({len(instances)}):')
+            results = {}
+            for name, func in (('django', django_serialize_object), ('serialize_object', serialize_object)):
+                elapsed = min(timeit.repeat(
+                    lambda: [func(instance) for instance in instances],
+                    repeat=options['repeat'],
+                    number=1
+                ))
+                results[name] = elapsed / len(instances) * 1_000_000
+                self.stdout.write(f'  {name}: {results[name]:.1f} µs per object')
+            self.stdout.write(f"  Speedup: {results['django'] / results['serialize_object']:.1f}x")
+
+        self.stdout.write(self.style.SUCCESS('Finished.'))
@@ -1,19 +1,79 @@
+import multiprocessing
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from django.core.management.base import BaseCommand
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Count, Max, Min
 
 from netbox.registry import registry
-from utilities.counters import update_counts
+from utilities.counters import CounterDeltas
+
+
+def recalculate_range(label, counters, start, end):
+    """
+    Recalculate the counter fields of all objects of the specified model with a primary key in the range [start, end),
+    correcting any which are inaccurate. Counters are specified as a mapping of counter field names to the label and
+    foreign key field of the related model being counted. Returns the number of objects corrected.
+    """
+    model = apps.get_model(label)
+    counter_names = list(counters)
+
+    with transaction.atomic():
+        objects = model.objects.filter(pk__gte=start, pk__lt=end).select_for_update()
+        current = {
+            pk: dict(zip(counter_names, values)) for pk, *values in objects.values_list('pk', *counter_names)
+        }
+        if not current:
+            return 0
+
+        # Count the related objects assigned to each object in the range
+        expected = defaultdict(lambda: dict.fromkeys(counter_names, 0))
+        for counter_name, (related_label, field_name) in counters.items():
+            related_objects = apps.get_model(related_label).objects.filter(**{
+                f'{field_name}__gte': start,
+                f'{field_name}__lt': end,
+            })
+            for pk, count in related_objects.order_by().values_list(field_name).annotate(count=Count('pk')):
+                expected[pk][counter_name] = count
+
+        deltas = CounterDeltas()
+        corrected = 0
+        for pk, values in current.items():
+            if (expected_values := expected[pk]) != values:
+                corrected += 1
+                for counter_name, value in values.items():
+                    deltas.add(model, pk, counter_name, expected_values[counter_name] - value)
+        deltas.apply()
+
+    return corrected
 
 
 class Command(BaseCommand):
     help = "Force a recalculation of all cached counter fields"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args',
+            metavar='app_label[.ModelName]',
+            nargs='*',
+            help='One or more apps or models whose counters are to be recalculated',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Number of worker processes to use (default: 1)"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=10000, dest='batch_size',
+            help="Size of the primary key range assigned to a worker at a time (default: 10000)"
+        )
+
     @staticmethod
     def collect_models():
         """
         Query the registry to find all models which have one or more counter fields. Return a mapping of counter fields
-        to related query names for each model.
+        to the label and foreign key field of the related model for each model.
         """
         models = defaultdict(dict)
 
@@ -21,14 +81,75 @@ class Command(BaseCommand):
             for field_name, counter_name in field_mappings.items():
                 fk_field = model._meta.get_field(field_name)        # Interface.device
                 parent_model = fk_field.related_model               # Device
-                related_query_name = fk_field.related_query_name()  # 'interfaces'
-                models[parent_model][counter_name] = related_query_name
+                models[parent_model][counter_name] = (model._meta.label, field_name)
 
         return models
 
-    def handle(self, *model_names, **options):
-        for model, mappings in self.collect_models().items():
-            for field_name, related_query in mappings.items():
-                update_counts(model, field_name, related_query)
+    def _get_models(self, *model_labels):
+        models = self.collect_models()
+        if not model_labels:
+            return models
+
+        selected = {}
+        for label in model_labels:
+            labels = label.lower().split('.')
+            matches = {
+                model: counters for model, counters in models.items()
+                if labels == [model._meta.app_label, model._meta.model_name][:len(labels)]
+            }
+            if not matches or len(labels) > 2:
+                raise CommandError(f"No counters found for {label}")
+            selected.update(matches)
+
+        return selected
+
+    @staticmethod
+    def _get_ranges(model, batch_size):
+        """
+        Partition the primary keys of a model into ranges of the given size.
+        """
+        bounds = model.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            return []
+
+        return [
+            (i * batch_size, (i + 1) * batch_size)
+            for i in range(bounds['first'] // batch_size, bounds['last'] // batch_size + 1)
+        ]
+
+    def handle(self, *model_labels, **options):
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError("--workers and --batch-size must be positive integers.")
+        models = self._get_models(*model_labels)
+
+        # Start the worker processes (if any). Database connections are closed first so that they are not shared with
+        # the workers.
+        executor = None
+        if options['workers'] > 1:
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                max_workers=options['workers'],
+                mp_context=multiprocessing.get_context('fork')
+            )
+
+        try:
+            for model, counters in models.items():
+                label = model._meta.label
+                self.stdout.write(f'  {label.lower()}... ', ending='')
+                self.stdout.flush()
+
+                ranges = self._get_ranges(model, options['batch_size'])
+                if executor is None:
+                    corrected = sum(recalculate_range(label, counters, start, end) for start, end in ranges)
+                else:
+                    futures = [
+                        executor.submit(recalculate_range, label, counters, start, end) for start, end in ranges
+                    ]
+                    corrected = sum(future.result() for future in as_completed(futures))
+
+                self.stdout.write(f'{corrected} objects corrected.')
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
         self.stdout.write(self.style.SUCCESS('Finished.'))
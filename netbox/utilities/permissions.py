@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 from django.conf import settings
 from django.apps import apps
 from django.db.models import Q
@@ -6,6 +9,7 @@ from django.utils.translation import gettext_lazy as _
 from users.constants import CONSTRAINT_TOKEN_USER
 
 __all__ = (
+    'get_constraints_fingerprint',
     'get_permission_for_model',
     'permission_is_exempt',
     'qs_filter_from_constraints',
@@ -112,3 +116,31 @@ def qs_filter_from_constraints(constraints, tokens=None):
             return Q()
 
     return params
+
+
+def get_constraints_fingerprint(user, permission):
+    """
+    Return a string identifying the set of objects to which a user has been granted the specified permission: users
+    whose permissions are subject to identical constraints receive the same fingerprint. This allows content which
+    has been filtered by permission (e.g. using RestrictedQuerySet.restrict()) to be shared among users.
+
+    Args:
+        user: User instance. If None, all objects are permitted.
+        permission: Permission name in the format <app_label>.<action>_<model>
+    """
+    if user is None or user.is_superuser or permission_is_exempt(permission):
+        return 'all'
+    if not user.is_authenticated or permission not in user.get_all_permissions():
+        return 'none'
+
+    constraints = user._object_perm_cache[permission]
+    if not constraints or not all(constraints):
+        # No constraints (or a null constraint) permit model-level access
+        return 'all'
+    constraints = json.dumps(constraints, sort_keys=True, default=str)
+
+    # Constraints which reference the user apply to that user alone
+    if CONSTRAINT_TOKEN_USER in constraints:
+        constraints = f'{user.pk}:{constraints}'
+
+    return hashlib.sha256(constraints.encode()).hexdigest()
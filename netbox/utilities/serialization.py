@@ -1,21 +1,119 @@
+import datetime
+import decimal
 import json
+import uuid
 
 from django.contrib.contenttypes.models import ContentType
 from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Field
+from django.utils.encoding import is_protected_type
+from django.utils.functional import Promise
 
 from extras.utils import is_taggable
 
 __all__ = (
     'deserialize_object',
+    'get_field_serializers',
     'serialize_object',
 )
 
+# Types which are represented natively in JSON
+JSON_TYPES = (str, int, float, bool)
+
+# Types which DjangoJSONEncoder represents as strings
+ENCODED_TYPES = (datetime.date, datetime.time, datetime.timedelta, decimal.Decimal, uuid.UUID, Promise)
+
+json_encoder = DjangoJSONEncoder()
+
+# Compiled field serializers, keyed by model
+field_serializers = {}
+
+
+def to_json_value(value):
+    """
+    Return the value as it would appear after being encoded to JSON by DjangoJSONEncoder and decoded again.
+    """
+    if value is None or type(value) in JSON_TYPES:
+        return value
+    if isinstance(value, ENCODED_TYPES):
+        return json_encoder.default(value)
+    return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+
+
+def get_field_value_serializer(field):
+    """
+    Return a function which returns the serialized value of a concrete field on an object, replicating Django's
+    Python serializer. Fields which do not customize value_from_object() or value_to_string() are read directly from
+    the instance.
+    """
+    attname = field.attname
+    value_from_object = field.value_from_object
+    if type(field).value_from_object is Field.value_from_object:
+        def value_from_object(obj):
+            return getattr(obj, attname)
+
+    if type(field).value_to_string is Field.value_to_string:
+        def value_to_string(obj, value):
+            return str(value)
+    else:
+        def value_to_string(obj, value):
+            return field.value_to_string(obj)
+
+    def serialize(obj):
+        value = value_from_object(obj)
+        # Non-primitive values are converted to strings (see django.core.serializers.python.Serializer)
+        if not is_protected_type(value):
+            value = value_to_string(obj, value)
+        return to_json_value(value)
+
+    return serialize
+
+
+def get_m2m_serializer(field):
+    """
+    Return a function which returns the primary keys of the objects related to an object by a many-to-many field,
+    reusing any prefetched objects.
+    """
+    name = field.name
+    serialize_pk = get_field_value_serializer(field.remote_field.model._meta.pk)
+
+    def serialize(obj):
+        related_objects = getattr(obj, '_prefetched_objects_cache', {}).get(name)
+        if related_objects is None:
+            related_objects = getattr(obj, name).select_related(None).only('pk').iterator()
+        return [serialize_pk(related_obj) for related_obj in related_objects]
+
+    return serialize
+
+
+def get_field_serializers(model):
+    """
+    Return a list of (name, function) pairs used to serialize each field of the given model, in the same order and
+    representation as Django's JSON serializer. The list is compiled once per model.
+    """
+    model = model._meta.concrete_model
+    if model not in field_serializers:
+        field_serializers[model] = [
+            *[
+                (field.name, get_field_value_serializer(field))
+                for field in model._meta.local_fields if field.serialize
+            ],
+            *[
+                (field.name, get_m2m_serializer(field))
+                for field in model._meta.local_many_to_many
+                if field.serialize and field.remote_field.through._meta.auto_created
+            ],
+        ]
+
+    return field_serializers[model]
+
 
 def serialize_object(obj, resolve_tags=True, extra=None, exclude=None):
     """
-    Return a generic JSON representation of an object using Django's built-in serializer. (This is used for things like
-    change logging, not the REST API.) Optionally include a dictionary to supplement the object data. A list of keys
-    can be provided to exclude them from the returned dictionary.
+    Return a generic JSON representation of an object, identical to the field data produced by Django's built-in JSON
+    serializer. (This is used for things like change logging, not the REST API.) Optionally include a dictionary to
+    supplement the object data. A list of keys can be provided to exclude them from the returned dictionary.
 
     Args:
         obj: The object to serialize
@@ -24,8 +122,9 @@ def serialize_object(obj, resolve_tags=True, extra=None, exclude=None):
             override object attributes.
         exclude: An iterable of attributes to exclude from the serialized output
     """
-    json_str = serializers.serialize('json', [obj])
-    data = json.loads(json_str)[0]['fields']
+    data = {
+        name: serialize(obj) for name, serialize in get_field_serializers(type(obj))
+    }
     exclude = exclude or []
 
     # Include custom_field_data as "custom_fields"
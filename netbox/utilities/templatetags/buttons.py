@@ -3,6 +3,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.urls import NoReverseMatch, reverse
 
 from core.models import ObjectType
+from extras.metadata import metadata_cache
 from extras.models import Bookmark, ExportTemplate, Subscription
 from netbox.models.features import NotificationsMixin
 from utilities.querydict import prepare_cloned_fields
@@ -177,8 +178,11 @@ def export_button(context, model):
     # Determine if the "all data" export returns CSV or YAML
     data_format = 'YAML' if hasattr(object_type.model_class(), 'to_yaml') else 'CSV'
 
-    # Retrieve all export templates for this model
-    export_templates = ExportTemplate.objects.restrict(user, 'view').filter(object_types=object_type)
+    # Retrieve all export templates for this model which the user is permitted to view
+    if export_templates := metadata_cache.get_export_templates(object_type):
+        export_templates = ExportTemplate.objects.restrict(user, 'view').filter(
+            pk__in=[et.pk for et in export_templates]
+        )
 
     return {
         'perms': context['perms'],
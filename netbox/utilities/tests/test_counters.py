@@ -1,7 +1,12 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import override_settings
 from django.urls import reverse
 
 from dcim.models import *
+from netbox.signals import post_bulk_create
+from utilities.counters import CounterDeltas, deferred_counter_updates, update_counters
 from utilities.testing.base import TestCase
 from utilities.testing.utils import create_test_device
 
@@ -49,6 +54,31 @@ class CountersTest(TestCase):
         vc.refresh_from_db()
         self.assertEqual(vc.member_count, 1)
 
+    def test_interface_count_bulk_creation(self):
+        """
+        When tracked objects (Interfaces) are created in bulk the tracking counters should be updated.
+        """
+        device1, device2 = Device.objects.all()
+
+        interfaces = Interface.objects.bulk_create([
+            Interface(device=device1, name='Interface 5'),
+            Interface(device=device1, name='Interface 6'),
+            Interface(device=device2, name='Interface 7'),
+        ])
+        post_bulk_create.send(sender=Interface, instances=interfaces, using='default')
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.interface_count, 4)
+        self.assertEqual(device2.interface_count, 3)
+
+        # The counters of multiple objects are updated using a single query
+        with self.assertNumQueries(1):
+            update_counters(Device, 'interface_count', {device1.pk: -2, device2.pk: -1})
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.interface_count, 2)
+        self.assertEqual(device2.interface_count, 2)
+
     def test_interface_count_deletion(self):
         """
         When a tracked object (Interface) is deleted the tracking counter should be updated.
@@ -81,6 +111,56 @@ class CountersTest(TestCase):
         self.assertEqual(device1.interface_count, 1)
         self.assertEqual(device2.interface_count, 3)
 
+    def test_deferred_counter_updates(self):
+        """
+        Changes to counters made while updates are deferred should be merged and applied together.
+        """
+        device1, device2 = Device.objects.all()
+        interface1 = Interface.objects.get(name='Interface 1')
+        interface3 = Interface.objects.get(name='Interface 3')
+
+        with deferred_counter_updates():
+            Interface.objects.create(device=device1, name='Interface 5')
+            Interface.objects.create(device=device2, name='Interface 6')
+            interface1.delete()
+            interface3.delete()
+            Interface.objects.create(device=device1, name='Interface 7')
+
+            # Counters are not updated until the end of the block
+            device1.refresh_from_db()
+            self.assertEqual(device1.interface_count, 2)
+
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.interface_count, 3)
+        self.assertEqual(device2.interface_count, 2)
+
+        # Objects whose counters change by the same amount are updated using a single query
+        deltas = CounterDeltas()
+        deltas.add(Device, device1.pk, 'interface_count', 1)
+        deltas.add(Device, device2.pk, 'interface_count', 2)
+        deltas.add(Device, device2.pk, 'interface_count', -1)
+        with self.assertNumQueries(1):
+            deltas.apply()
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.interface_count, 4)
+        self.assertEqual(device2.interface_count, 3)
+
+    def test_calculate_cached_counts(self):
+        """
+        The calculate_cached_counts management command should correct any inaccurate counters.
+        """
+        device1, device2 = Device.objects.all()
+        Device.objects.filter(pk=device1.pk).update(interface_count=0)
+        Device.objects.filter(pk=device2.pk).update(interface_count=5)
+
+        call_command('calculate_cached_counts', 'dcim.device', batch_size=1, stdout=StringIO())
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.interface_count, 2)
+        self.assertEqual(device2.interface_count, 2)
+
     @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
     def test_mptt_child_delete(self):
         device1, device2 = Device.objects.all()
@@ -0,0 +1,41 @@
+from django.test import TestCase
+from django_tables2.export import TableExport
+
+from dcim.models import Site
+from dcim.tables import SiteTable
+from extras.models import ExportTemplate
+from utilities.export import buffer_stream, stream_table_csv
+
+
+class StreamingExportTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', description=f'Description, "{i}"') for i in range(1, 10)
+        ])
+
+    def test_buffer_stream(self):
+        self.assertEqual(list(buffer_stream(['ab', 'c', 'def', 'g'], size=3)), ['abc', 'def', 'g'])
+        self.assertEqual(list(buffer_stream([], size=3)), [])
+
+    def test_stream_table_csv(self):
+        exclude_columns = {'pk', 'actions'}
+        expected = TableExport(
+            export_format=TableExport.CSV,
+            table=SiteTable(Site.objects.order_by('name')),
+            exclude_columns=exclude_columns
+        ).export()
+
+        table = SiteTable(Site.objects.order_by('name'))
+        output = ''.join(stream_table_csv(table, exclude_columns, chunk_size=3))
+        self.assertEqual(output, expected)
+
+    def test_export_template_stream(self):
+        export_template = ExportTemplate(
+            name='Export Template 1',
+            template_code='{% for site in queryset %}{{ site.name }}\r\n{% endfor %}'
+        )
+        output = list(export_template.stream(Site.objects.order_by('name')))
+        self.assertEqual(''.join(output), ''.join(f'Site {i}\n' for i in range(1, 10)))
+        self.assertEqual(export_template.render(Site.objects.none()), '')
@@ -357,6 +357,41 @@ class BaseFilterSetTest(TestCase):
         self.assertEqual(self.filters['treeforeignkeyfield__n'].exclude, True)
 
 
+class CompiledFilterSetTest(TestCase):
+    """
+    Validate the selective binding of a FilterSet's filters based on the data provided.
+    """
+    class DummyFilterSet(BaseFilterSet):
+        charfield = django_filters.CharFilter()
+        datetimefield = django_filters.DateTimeFromToRangeFilter()
+
+        class Meta:
+            model = DummyModel
+            fields = ('charfield', 'datetimefield', 'integerfield')
+
+    def test_unbound_filters(self):
+        filters = self.DummyFilterSet().filters
+        self.assertIn('charfield__ic', filters)
+        self.assertIn('integerfield__gte', filters)
+
+    def test_bound_filters(self):
+        filterset = self.DummyFilterSet({'charfield__ic': 'foo', 'integerfield': '1', 'unknown': 'bar'})
+        self.assertEqual(set(filterset.filters), {'charfield__ic', 'integerfield'})
+
+        # Filters whose values are provided using suffixed keys are bound
+        filterset = self.DummyFilterSet({'datetimefield_after': '2024-01-01'})
+        self.assertEqual(list(filterset.filters), ['datetimefield'])
+
+    def test_filters_are_compiled_once(self):
+        self.DummyFilterSet()
+        compiled_filters = self.DummyFilterSet._compiled_filters
+        self.DummyFilterSet({'charfield': 'foo'})
+        self.assertIs(self.DummyFilterSet._compiled_filters, compiled_filters)
+
+        # Subclasses compile their own filters
+        self.assertNotIn('_compiled_filters', BaseFilterSet.__dict__)
+
+
 class DynamicFilterLookupExpressionTest(TestCase):
     """
     Validate function of automatically generated filters using the Device model as an example.
@@ -0,0 +1,45 @@
+from django.test import TestCase, override_settings
+
+from utilities.jinja2 import render_jinja2, template_cache
+
+
+def uppercase(value):
+    return str(value).upper()
+
+
+def lowercase(value):
+    return str(value).lower()
+
+
+class RenderJinja2TestCase(TestCase):
+
+    def setUp(self):
+        template_cache.clear()
+
+    def test_template_cache(self):
+        self.assertEqual(render_jinja2('Hello {{ name }}', {'name': 'foo'}), 'Hello foo')
+        self.assertEqual(render_jinja2('Hello {{ name }}', {'name': 'bar'}), 'Hello bar')
+        self.assertEqual(render_jinja2('Goodbye {{ name }}', {'name': 'bar'}), 'Goodbye bar')
+
+        info = template_cache.info()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 2)
+        self.assertEqual(info['size'], 2)
+
+    @override_settings(JINJA2_TEMPLATE_CACHE_SIZE=2)
+    def test_template_cache_eviction(self):
+        for template_code in ('{{ 1 }}', '{{ 2 }}', '{{ 1 }}', '{{ 3 }}', '{{ 2 }}'):
+            render_jinja2(template_code, {})
+
+        # '{{ 2 }}' was evicted as the least recently used template before being rendered again
+        info = template_cache.info()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 4)
+        self.assertEqual(info['size'], 2)
+
+    def test_filters_change(self):
+        with override_settings(JINJA2_FILTERS={'convert': uppercase}):
+            self.assertEqual(render_jinja2('{{ name|convert }}', {'name': 'Foo'}), 'FOO')
+        with override_settings(JINJA2_FILTERS={'convert': lowercase}):
+            self.assertEqual(render_jinja2('{{ name|convert }}', {'name': 'Foo'}), 'foo')
+        self.assertEqual(template_cache.info()['misses'], 2)
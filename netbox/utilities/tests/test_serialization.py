@@ -0,0 +1,69 @@
+import json
+
+from django.core import serializers
+
+from dcim.choices import InterfaceModeChoices
+from dcim.models import Device, Interface
+from extras.models import Tag
+from ipam.models import VLAN
+from utilities.serialization import serialize_object
+from utilities.testing.base import TestCase
+from utilities.testing.utils import create_test_device
+
+
+class SerializeObjectTest(TestCase):
+    """
+    Validate that serialize_object() returns the same representation as Django's JSON serializer.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        tags = (
+            Tag(name='Tag 2', slug='tag-2'),
+            Tag(name='Tag 1', slug='tag-1'),
+        )
+        Tag.objects.bulk_create(tags)
+
+        device = create_test_device('Device 1')
+        device.custom_field_data = {'foo': 'bar'}
+        device.save()
+        device.tags.set(tags)
+
+        vlans = (
+            VLAN(vid=100, name='VLAN 100'),
+            VLAN(vid=200, name='VLAN 200'),
+        )
+        VLAN.objects.bulk_create(vlans)
+
+        interface = Interface.objects.create(
+            device=device,
+            name='Interface 1',
+            mode=InterfaceModeChoices.MODE_TAGGED,
+            mac_address='00:01:02:03:04:05',
+            mtu=9000
+        )
+        interface.tagged_vlans.set(vlans)
+        interface.tags.set(tags)
+
+    def assertSerializedEqual(self, obj):
+        expected = json.loads(serializers.serialize('json', [obj]))[0]['fields']
+        expected['custom_fields'] = expected.pop('custom_field_data')
+        expected['tags'] = ['Tag 1', 'Tag 2']
+
+        data = serialize_object(obj)
+        self.assertEqual(data, expected)
+        self.assertEqual(list(data), list(expected))
+
+    def test_serialize_device(self):
+        self.assertSerializedEqual(Device.objects.get())
+
+    def test_serialize_interface(self):
+        self.assertSerializedEqual(Interface.objects.get())
+
+    def test_serialize_prefetched(self):
+        """
+        Prefetched tags and many-to-many relations should be reused.
+        """
+        interface = Interface.objects.prefetch_related('tags', 'tagged_vlans', 'vdcs', 'wireless_lans').get()
+        with self.assertNumQueries(0):
+            data = serialize_object(interface)
+        self.assertEqual(data, serialize_object(Interface.objects.get()))
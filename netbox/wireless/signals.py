@@ -4,6 +4,7 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from dcim.models import CablePath, Interface
+from dcim.topology import invalidate_topology
 from dcim.utils import create_cablepath
 from .models import WirelessLink
 
@@ -50,6 +51,9 @@ def nullify_connected_interfaces(instance, **kwargs):
     if instance.interface_b is not None:
         logger.debug(f"Nullifying interface B for wireless link {instance}")
         Interface.objects.filter(pk=instance.interface_b.pk).update(wireless_link=None)
+    invalidate_topology(*[
+        interface for interface in (instance.interface_a, instance.interface_b) if interface is not None
+    ])
 
     # Delete and retrace any dependent cable paths
     for cablepath in CablePath.objects.filter(_nodes__contains=instance):